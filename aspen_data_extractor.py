@@ -40,6 +40,13 @@ except ImportError:
     win32 = None
     pythoncom = None
 
+# Rust-backed Excel reader for pandas (engine='calamine' is only recognised by pandas >= 2.2)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
 # Import custom data interfaces
 from data_interfaces import (
     AspenProcessData, StreamData, UnitOperationData, UtilityData,
@@ -1864,8 +1871,16 @@ class HeatExchangerDataLoader:
         all_data = {}
         
         try:
-            # Get all worksheet names
-            xl_file = pd.ExcelFile(self.excel_file, engine='openpyxl')
+            # Get all worksheet names (calamine when installed, else openpyxl read-only)
+            engine = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+            try:
+                xl_file = pd.ExcelFile(self.excel_file, engine=engine)
+            except (ImportError, ValueError):
+                if engine == 'openpyxl':
+                    raise
+                # This pandas build cannot use calamine; fall back to openpyxl
+                engine = 'openpyxl'
+                xl_file = pd.ExcelFile(self.excel_file, engine=engine)
             sheet_names = xl_file.sheet_names
             
             logger.info(f"Found {len(sheet_names)} worksheets: {sheet_names}")
@@ -1877,10 +1892,14 @@ class HeatExchangerDataLoader:
                     
                     # Try multiple loading methods for each worksheet
                     df = None
+                    # The already-open workbook is parsed first so the file is not re-read per sheet
                     loading_methods = [
-                        ("openpyxl", lambda: pd.read_excel(self.excel_file, sheet_name=sheet_name, engine='openpyxl')),
+                        (engine, lambda: xl_file.parse(sheet_name)),
                         ("xlrd", lambda: pd.read_excel(self.excel_file, sheet_name=sheet_name, engine='xlrd'))
                     ]
+                    if engine != 'openpyxl':
+                        loading_methods.insert(1, ("openpyxl", lambda: pd.read_excel(
+                            self.excel_file, sheet_name=sheet_name, engine='openpyxl')))
                     
                     for method_name, method_func in loading_methods:
                         try:
@@ -3063,13 +3082,16 @@ class AspenDataExtractor:
         
         return process_data
     
-    def extract_and_store_all_data(self, aspen_file: str, hex_file: str = None) -> Dict[str, Any]:
+    def extract_and_store_all_data(self, aspen_file: str, hex_file: str = None,
+                                   process_data: Optional[AspenProcessData] = None) -> Dict[str, Any]:
         """
         完整的数据提取和数据库存储流程
         
         Args:
             aspen_file: Aspen Plus 文件路径
             hex_file: 换热器Excel文件路径 (可选)
+            process_data: 已由extract_complete_data提取的过程数据 (可选)；
+                提供时不再连接Aspen，直接存储本次提取得到的流股和设备数据
             
         Returns:
             包含提取结果和统计信息的字典
@@ -3114,41 +3136,42 @@ class AspenDataExtractor:
                 logger.info("⚠️ No heat exchanger file provided or file not found")
                 extraction_results['data_counts']['heat_exchangers'] = 0
             
-            # 3. 连接到Aspen Plus
-            logger.info(f"🔌 Connecting to Aspen Plus: {aspen_file}")
-            
-            # 确保使用正确的文件路径
-            if not os.path.exists(aspen_file):
-                # 尝试在aspen_files子目录中查找
-                potential_path = os.path.join(os.path.dirname(__file__), "aspen_files", os.path.basename(aspen_file))
-                if os.path.exists(potential_path):
-                    aspen_file = potential_path
-                    logger.info(f"✅ Found file in aspen_files directory: {aspen_file}")
-                else:
-                    raise FileNotFoundError(f"Aspen file not found: {aspen_file} or {potential_path}")
-            
-            success = self.com_interface.connect(aspen_file)
-            
-            if not success:
-                # 提供详细的连接失败信息
-                logger.error(f"❌ Could not connect to Aspen file: {aspen_file}")
-                logger.error("Possible reasons:")
-                logger.error("  1. Aspen Plus is not installed")
-                logger.error("  2. COM objects are not registered")
-                logger.error("  3. File path is incorrect")
-                logger.error("  4. Insufficient permissions")
+            # 3. 连接到Aspen Plus（已提供过程数据时复用，不再重新读取模拟文件）
+            if process_data is None:
+                logger.info(f"🔌 Connecting to Aspen Plus: {aspen_file}")
+                
+                # 确保使用正确的文件路径
+                if not os.path.exists(aspen_file):
+                    # 尝试在aspen_files子目录中查找
+                    potential_path = os.path.join(os.path.dirname(__file__), "aspen_files", os.path.basename(aspen_file))
+                    if os.path.exists(potential_path):
+                        aspen_file = potential_path
+                        logger.info(f"✅ Found file in aspen_files directory: {aspen_file}")
+                    else:
+                        raise FileNotFoundError(f"Aspen file not found: {aspen_file} or {potential_path}")
                 
-                # 尝试COM可用性测试
-                com_test = self.com_interface.test_com_availability()
-                logger.error(f"COM test results: {com_test}")
+                success = self.com_interface.connect(aspen_file)
                 
-                raise Exception(f"Could not connect to Aspen file: {aspen_file}")
-            
-            logger.info("✅ Successfully connected to Aspen Plus")
+                if not success:
+                    # 提供详细的连接失败信息
+                    logger.error(f"❌ Could not connect to Aspen file: {aspen_file}")
+                    logger.error("Possible reasons:")
+                    logger.error("  1. Aspen Plus is not installed")
+                    logger.error("  2. COM objects are not registered")
+                    logger.error("  3. File path is incorrect")
+                    logger.error("  4. Insufficient permissions")
+                    
+                    # 尝试COM可用性测试
+                    com_test = self.com_interface.test_com_availability()
+                    logger.error(f"COM test results: {com_test}")
+                    
+                    raise Exception(f"Could not connect to Aspen file: {aspen_file}")
+                
+                logger.info("✅ Successfully connected to Aspen Plus")
             
             # 4. 提取流股数据
             logger.info("🌊 Extracting stream data...")
-            streams = self.extract_all_streams()
+            streams = self.extract_all_streams() if process_data is None else process_data.streams
             
             if streams:
                 # 转换StreamData对象为字典
@@ -3185,7 +3208,8 @@ class AspenDataExtractor:
             
             # 5. 提取设备数据
             logger.info("⚙️ Extracting equipment data...")
-            equipment = self.extract_all_equipment()
+            # extract_complete_data提取设备时已将原始设备数据保存在self.block_data
+            equipment = self.extract_all_equipment() if process_data is None else self.block_data
             
             if equipment:
                 self.database.store_equipment_data(equipment)
@@ -3215,8 +3239,9 @@ class AspenDataExtractor:
             extraction_results['summary_stats'] = summary_stats
             
             # 8. 断开Aspen连接
-            self.com_interface.disconnect()
-            logger.info("🔌 Disconnected from Aspen Plus")
+            if process_data is None:
+                self.com_interface.disconnect()
+                logger.info("🔌 Disconnected from Aspen Plus")
             
             extraction_results['success'] = True
             
@@ -11,11 +11,16 @@ Date: 2025-07-25
 Version: 1.0
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+import sys
+from dataclasses import dataclass, field, fields, MISSING
+from typing import Dict, List, Optional, Any, Union, Callable, Iterable
 from datetime import datetime
 from enum import Enum
 
+# Economic result containers are attribute-heavy on the reporting path;
+# use __slots__ where the interpreter supports it (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class EquipmentType(Enum):
     """Equipment type enumeration"""
@@ -405,7 +410,7 @@ def convert_units(value: float, from_unit: str, to_unit: str,
 
 # Economic Data Structures
 
-@dataclass
+@dataclass(**_SLOTS)
 class CostItem:
     """
     Individual cost item for economic analysis
@@ -445,7 +450,35 @@ class CostItem:
         return self.installed_cost
 
 
-@dataclass
+# Category -> cost dict attribute; CAPEX categories not listed go to indirect_costs,
+# OPEX categories not listed are ignored
+_CAPEX_COST_DICTS = {
+    CostCategory.EQUIPMENT: 'equipment_costs',
+    CostCategory.INSTALLATION: 'installation_costs',
+    CostCategory.PIPING: 'installation_costs',
+    CostCategory.INSTRUMENTATION: 'installation_costs',
+    CostCategory.ELECTRICAL: 'installation_costs',
+}
+_OPEX_COST_DICTS = {
+    CostCategory.RAW_MATERIALS: 'raw_material_costs',
+    CostCategory.UTILITIES: 'utility_costs',
+    CostCategory.LABOR: 'labor_costs',
+    CostCategory.MAINTENANCE: 'maintenance_costs',
+}
+
+
+def _group_by_cost_dict(cost_items: Iterable[CostItem], routes: Dict[CostCategory, str],
+                        default: Optional[str]) -> Dict[str, Dict[str, CostItem]]:
+    """Group items by target dict attribute, keeping the last item per name"""
+    groups: Dict[str, Dict[str, CostItem]] = {}
+    for cost_item in cost_items:
+        target = routes.get(cost_item.category, default)
+        if target is not None:
+            groups.setdefault(target, {})[cost_item.name] = cost_item
+    return groups
+
+
+@dataclass(**_SLOTS)
 class CapexData:
     """
     Capital expenditure (CAPEX) data structure
@@ -480,13 +513,14 @@ class CapexData:
     
     def add_cost_item(self, cost_item: CostItem):
         """Add a cost item to appropriate category"""
-        if cost_item.category == CostCategory.EQUIPMENT:
-            self.equipment_costs[cost_item.name] = cost_item
-        elif cost_item.category in [CostCategory.INSTALLATION, CostCategory.PIPING, 
-                                   CostCategory.INSTRUMENTATION, CostCategory.ELECTRICAL]:
-            self.installation_costs[cost_item.name] = cost_item
-        else:
-            self.indirect_costs[cost_item.name] = cost_item
+        target = _CAPEX_COST_DICTS.get(cost_item.category, 'indirect_costs')
+        getattr(self, target)[cost_item.name] = cost_item
+    
+    def add_cost_items(self, cost_items: Iterable[CostItem]):
+        """Add several cost items, grouped by category dict and merged with one update each"""
+        for target, items in _group_by_cost_dict(cost_items, _CAPEX_COST_DICTS,
+                                                 'indirect_costs').items():
+            getattr(self, target).update(items)
     
     def calculate_total_capex(self) -> float:
         """Calculate total CAPEX from all cost items"""
@@ -504,7 +538,7 @@ class CapexData:
         return self.total_capex
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OpexData:
     """
     Operating expenditure (OPEX) data structure
@@ -536,14 +570,14 @@ class OpexData:
     
     def add_opex_item(self, cost_item: CostItem):
         """Add an operating cost item to appropriate category"""
-        if cost_item.category == CostCategory.RAW_MATERIALS:
-            self.raw_material_costs[cost_item.name] = cost_item
-        elif cost_item.category == CostCategory.UTILITIES:
-            self.utility_costs[cost_item.name] = cost_item
-        elif cost_item.category == CostCategory.LABOR:
-            self.labor_costs[cost_item.name] = cost_item
-        elif cost_item.category == CostCategory.MAINTENANCE:
-            self.maintenance_costs[cost_item.name] = cost_item
+        target = _OPEX_COST_DICTS.get(cost_item.category)
+        if target is not None:
+            getattr(self, target)[cost_item.name] = cost_item
+    
+    def add_opex_items(self, cost_items: Iterable[CostItem]):
+        """Add several operating cost items, grouped by category dict and merged with one update each"""
+        for target, items in _group_by_cost_dict(cost_items, _OPEX_COST_DICTS, None).items():
+            getattr(self, target).update(items)
     
     def calculate_annual_opex(self, capex_total: float = 0.0) -> float:
         """Calculate total annual OPEX"""
@@ -567,7 +601,7 @@ class OpexData:
         return self.annual_opex
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FinancialParameters:
     """
     Financial analysis parameters for economic evaluation
@@ -609,25 +643,23 @@ class FinancialParameters:
     
     def calculate_npv(self, capex: float, annual_opex: float) -> float:
         """Calculate Net Present Value"""
-        cash_flows = []
-        
         # Initial investment (negative cash flow)
-        cash_flows.append(-capex)
+        cash_flows = [-capex]
         
-        # Annual operating cash flows
+        # Annual operating cash flows, discounted with a base computed once
         annual_net_cash_flow = self.annual_revenue - annual_opex
         annual_after_tax = annual_net_cash_flow * (1 - self.tax_rate)
+        base = 1 + self.discount_rate
         
-        for year in range(1, self.project_life + 1):
-            discounted_flow = annual_after_tax / ((1 + self.discount_rate) ** year)
-            cash_flows.append(discounted_flow)
+        cash_flows += [annual_after_tax / (base ** year)
+                       for year in range(1, self.project_life + 1)]
         
         self.npv = sum(cash_flows)
         self.annual_cash_flows = cash_flows
         return self.npv
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EconomicAnalysisResults:
     """
     Complete economic analysis results container
@@ -666,11 +698,66 @@ class EconomicAnalysisResults:
     data_sources: List[str] = field(default_factory=list)
     estimation_methods: List[str] = field(default_factory=list)
     assumptions: List[str] = field(default_factory=list)
+    report_path: Optional[str] = None       # Report already written by the data source
     
     # Quality metrics
     confidence_level: Optional[str] = None  # High, Medium, Low
     accuracy_range: Optional[str] = None    # ±10%, ±25%, ±50%
     
+    # Lazily parsed fields: attribute name -> loader(results)
+    _deferred: Dict[str, Callable[['EconomicAnalysisResults'], None]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    
+    def defer(self, names: Iterable[str], loader: Callable[['EconomicAnalysisResults'], None]):
+        """
+        Defer the given fields until first access
+        
+        The fields are removed from the instance; touching any of them
+        resets all of them to their defaults and runs loader(self) once.
+        If the loader raises, the fields stay deferred and the next access
+        retries it.
+        """
+        for name in names:
+            delattr(self, name)
+            self._deferred[name] = loader
+    
+    def load_deferred(self):
+        """Run all pending loaders (forces eager parsing)"""
+        while self._deferred:
+            getattr(self, next(iter(self._deferred)))
+    
+    def __getattr__(self, name: str):
+        # Only reached when normal lookup fails, i.e. for deferred fields
+        try:
+            deferred = object.__getattribute__(self, '_deferred')
+        except AttributeError:
+            raise AttributeError(name) from None
+        loader = deferred.get(name)
+        if loader is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+        names = [key for key, value in deferred.items() if value is loader]
+        for f in fields(self):
+            if f.name in names:
+                del deferred[f.name]
+                default = f.default if f.default_factory is MISSING else f.default_factory()
+                setattr(self, f.name, default)
+        
+        try:
+            loader(self)
+        except Exception:
+            # Put the fields back so later accesses retry instead of
+            # silently returning the defaults
+            for field_name in names:
+                deferred[field_name] = loader
+                try:
+                    object.__delattr__(self, field_name)
+                except AttributeError:
+                    pass
+            raise
+        return object.__getattribute__(self, name)
+    
     def calculate_production_cost(self) -> float:
         """Calculate production cost per unit"""
         if self.financial_params.annual_production > 0:
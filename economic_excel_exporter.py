@@ -16,6 +16,8 @@ Version: 1.0
 
 import os
 import sys
+import functools
+from copy import copy
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
@@ -24,14 +26,19 @@ import logging
 # Excel processing
 try:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
-    from openpyxl.chart import BarChart, PieChart, Reference, LineChart
-    from openpyxl.utils.dataframe import dataframe_to_rows
-    from openpyxl.worksheet.table import Table, TableStyleInfo
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
+# Fast raw-value writer for large OPEX item tables (optional)
+try:
+    import pyexcelerate
+    PYEXCELERATE_AVAILABLE = True
+except ImportError:
+    PYEXCELERATE_AVAILABLE = False
+
 # Data processing
 try:
     import pandas as pd
@@ -62,10 +69,7 @@ class EconomicExcelExporter:
         if not OPENPYXL_AVAILABLE:
             raise ImportError("openpyxl is required for Excel export. Install with: pip install openpyxl")
         
-        self.wb = None
-        self.styles_initialized = False
-        self.chart_count = 0
-        
+        # Static configuration (shared by every export)
         # Define standard colors for charts and tables
         self.colors = {
             'primary': '4472C4',      # Blue
@@ -76,46 +80,71 @@ class EconomicExcelExporter:
             'light_gray': 'F2F2F2',   # Light gray
             'dark_gray': '595959'     # Dark gray
         }
+        self.named_styles = self._build_named_styles()
+        
+        # The workbook, output path and table mode are per-export locals passed
+        # to the sheet builders, so one exporter can be shared between callers
+        self.chart_count = 0
     
     def export_economic_analysis(self, results: EconomicAnalysisResults, 
-                                output_file: str) -> str:
+                                output_file: str, fast_tables: bool = False,
+                                streaming: bool = False) -> str:
         """
         导出完整的经济分析报告到Excel文件
         
         Args:
             results: 经济分析结果数据
             output_file: 输出Excel文件路径
+            fast_tables: 使用PyExcelerate将OPEX明细表写入单独的
+                         ``<报告名>_opex_items.xlsx`` 文件（适用于大型项目组合）
+            streaming: 使用openpyxl只写模式逐行写出，内存占用与行数无关。
+                       只生成完整报告8张表中的4张（Executive Summary、CAPEX Breakdown、
+                       OPEX Analysis、Equipment Details），不含财务分析、敏感性分析、
+                       计算参数和假设说明表，也不含图表、合并单元格和自动列宽；
+                       需要完整报告的调用方保持默认值
             
         Returns:
             生成的Excel文件路径
         """
         logger.info(f"🔄 Generating economic analysis report: {output_file}")
         
+        if streaming:
+            return self._export_streaming(results, Path(output_file))
+        
+        if fast_tables and not PYEXCELERATE_AVAILABLE:
+            logger.warning("pyexcelerate not available, writing OPEX item tables with openpyxl")
+        fast_tables = fast_tables and PYEXCELERATE_AVAILABLE
+        output_path = Path(output_file)
+        # OPEX item tables go to a separate file in fast_tables mode
+        opex_items_name = self._opex_items_path(output_path).name if fast_tables else None
+        
         # Create new workbook
-        self.wb = Workbook()
+        wb = Workbook()
         
         # Initialize styles
-        self._initialize_styles()
+        self._initialize_styles(wb)
         
         # Remove default sheet
-        if 'Sheet' in self.wb.sheetnames:
-            self.wb.remove(self.wb['Sheet'])
+        if 'Sheet' in wb.sheetnames:
+            wb.remove(wb['Sheet'])
         
         try:
             # Create all worksheets
-            self._create_executive_summary(results)
-            self._create_capex_breakdown(results)
-            self._create_opex_analysis(results)
-            self._create_equipment_details(results)
-            self._create_financial_analysis(results)
-            self._create_sensitivity_analysis(results)
-            self._create_calculation_parameters(results)
-            self._create_assumptions_notes(results)
+            self._create_executive_summary(wb, results)
+            self._create_capex_breakdown(wb, results)
+            self._create_opex_analysis(wb, results, opex_items_name)
+            self._create_equipment_details(wb, results)
+            self._create_financial_analysis(wb, results)
+            self._create_sensitivity_analysis(wb, results)
+            self._create_calculation_parameters(wb, results)
+            self._create_assumptions_notes(wb, results)
             
             # Save workbook
-            output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            self.wb.save(output_file)
+            wb.save(output_file)
+            
+            if fast_tables:
+                self._export_opex_items_fast(results, output_path)
             
             logger.info(f"✅ Economic analysis report saved: {output_file}")
             return str(output_path)
@@ -124,11 +153,8 @@ class EconomicExcelExporter:
             logger.error(f"Error generating Excel report: {str(e)}")
             raise
     
-    def _initialize_styles(self):
-        """初始化Excel样式"""
-        if self.styles_initialized:
-            return
-        
+    def _build_named_styles(self) -> List[NamedStyle]:
+        """构建报告使用的命名样式（与工作簿无关，可跨导出复用）"""
         # Header style
         header_style = NamedStyle(name="header")
         header_style.font = Font(bold=True, size=14, color='FFFFFF')
@@ -159,31 +185,161 @@ class EconomicExcelExporter:
         percentage_style.number_format = '0.0%'
         percentage_style.alignment = Alignment(horizontal='right')
         
+        return [header_style, subheader_style, currency_style, percentage_style]
+    
+    def _initialize_styles(self, wb):
+        """将命名样式注册到给定的工作簿"""
         # Add styles to workbook
         try:
             existing_styles = []
             try:
-                existing_styles = [getattr(style, 'name', str(style)) for style in self.wb.named_styles]
+                existing_styles = [getattr(style, 'name', str(style)) for style in wb.named_styles]
             except:
                 existing_styles = []
             
-            if "header" not in existing_styles:
-                self.wb.add_named_style(header_style)
-            if "subheader" not in existing_styles:
-                self.wb.add_named_style(subheader_style)
-            if "currency" not in existing_styles:
-                self.wb.add_named_style(currency_style)
-            if "percentage" not in existing_styles:
-                self.wb.add_named_style(percentage_style)
+            for style in self.named_styles:
+                if style.name not in existing_styles:
+                    wb.add_named_style(copy(style))
         except ValueError:
             # Styles already exist
             pass
+    
+    def _export_streaming(self, results: EconomicAnalysisResults, output_path: Path) -> str:
+        """以只写模式导出报告的数据表（逐行追加，不保留单元格对象）"""
+        wb = Workbook(write_only=True)
+        for style in self.named_styles:
+            wb.add_named_style(copy(style))
+        
+        def styled(ws, value, style):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+        
+        # Executive summary
+        ws = wb.create_sheet("Executive Summary")
+        ws.column_dimensions['A'].width = 32
+        ws.column_dimensions['B'].width = 24
+        ws.append([styled(ws, f"Economic Analysis Report - {results.project_name}", 'header')])
+        ws.append([])
+        ws.append([styled(ws, "Project Information", 'subheader')])
+        ws.append(["Project Name", results.project_name])
+        ws.append(["Analysis Date", results.timestamp.strftime("%Y-%m-%d %H:%M")])
+        ws.append(["Analysis Version", results.analysis_version])
+        ws.append(["Confidence Level", results.confidence_level or "Medium"])
+        ws.append(["Accuracy Range", results.accuracy_range or "±25%"])
+        ws.append([])
+        ws.append([styled(ws, "Financial Summary", 'subheader')])
+        for label, value, style in (
+            ("Total CAPEX", results.total_capex, 'currency'),
+            ("Annual OPEX", results.annual_opex, 'currency'),
+            ("Production Cost", results.production_cost, 'currency'),
+            ("Net Present Value (NPV)", results.npv, 'currency'),
+            ("Internal Rate of Return (IRR)", results.irr, 'percentage'),
+        ):
+            ws.append([label, styled(ws, value, style) if isinstance(value, (int, float)) else value])
+        ws.append(["Payback Period",
+                   f"{results.payback_period:.1f} years" if results.payback_period else "N/A"])
+        ws.append(["Total Equipment Count", len(results.equipment_list)])
+        ws.append([])
+        ws.append([styled(ws, "Data Sources", 'subheader')])
+        for source in results.data_sources:
+            ws.append([f"• {source}"])
+        
+        # CAPEX items
+        capex = results.capex_data
+        ws = wb.create_sheet("CAPEX Breakdown")
+        ws.column_dimensions['A'].width = 32
+        ws.append([styled(ws, "Capital Expenditure (CAPEX) Breakdown", 'header')])
+        ws.append([])
+        ws.append([styled(ws, header, 'subheader') for header in (
+            "Cost Item", "Group", "Category", "Base Cost", "Quantity", "Method", "Installed Cost")])
+        subtotals = {}
+        for group, items in (("Equipment", capex.equipment_costs),
+                             ("Installation", capex.installation_costs),
+                             ("Indirect", capex.indirect_costs)):
+            subtotal = 0.0
+            for item in items.values():
+                installed = item.calculate_installed_cost()
+                subtotal += installed
+                ws.append([getattr(item, 'name', str(item)), group, item.category.value,
+                           styled(ws, item.base_cost, 'currency'), item.quantity,
+                           item.estimation_method or "Standard",
+                           styled(ws, installed, 'currency')])
+            subtotals[group] = subtotal
+        ws.append([])
+        ws.append([styled(ws, "CAPEX Summary", 'subheader')])
+        for label, value in (
+            ("Equipment Subtotal", subtotals["Equipment"]),
+            ("Installation Subtotal", subtotals["Installation"]),
+            ("Indirect Costs", subtotals["Indirect"]),
+            ("Contingency", results.total_capex * capex.contingency_rate),
+            ("Total CAPEX", results.total_capex),
+        ):
+            ws.append([label, styled(ws, value, 'currency')])
+        
+        # OPEX items
+        opex = results.opex_data
+        ws = wb.create_sheet("OPEX Analysis")
+        ws.column_dimensions['A'].width = 32
+        ws.append([styled(ws, "Operating Expenditure (OPEX) Analysis", 'header')])
+        ws.append([])
+        ws.append([styled(ws, header, 'subheader') for header in (
+            "Item Name", "Table", "Category", "Annual Cost", "Unit", "Quantity", "Method")])
+        subtotals = {}
+        for table_name, items in (("Raw Materials", opex.raw_material_costs),
+                                  ("Utilities", opex.utility_costs),
+                                  ("Labor", opex.labor_costs),
+                                  ("Maintenance", opex.maintenance_costs)):
+            subtotal = 0.0
+            for item in items.values():
+                annual = item.calculate_installed_cost()
+                subtotal += annual
+                ws.append([getattr(item, 'name', str(item)), table_name, item.category.value,
+                           styled(ws, annual, 'currency'), item.unit, item.quantity,
+                           item.estimation_method or "Standard"])
+            subtotals[table_name] = subtotal
+        ws.append([])
+        ws.append([styled(ws, "Annual OPEX Summary", 'subheader')])
+        for label, value in subtotals.items():
+            ws.append([label, styled(ws, value, 'currency')])
+        ws.append(["Total Annual OPEX", styled(ws, results.annual_opex, 'currency')])
+        
+        # Equipment list, one row per item straight from the dict values
+        ws = wb.create_sheet("Equipment Details")
+        ws.column_dimensions['A'].width = 32
+        ws.append([styled(ws, "Equipment Sizing and Costing Details", 'header')])
+        ws.append([])
+        ws.append([styled(ws, header, 'subheader') for header in (
+            "Equipment Name", "Type", "Volume (m³)", "Area (m²)", "Diameter (m)",
+            "Height (m)", "Power (kW)", "Design P (bar)", "Design T (°C)",
+            "Estimated Cost", "Cost Basis")])
+        for equipment in results.equipment_list.values():
+            values = [
+                getattr(equipment, 'name', str(equipment)),
+                equipment.equipment_type.value,
+                equipment.volume,
+                equipment.area,
+                equipment.diameter,
+                equipment.height,
+                equipment.power_rating,
+                equipment.design_pressure,
+                equipment.design_temperature,
+            ]
+            ws.append([("N/A" if value is None else value) for value in values] + [
+                "N/A" if equipment.estimated_cost is None
+                else styled(ws, equipment.estimated_cost, 'currency'),
+                equipment.cost_basis or "2024 USD"
+            ])
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        wb.save(str(output_path))
         
-        self.styles_initialized = True
+        logger.info(f"✅ Economic analysis report saved (streaming): {output_path}")
+        return str(output_path)
     
-    def _create_executive_summary(self, results: EconomicAnalysisResults):
+    def _create_executive_summary(self, wb, results: EconomicAnalysisResults):
         """创建项目概览工作表"""
-        ws = self.wb.create_sheet("Executive Summary", 0)
+        ws = wb.create_sheet("Executive Summary", 0)
         
         # Title
         ws['A1'] = f"Economic Analysis Report - {results.project_name}"
@@ -255,9 +411,9 @@ class EconomicExcelExporter:
         # Add CAPEX/OPEX pie chart
         self._add_capex_opex_pie_chart(ws, results)
     
-    def _create_capex_breakdown(self, results: EconomicAnalysisResults):
+    def _create_capex_breakdown(self, wb, results: EconomicAnalysisResults):
         """创建CAPEX分解工作表"""
-        ws = self.wb.create_sheet("CAPEX Breakdown")
+        ws = wb.create_sheet("CAPEX Breakdown")
         
         # Title
         ws['A1'] = "Capital Expenditure (CAPEX) Breakdown"
@@ -363,51 +519,59 @@ class EconomicExcelExporter:
         # Add CAPEX breakdown bar chart
         self._add_capex_breakdown_chart(ws, results, row + len(capex_summary) + 2)
     
-    def _create_opex_analysis(self, results: EconomicAnalysisResults):
+    def _create_opex_analysis(self, wb, results: EconomicAnalysisResults,
+                              opex_items_name: Optional[str] = None):
         """创建OPEX分析工作表"""
-        ws = self.wb.create_sheet("OPEX Analysis")
+        ws = wb.create_sheet("OPEX Analysis")
         
         # Title
         ws['A1'] = "Operating Expenditure (OPEX) Analysis"
         ws['A1'].style = 'header'
         ws.merge_cells('A1:G1')
         
-        # Raw materials table
         row = 3
-        if results.opex_data.raw_material_costs:
-            ws[f'A{row}'] = "Raw Material Costs"
-            ws[f'A{row}'].style = 'subheader'
-            
-            self._create_opex_table(ws, row, results.opex_data.raw_material_costs.values(), 
-                                  "Raw Materials")
-            row += len(results.opex_data.raw_material_costs) + 4
-        
-        # Utility costs table
-        if results.opex_data.utility_costs:
-            ws[f'A{row}'] = "Utility Costs"
+        if opex_items_name:
+            # Item tables are written to a separate file by _export_opex_items_fast
+            ws[f'A{row}'] = "OPEX Item Details"
             ws[f'A{row}'].style = 'subheader'
+            ws[f'A{row+1}'] = f"See {opex_items_name}"
+            row += 4
+        else:
+            # Raw materials table
+            if results.opex_data.raw_material_costs:
+                ws[f'A{row}'] = "Raw Material Costs"
+                ws[f'A{row}'].style = 'subheader'
+                
+                self._create_opex_table(ws, row, results.opex_data.raw_material_costs.values(), 
+                                      "Raw Materials")
+                row += len(results.opex_data.raw_material_costs) + 4
             
-            self._create_opex_table(ws, row, results.opex_data.utility_costs.values(), 
-                                  "Utilities")
-            row += len(results.opex_data.utility_costs) + 4
-        
-        # Labor costs table
-        if results.opex_data.labor_costs:
-            ws[f'A{row}'] = "Labor Costs"
-            ws[f'A{row}'].style = 'subheader'
+            # Utility costs table
+            if results.opex_data.utility_costs:
+                ws[f'A{row}'] = "Utility Costs"
+                ws[f'A{row}'].style = 'subheader'
+                
+                self._create_opex_table(ws, row, results.opex_data.utility_costs.values(), 
+                                      "Utilities")
+                row += len(results.opex_data.utility_costs) + 4
             
-            self._create_opex_table(ws, row, results.opex_data.labor_costs.values(), 
-                                  "Labor")
-            row += len(results.opex_data.labor_costs) + 4
-        
-        # Maintenance costs table
-        if results.opex_data.maintenance_costs:
-            ws[f'A{row}'] = "Maintenance Costs"
-            ws[f'A{row}'].style = 'subheader'
+            # Labor costs table
+            if results.opex_data.labor_costs:
+                ws[f'A{row}'] = "Labor Costs"
+                ws[f'A{row}'].style = 'subheader'
+                
+                self._create_opex_table(ws, row, results.opex_data.labor_costs.values(), 
+                                      "Labor")
+                row += len(results.opex_data.labor_costs) + 4
             
-            self._create_opex_table(ws, row, results.opex_data.maintenance_costs.values(), 
-                                  "Maintenance")
-            row += len(results.opex_data.maintenance_costs) + 4
+            # Maintenance costs table
+            if results.opex_data.maintenance_costs:
+                ws[f'A{row}'] = "Maintenance Costs"
+                ws[f'A{row}'].style = 'subheader'
+                
+                self._create_opex_table(ws, row, results.opex_data.maintenance_costs.values(), 
+                                      "Maintenance")
+                row += len(results.opex_data.maintenance_costs) + 4
         
         # OPEX summary
         ws[f'A{row}'] = "Annual OPEX Summary"
@@ -437,9 +601,9 @@ class EconomicExcelExporter:
         # Add OPEX breakdown chart
         self._add_opex_breakdown_chart(ws, results, row + len(opex_summary) + 2)
     
-    def _create_equipment_details(self, results: EconomicAnalysisResults):
+    def _create_equipment_details(self, wb, results: EconomicAnalysisResults):
         """创建设备详细信息工作表"""
-        ws = self.wb.create_sheet("Equipment Details")
+        ws = wb.create_sheet("Equipment Details")
         
         # Title
         ws['A1'] = "Equipment Sizing and Costing Details"
@@ -486,9 +650,9 @@ class EconomicExcelExporter:
         # Auto-adjust columns
         self._auto_adjust_columns(ws)
     
-    def _create_financial_analysis(self, results: EconomicAnalysisResults):
+    def _create_financial_analysis(self, wb, results: EconomicAnalysisResults):
         """创建财务分析工作表"""
-        ws = self.wb.create_sheet("Financial Analysis")
+        ws = wb.create_sheet("Financial Analysis")
         
         # Title
         ws['A1'] = "Financial Analysis and Cash Flow"
@@ -570,9 +734,9 @@ class EconomicExcelExporter:
         # Auto-adjust columns
         self._auto_adjust_columns(ws)
     
-    def _create_sensitivity_analysis(self, results: EconomicAnalysisResults):
+    def _create_sensitivity_analysis(self, wb, results: EconomicAnalysisResults):
         """创建敏感性分析工作表"""
-        ws = self.wb.create_sheet("Sensitivity Analysis")
+        ws = wb.create_sheet("Sensitivity Analysis")
         
         # Title
         ws['A1'] = "Sensitivity Analysis"
@@ -630,9 +794,9 @@ class EconomicExcelExporter:
         # Auto-adjust columns
         self._auto_adjust_columns(ws)
     
-    def _create_calculation_parameters(self, results: EconomicAnalysisResults):
+    def _create_calculation_parameters(self, wb, results: EconomicAnalysisResults):
         """创建计算参数工作表"""
-        ws = self.wb.create_sheet("Calculation Parameters")
+        ws = wb.create_sheet("Calculation Parameters")
         
         # Title
         ws['A1'] = "Calculation Parameters and Methods"
@@ -702,9 +866,9 @@ class EconomicExcelExporter:
         # Auto-adjust columns
         self._auto_adjust_columns(ws)
     
-    def _create_assumptions_notes(self, results: EconomicAnalysisResults):
+    def _create_assumptions_notes(self, wb, results: EconomicAnalysisResults):
         """创建假设和备注工作表"""
-        ws = self.wb.create_sheet("Assumptions & Notes")
+        ws = wb.create_sheet("Assumptions & Notes")
         
         # Title
         ws['A1'] = "Assumptions and Notes"
@@ -782,6 +946,41 @@ class EconomicExcelExporter:
             ws.cell(row=row_num, column=5, value=item.quantity)
             ws.cell(row=row_num, column=6, value=item.estimation_method or "Standard")
     
+    @staticmethod
+    def _opex_items_path(output_path: Path) -> Path:
+        """OPEX明细表旁路文件路径"""
+        return output_path.with_name(f"{output_path.stem}_opex_items.xlsx")
+    
+    def _export_opex_items_fast(self, results: EconomicAnalysisResults, output_path: Path) -> str:
+        """使用PyExcelerate导出OPEX明细表（无样式，仅数值）"""
+        rows = [["Table", "Item Name", "Category", "Annual Cost", "Unit", "Quantity", "Method"]]
+        
+        opex_tables = [
+            ("Raw Materials", results.opex_data.raw_material_costs),
+            ("Utilities", results.opex_data.utility_costs),
+            ("Labor", results.opex_data.labor_costs),
+            ("Maintenance", results.opex_data.maintenance_costs)
+        ]
+        for table_name, cost_items in opex_tables:
+            for item in cost_items.values():
+                rows.append([
+                    table_name,
+                    getattr(item, 'name', str(item)),
+                    item.category.value,
+                    item.calculate_installed_cost(),
+                    item.unit,
+                    item.quantity,
+                    item.estimation_method or "Standard"
+                ])
+        
+        items_path = self._opex_items_path(output_path)
+        wb = pyexcelerate.Workbook()
+        wb.new_sheet("OPEX Items", data=rows)
+        wb.save(str(items_path))
+        
+        logger.info(f"✅ OPEX item details saved: {items_path}")
+        return str(items_path)
+    
     def _auto_adjust_columns(self, ws):
         """自动调整列宽"""
         from openpyxl.cell.cell import MergedCell
@@ -811,8 +1010,18 @@ class EconomicExcelExporter:
             adjusted_width = min(max_length + 2, 50)
             ws.column_dimensions[column_letter].width = adjusted_width
     
+    def _write_chart_data(self, ws, start_row, chart_data):
+        """将图表数据写入D列起始的单元格区域"""
+        cell_rows = ws.iter_rows(min_row=start_row, max_row=start_row + len(chart_data) - 1,
+                                 min_col=4, max_col=3 + len(chart_data[0]))
+        for cells, row_data in zip(cell_rows, chart_data):
+            for cell, value in zip(cells, row_data):
+                cell.value = value
+    
     def _add_capex_opex_pie_chart(self, ws, results: EconomicAnalysisResults):
         """添加CAPEX/OPEX饼图"""
+        from openpyxl.chart import PieChart, Reference
+        
         try:
             # Create pie chart data
             chart_data = [
@@ -823,19 +1032,16 @@ class EconomicExcelExporter:
             
             # Add data to worksheet (in a location that won't interfere)
             chart_start_row = 20
-            for i, row_data in enumerate(chart_data):
-                for j, value in enumerate(row_data):
-                    ws.cell(row=chart_start_row + i, column=4 + j, value=value)
+            self._write_chart_data(ws, chart_start_row, chart_data)
             
             # Create pie chart
             chart = PieChart()
             chart.title = "CAPEX vs Annual OPEX"
             
             # Data references
-            data = Reference(ws, min_col=5, min_row=chart_start_row + 1, 
-                           max_row=chart_start_row + len(chart_data) - 1)
-            categories = Reference(ws, min_col=4, min_row=chart_start_row + 1, 
-                                 max_row=chart_start_row + len(chart_data) - 1)
+            last_row = chart_start_row + len(chart_data) - 1
+            data = Reference(ws, min_col=5, min_row=chart_start_row + 1, max_row=last_row)
+            categories = Reference(ws, min_col=4, min_row=chart_start_row + 1, max_row=last_row)
             
             chart.add_data(data, titles_from_data=False)
             chart.set_categories(categories)
@@ -852,27 +1058,31 @@ class EconomicExcelExporter:
     
     def _add_capex_breakdown_chart(self, ws, results: EconomicAnalysisResults, start_row):
         """添加CAPEX分解柱状图"""
+        from openpyxl.chart import BarChart, Reference
+        
         try:
             # Prepare chart data
+            cd = results.capex_data
             equipment_total = sum(item.calculate_installed_cost() 
-                                for item in results.capex_data.equipment_costs.values())
+                                for item in cd.equipment_costs.values())
             installation_total = sum(item.calculate_installed_cost() 
-                                   for item in results.capex_data.installation_costs.values())
+                                   for item in cd.installation_costs.values())
             indirect_total = sum(item.calculate_installed_cost() 
-                               for item in results.capex_data.indirect_costs.values())
+                               for item in cd.indirect_costs.values())
+            contingency = results.total_capex * cd.contingency_rate
             
-            chart_data = [
-                ["Category", "Cost"],
-                ["Equipment", equipment_total],
-                ["Installation", installation_total],
-                ["Indirect", indirect_total],
-                ["Contingency", results.total_capex * results.capex_data.contingency_rate]
+            # Only emit non-zero categories (contingency may legitimately be 0)
+            chart_data = [["Category", "Cost"]] + [
+                row for row in [
+                    ["Equipment", equipment_total],
+                    ["Installation", installation_total],
+                    ["Indirect", indirect_total],
+                    ["Contingency", contingency]
+                ] if row[1] > 0
             ]
             
             # Add data to worksheet
-            for i, row_data in enumerate(chart_data):
-                for j, value in enumerate(row_data):
-                    ws.cell(row=start_row + i, column=4 + j, value=value)
+            self._write_chart_data(ws, start_row, chart_data)
             
             # Create bar chart
             chart = BarChart()
@@ -880,10 +1090,9 @@ class EconomicExcelExporter:
             chart.y_axis.title = "Cost (USD)"
             
             # Data references
-            data = Reference(ws, min_col=5, min_row=start_row + 1, 
-                           max_row=start_row + len(chart_data) - 1)
-            categories = Reference(ws, min_col=4, min_row=start_row + 1, 
-                                 max_row=start_row + len(chart_data) - 1)
+            last_row = start_row + len(chart_data) - 1
+            data = Reference(ws, min_col=5, min_row=start_row + 1, max_row=last_row)
+            categories = Reference(ws, min_col=4, min_row=start_row + 1, max_row=last_row)
             
             chart.add_data(data, titles_from_data=False)
             chart.set_categories(categories)
@@ -893,39 +1102,39 @@ class EconomicExcelExporter:
             chart.height = 10
             
             # Add chart to worksheet
-            ws.add_chart(chart, f"D{start_row + len(chart_data) + 1}")
+            ws.add_chart(chart, f"D{last_row + 2}")
             
         except Exception as e:
             logger.warning(f"Could not create CAPEX breakdown chart: {str(e)}")
     
     def _add_opex_breakdown_chart(self, ws, results: EconomicAnalysisResults, start_row):
         """添加OPEX分解柱状图"""
+        from openpyxl.chart import BarChart, Reference
+        
         try:
             # Prepare chart data
+            od = results.opex_data
             raw_materials_total = sum(item.calculate_installed_cost() 
-                                    for item in results.opex_data.raw_material_costs.values())
+                                    for item in od.raw_material_costs.values())
             utilities_total = sum(item.calculate_installed_cost() 
-                                for item in results.opex_data.utility_costs.values())
+                                for item in od.utility_costs.values())
             labor_total = sum(item.calculate_installed_cost() 
-                            for item in results.opex_data.labor_costs.values())
+                            for item in od.labor_costs.values())
             maintenance_total = sum(item.calculate_installed_cost() 
-                                  for item in results.opex_data.maintenance_costs.values())
+                                  for item in od.maintenance_costs.values())
             
-            chart_data = [
-                ["Category", "Annual Cost"],
-                ["Raw Materials", raw_materials_total],
-                ["Utilities", utilities_total],
-                ["Labor", labor_total],
-                ["Maintenance", maintenance_total]
+            # Filter out zero values before anything is written to the sheet
+            chart_data = [["Category", "Annual Cost"]] + [
+                row for row in [
+                    ["Raw Materials", raw_materials_total],
+                    ["Utilities", utilities_total],
+                    ["Labor", labor_total],
+                    ["Maintenance", maintenance_total]
+                ] if row[1] > 0
             ]
             
-            # Filter out zero values
-            chart_data = [chart_data[0]] + [row for row in chart_data[1:] if row[1] > 0]
-            
             # Add data to worksheet
-            for i, row_data in enumerate(chart_data):
-                for j, value in enumerate(row_data):
-                    ws.cell(row=start_row + i, column=4 + j, value=value)
+            self._write_chart_data(ws, start_row, chart_data)
             
             # Create bar chart
             chart = BarChart()
@@ -933,10 +1142,9 @@ class EconomicExcelExporter:
             chart.y_axis.title = "Annual Cost (USD)"
             
             # Data references
-            data = Reference(ws, min_col=5, min_row=start_row + 1, 
-                           max_row=start_row + len(chart_data) - 1)
-            categories = Reference(ws, min_col=4, min_row=start_row + 1, 
-                                 max_row=start_row + len(chart_data) - 1)
+            last_row = start_row + len(chart_data) - 1
+            data = Reference(ws, min_col=5, min_row=start_row + 1, max_row=last_row)
+            categories = Reference(ws, min_col=4, min_row=start_row + 1, max_row=last_row)
             
             chart.add_data(data, titles_from_data=False)
             chart.set_categories(categories)
@@ -946,12 +1154,18 @@ class EconomicExcelExporter:
             chart.height = 10
             
             # Add chart to worksheet
-            ws.add_chart(chart, f"D{start_row + len(chart_data) + 1}")
+            ws.add_chart(chart, f"D{last_row + 2}")
             
         except Exception as e:
             logger.warning(f"Could not create OPEX breakdown chart: {str(e)}")
 
 
+@functools.lru_cache(maxsize=1)
+def _default_exporter() -> EconomicExcelExporter:
+    """复用的默认导出器（仅缓存样式和配置，工作簿在每次导出时新建）"""
+    return EconomicExcelExporter()
+
+
 def test_excel_exporter():
     """测试Excel导出器"""
     try:
@@ -971,7 +1185,7 @@ def test_excel_exporter():
         sample_results.payback_period = 4.2
         
         # Create exporter and generate report
-        exporter = EconomicExcelExporter()
+        exporter = _default_exporter()
         output_file = "test_economic_report.xlsx"
         
         result_file = exporter.export_economic_analysis(sample_results, output_file)
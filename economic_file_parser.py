@@ -13,6 +13,8 @@ Version: 1.0
 """
 
 import os
+import re
+import copy
 import sys
 import struct
 import json
@@ -20,8 +22,26 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
+import mmap
 import zipfile
 import tempfile
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Vectorized binary scanning (falls back to struct when unavailable)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Optional JIT kernel for the cost-value scan (no intermediate arrays)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # Import local data structures
 from data_interfaces import (
@@ -33,6 +53,89 @@ from data_interfaces import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 数值扫描结果：NumPy可用时为np.ndarray，否则为list
+NumericValues = Union[List[float], 'np.ndarray']
+
+# 连续4个及以上可打印ASCII字符（不含空白），直接在字节上匹配
+_PRINTABLE_RUN = re.compile(rb'[!-~]{4,}')
+
+# SZP数据段标识符，合并为单个正则以便一次扫描定位全部标识符
+_SECTION_MARKERS = (
+    b'COST_DATA', b'EQUIPMENT_LIST', b'FINANCIAL_PARAMS',
+    b'CAPEX', b'OPEX', b'ECONOMICS', b'SUMMARY'
+)
+_SECTION_MARKER_RE = re.compile(b'|'.join(re.escape(marker) for marker in _SECTION_MARKERS))
+# (标识符, 长度, 段名称)，避免在扫描时重复计算长度和解码
+_SECTION_MARKER_INFO = tuple(
+    (marker, len(marker), marker.decode('ascii')) for marker in _SECTION_MARKERS
+)
+
+# 文本数据：包含成本关键词的整行，以及行内的数值/版本号
+_COST_LINE_RE = re.compile(r'^.*(?:COST|PRICE|TOTAL|CAPEX|OPEX).*$', re.IGNORECASE | re.MULTILINE)
+_NUMBER_RE = re.compile(r'[\d,]+\.?\d*')
+_VERSION_RE = re.compile(rb'(\d+\.?\d*)')
+
+# 设备/公用工程关键词；合并正则先筛掉不含任何关键词的文本片段
+_EQUIPMENT_KEYWORDS = (
+    'REACTOR', 'PUMP', 'COMPRESSOR', 'HEAT_EXCHANGER', 'COLUMN', 
+    'SEPARATOR', 'TANK', 'VESSEL', 'TOWER', 'DISTILLATION'
+)
+_UTILITY_KEYWORDS = (
+    'STEAM', 'COOLING_WATER', 'ELECTRICITY', 'FUEL_GAS', 
+    'COMPRESSED_AIR', 'NITROGEN', 'WATER', 'POWER'
+)
+# 公用工程关键词同时匹配去掉下划线的写法（如COOLINGWATER）
+_UTILITY_VARIANTS = tuple(
+    (keyword, keyword.replace('_', '')) for keyword in _UTILITY_KEYWORDS
+)
+_EQUIPMENT_KEYWORD_RE = re.compile('|'.join(map(re.escape, _EQUIPMENT_KEYWORDS)))
+_UTILITY_KEYWORD_RE = re.compile(
+    '|'.join(re.escape(v) for variants in _UTILITY_VARIANTS for v in set(variants))
+)
+
+# 文本判定：可打印ASCII及制表/换行/回车
+_TEXT_BYTES = bytes(range(0x20, 0x7f)) + b'\t\n\r'
+
+# 无NumPy时的逐值解析器（iter_unpack在C层迭代，避免每个偏移切片一次）
+_F32 = struct.Struct('<f')
+_F64 = struct.Struct('<d')
+
+
+if NUMBA_AVAILABLE:
+    # (位移, 掩码, 最小, 最大) 偏置指数：1 <= |x| <= 1e9 对应二进制指数 0..29
+    _F32_COST_EXP = (np.uint32(23), np.uint32(0xFF), np.uint32(127), np.uint32(127 + 29))
+    _F64_COST_EXP = (np.uint64(52), np.uint64(0x7FF), np.uint64(1023), np.uint64(1023 + 29))
+    
+    @njit(cache=True)
+    def _collect_cost_like(bits, values, exp_range, out, n):
+        """先按整数指数位筛选，只对通过的候选值做浮点比较，写入out[n:]并返回新的n"""
+        shift, mask, low, high = exp_range
+        for i in range(len(bits)):
+            exponent = (bits[i] >> shift) & mask
+            if low <= exponent <= high:
+                value = np.float64(values[i])
+                if abs(value) <= 1e9:
+                    out[n] = value
+                    n += 1
+        return n
+    
+    @njit(cache=True)
+    def _scan_cost_floats_numba(u32, f32, u64_even, f64_even, u64_odd, f64_odd,
+                                f32_exp, f64_exp):
+        """一次遍历筛选 1 <= |x| <= 1e9 的float32/float64候选值（NaN/Inf指数位全1，自动排除）"""
+        out = np.empty(len(u32) + len(u64_even) + len(u64_odd), np.float64)
+        n = _collect_cost_like(u32, f32, f32_exp, out, 0)
+        n = _collect_cost_like(u64_even, f64_even, f64_exp, out, n)
+        n = _collect_cost_like(u64_odd, f64_odd, f64_exp, out, n)
+        return out[:n]
+
+
+def _select_range(values: NumericValues, low: float, high: float) -> NumericValues:
+    """返回 low < v < high 的值，ndarray使用布尔索引"""
+    if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+        return values[(values > low) & (values < high)]
+    return [v for v in values if low < v < high]
+
 
 class EconomicFileParser:
     """
@@ -48,12 +151,14 @@ class EconomicFileParser:
         self.parsing_errors = []
         self.warnings = []
     
-    def parse_file(self, file_path: str) -> EconomicAnalysisResults:
+    def parse_file(self, file_path: str, lazy: bool = False) -> EconomicAnalysisResults:
         """
         解析经济文件并返回结构化数据
         
         Args:
             file_path: 经济文件路径
+            lazy: 为True时成本/财务数据延迟到首次访问相应字段时才解析，
+                  解析错误也推迟到那时才抛出
             
         Returns:
             EconomicAnalysisResults: 解析后的经济数据
@@ -71,16 +176,38 @@ class EconomicFileParser:
         logger.info(f"Parsing economic file: {file_path}")
         
         try:
-            if file_ext == '.izp':
-                return self._parse_izp_file(file_path)
-            elif file_ext == '.szp':
-                return self._parse_szp_file(file_path)
+            # 同一文件未修改时复用缓存结果（键随mtime/大小变化自动失效），
+            # 每次返回副本，调用方修改结果不会影响缓存
+            stat = file_path.stat()
+            cache_key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+            cached = _parse_cache.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
+            # 在当前解析器上解析，解析错误（包括延迟解析的错误）记录到本实例
+            results = self._parse_path(file_path, lazy)
+            if lazy:
+                # 尚未解析完成的结果不缓存
+                return results
+            
+            _cache_results(cache_key, results)
+            return copy.deepcopy(results)
         except Exception as e:
             logger.error(f"Error parsing {file_path}: {str(e)}")
             self.parsing_errors.append(str(e))
             raise
     
-    def _parse_izp_file(self, file_path: Path) -> EconomicAnalysisResults:
+    def reload(self):
+        """清空已解析文件的缓存，下次parse_file将重新读取文件"""
+        _parse_cache.clear()
+    
+    def _parse_path(self, file_path: Path, lazy: bool = False) -> EconomicAnalysisResults:
+        """按扩展名分派到对应的解析方法（不经过缓存）"""
+        if file_path.suffix.lower() == '.izp':
+            return self._parse_izp_file(file_path, lazy)
+        return self._parse_szp_file(file_path, lazy)
+    
+    def _parse_izp_file(self, file_path: Path, lazy: bool = False) -> EconomicAnalysisResults:
         """
         解析IZP文件 (Aspen Icarus Cost Estimator项目文件)
         
@@ -95,6 +222,42 @@ class EconomicFileParser:
             analysis_version="1.0"
         )
         
+        # 成本数据立即解析，或在lazy时推迟到首次访问时才解压和扫描
+        self._load_or_defer(
+            results, ('capex_data', 'opex_data', 'total_capex', 'annual_opex'),
+            self._load_izp_contents, file_path, lazy
+        )
+        
+        # 添加数据源信息
+        results.data_sources.append(f"IZP file: {file_path}")
+        results.estimation_methods.append("Aspen Icarus Cost Estimator")
+        
+        return results
+    
+    def _load_or_defer(self, results: EconomicAnalysisResults, names: Tuple[str, ...],
+                       load, file_path: Path, lazy: bool):
+        """
+        立即调用load(file_path, results)，或在lazy时把这些字段推迟到首次访问
+        
+        立即解析时错误由parse_file记录；延迟解析时错误在访问字段时
+        记录到本解析器并重新抛出
+        """
+        if not lazy:
+            load(file_path, results)
+            return
+        
+        def loader(results: EconomicAnalysisResults):
+            try:
+                load(file_path, results)
+            except Exception as e:
+                logger.error(f"Error parsing {file_path}: {str(e)}")
+                self.parsing_errors.append(str(e))
+                raise
+        
+        results.defer(names, loader)
+    
+    def _load_izp_contents(self, file_path: Path, results: EconomicAnalysisResults):
+        """解压并解析IZP文件中的成本和数据条目"""
         try:
             # 尝试作为ZIP文件解析
             with zipfile.ZipFile(file_path, 'r') as zip_file:
@@ -105,40 +268,104 @@ class EconomicFileParser:
                 cost_files = [f for f in file_list if 'cost' in f.lower() or 'econ' in f.lower()]
                 data_files = [f for f in file_list if '.dat' in f.lower() or '.txt' in f.lower()]
                 
-                # 解析成本数据文件
-                for cost_file in cost_files:
-                    try:
-                        with zip_file.open(cost_file) as f:
-                            content = f.read()
-                            self._extract_cost_data_from_binary(content, results)
-                    except Exception as e:
-                        logger.warning(f"Could not parse {cost_file}: {str(e)}")
-                
-                # 解析数据文件
-                for data_file in data_files:
-                    try:
-                        with zip_file.open(data_file) as f:
-                            content = f.read()
-                            if self._is_text_content(content):
-                                text_content = content.decode('utf-8', errors='ignore')
+                # 各条目相互独立，并行解压和扫描；结果按原顺序在主线程合并
+                max_workers = min(8, os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    cost_futures = [
+                        (cost_file, executor.submit(self._parse_cost_entry, zip_file, 
+                                                    cost_file, results.project_name))
+                        for cost_file in cost_files
+                    ]
+                    data_futures = [
+                        (data_file, executor.submit(self._parse_data_entry, zip_file, data_file))
+                        for data_file in data_files
+                    ]
+                    
+                    # 解析成本数据文件
+                    for cost_file, future in cost_futures:
+                        try:
+                            cost_data = future.result()
+                            if cost_data:
+                                self._apply_cost_data(results, *cost_data)
+                        except Exception as e:
+                            logger.warning(f"Could not parse {cost_file}: {str(e)}")
+                    
+                    # 解析数据文件
+                    for data_file, future in data_futures:
+                        try:
+                            text_content = future.result()
+                            if text_content:
                                 self._extract_text_based_data(text_content, results)
-                    except Exception as e:
-                        logger.warning(f"Could not parse {data_file}: {str(e)}")
+                        except Exception as e:
+                            logger.warning(f"Could not parse {data_file}: {str(e)}")
                         
         except zipfile.BadZipFile:
             # 如果不是ZIP文件，尝试直接解析二进制内容
             logger.info("IZP is not a ZIP file, attempting binary parsing")
-            with open(file_path, 'rb') as f:
-                content = f.read()
+            with self._map_file(file_path) as content:
                 self._extract_cost_data_from_binary(content, results)
+    
+    def _parse_cost_entry(self, zip_file: zipfile.ZipFile, name: str, 
+                          project_name: str) -> Optional[Tuple[CapexData, OpexData]]:
+        """读取并解析单个成本条目（在工作线程中运行）"""
+        content = self._read_zip_entry(zip_file, name)
+        if not content:
+            return None
+        return self._build_cost_data(content, project_name)
+    
+    def _parse_data_entry(self, zip_file: zipfile.ZipFile, name: str) -> Optional[str]:
+        """读取单个数据条目，文本内容返回解码后的字符串（在工作线程中运行）"""
+        content = self._read_zip_entry(zip_file, name)
+        if content and self._is_text_content(content):
+            return content.decode('utf-8', errors='ignore')
+        return None
+    
+    @contextmanager
+    def _map_file(self, file_path: Path):
+        """
+        以只读内存映射方式打开文件，避免将整个文件复制到Python bytes
         
-        # 添加数据源信息
-        results.data_sources.append(f"IZP file: {file_path}")
-        results.estimation_methods.append("Aspen Icarus Cost Estimator")
+        映射对象支持find()、切片、正则和np.frombuffer，可直接替代bytes使用；
+        空文件无法映射，返回空bytes。
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+    
+    def _read_zip_entry(self, zip_file: zipfile.ZipFile, name: str) -> bytearray:
+        """
+        将ZIP条目读入按解压后大小预分配的缓冲区
         
-        return results
+        Args:
+            zip_file: 已打开的ZIP文件
+            name: 条目名称
+            
+        Returns:
+            条目内容（空条目返回空缓冲区）
+        """
+        zinfo = zip_file.getinfo(name)
+        buf = bytearray(zinfo.file_size)
+        if not zinfo.file_size:
+            return buf
+        
+        view = memoryview(buf)
+        n = 0
+        with zip_file.open(zinfo) as f:
+            while n < zinfo.file_size:
+                k = f.readinto(view[n:])
+                if not k:
+                    break
+                n += k
+        view.release()
+        
+        if n < zinfo.file_size:
+            del buf[n:]
+        return buf
     
-    def _parse_szp_file(self, file_path: Path) -> EconomicAnalysisResults:
+    def _parse_szp_file(self, file_path: Path, lazy: bool = False) -> EconomicAnalysisResults:
         """
         解析SZP文件 (Aspen经济分析数据文件)
         
@@ -152,14 +379,11 @@ class EconomicFileParser:
             analysis_version="1.0"
         )
         
-        with open(file_path, 'rb') as f:
-            content = f.read()
-            
-            # 解析文件头信息
-            header_info = self._parse_szp_header(content[:1024])
-            
-            # 提取经济数据
-            self._extract_szp_economic_data(content, results, header_info)
+        # 数据段立即扫描，或在lazy时推迟到首次访问
+        self._load_or_defer(
+            results, ('capex_data', 'financial_params'),
+            self._load_szp_contents, file_path, lazy
+        )
         
         # 添加数据源信息
         results.data_sources.append(f"SZP file: {file_path}")
@@ -167,6 +391,15 @@ class EconomicFileParser:
         
         return results
     
+    def _load_szp_contents(self, file_path: Path, results: EconomicAnalysisResults):
+        """映射并解析SZP文件的文件头和数据段"""
+        with self._map_file(file_path) as content:
+            # 解析文件头信息
+            header_info = self._parse_szp_header(content[:1024])
+            
+            # 提取经济数据
+            self._extract_szp_economic_data(content, results, header_info)
+    
     def _extract_cost_data_from_binary(self, content: bytes, results: EconomicAnalysisResults):
         """
         从二进制内容中提取成本数据
@@ -175,6 +408,20 @@ class EconomicFileParser:
             content: 二进制文件内容
             results: 经济分析结果容器
         """
+        capex_data, opex_data = self._build_cost_data(content, results.project_name)
+        self._apply_cost_data(results, capex_data, opex_data)
+    
+    def _build_cost_data(self, content: bytes, project_name: str) -> Tuple[CapexData, OpexData]:
+        """
+        从二进制内容构建CAPEX和OPEX数据（不修改结果容器，可在工作线程中调用）
+        
+        Args:
+            content: 二进制文件内容
+            project_name: 项目名称
+            
+        Returns:
+            (CapexData, OpexData)
+        """
         logger.info("Extracting cost data from binary content")
         
         # 查找可能的数字模式和字符串
@@ -189,12 +436,11 @@ class EconomicFileParser:
         numeric_data = self._extract_numeric_data(content)
         
         # 初始化CAPEX和OPEX数据
-        capex_data = CapexData(project_name=results.project_name)
-        opex_data = OpexData(project_name=results.project_name)
+        capex_data = CapexData(project_name=project_name)
+        opex_data = OpexData(project_name=project_name)
         
         # 解析提取的数据
-        equipment_costs = self._identify_equipment_costs(text_chunks, numeric_data)
-        utility_costs = self._identify_utility_costs(text_chunks, numeric_data)
+        equipment_costs, utility_costs = self._identify_costs(text_chunks, numeric_data)
         
         # 添加成本项目
         for name, cost in equipment_costs.items():
@@ -221,6 +467,11 @@ class EconomicFileParser:
         capex_data.calculate_total_capex()
         opex_data.calculate_annual_opex(capex_data.total_capex)
         
+        return capex_data, opex_data
+    
+    def _apply_cost_data(self, results: EconomicAnalysisResults, 
+                         capex_data: CapexData, opex_data: OpexData):
+        """将CAPEX和OPEX数据写入结果容器"""
         results.capex_data = capex_data
         results.opex_data = opex_data
         results.total_capex = capex_data.total_capex
@@ -297,39 +548,18 @@ class EconomicFileParser:
         Returns:
             List of text strings found in content
         """
-        text_chunks = []
-        
-        # 尝试不同编码
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'ascii']
+        # 在字节内容上直接查找连续的可打印字符，避免整体解码和逐字符循环
+        # 按出现顺序去重（在bytes上去重），凑满100个后立即停止扫描
+        unique_chunks = {}
+        for match in _PRINTABLE_RUN.finditer(content):
+            unique_chunks[match.group()] = None
+            if len(unique_chunks) >= 100:  # 限制数量
+                break
         
-        for encoding in encodings:
-            try:
-                # 查找连续的可打印字符
-                decoded = content.decode(encoding, errors='ignore')
-                
-                # 提取长度大于3的字符串片段
-                words = []
-                current_word = ""
-                
-                for char in decoded:
-                    if char.isprintable() and not char.isspace():
-                        current_word += char
-                    else:
-                        if len(current_word) > 3:
-                            words.append(current_word)
-                        current_word = ""
-                
-                text_chunks.extend(words)
-                break  # 成功解码，退出循环
-                
-            except Exception:
-                continue
-        
-        # 去重并排序
-        unique_chunks = list(set(text_chunks))
-        return unique_chunks[:100]  # 限制数量
+        # 只解码保留的片段（均为ASCII）
+        return [chunk.decode('ascii') for chunk in unique_chunks]
     
-    def _extract_numeric_data(self, content: bytes) -> List[float]:
+    def _extract_numeric_data(self, content: bytes) -> NumericValues:
         """
         从二进制内容中提取数值数据
         
@@ -337,31 +567,115 @@ class EconomicFileParser:
             content: 二进制内容
             
         Returns:
-            List of numeric values found
+            Sorted unique values (np.ndarray when NumPy is available, else list)
         """
-        numbers = []
+        if NUMBA_AVAILABLE:
+            return self._extract_numeric_data_numba(content)
         
-        # 尝试解析4字节和8字节浮点数
-        for i in range(0, len(content) - 8, 4):
-            try:
-                # 4字节浮点数
-                num_float = struct.unpack('<f', content[i:i+4])[0]
-                if self._is_reasonable_cost_value(num_float):
-                    numbers.append(float(num_float))
-                
-                # 8字节浮点数
-                if i + 8 <= len(content):
-                    num_double = struct.unpack('<d', content[i:i+8])[0]
-                    if self._is_reasonable_cost_value(num_double):
-                        numbers.append(float(num_double))
-                        
-            except (struct.error, OverflowError):
-                continue
+        if NUMPY_AVAILABLE:
+            # 1 <= |x| <= 1e9 对应二进制指数 0..29（2^29 < 1e9 < 2^30）
+            values = self._float_candidates_numpy(content, 0, 29)
+            # 去重并排序
+            return np.unique(values[np.abs(values) <= 1e9])[:500]  # 限制数量
+        
+        # 尝试解析4字节和8字节浮点数（NaN比较为False，自动排除）
+        numbers = [value for value in self._float_candidates_struct(content)
+                   if 1.0 <= abs(value) <= 1e9]
         
         # 去重并排序
-        unique_numbers = sorted(list(set(numbers)))
+        unique_numbers = sorted(set(numbers))
         return unique_numbers[:500]  # 限制数量
     
+    def _extract_numeric_data_numba(self, content: bytes) -> 'np.ndarray':
+        """
+        使用Numba JIT内核提取数值数据
+        
+        整数位视图和float32/float64视图均为零拷贝；内核先按指数位整数比较
+        筛掉绝大多数候选值，结果与NumPy及struct路径一致。
+        """
+        buf = np.frombuffer(content, dtype=np.uint8)
+        n_offsets = max(0, (len(buf) - 8 + 3) // 4)  # 与range(0, len-8, 4)一致
+        even_count = (n_offsets + 1) // 2
+        odd_count = n_offsets // 2
+        
+        f32 = buf[:n_offsets * 4]
+        f64_even = buf[:even_count * 8]
+        f64_odd = buf[4:4 + odd_count * 8]
+        values = _scan_cost_floats_numba(
+            f32.view('<u4'), f32.view('<f4'),
+            f64_even.view('<u8'), f64_even.view('<f8'),
+            f64_odd.view('<u8'), f64_odd.view('<f8'),
+            _F32_COST_EXP, _F64_COST_EXP
+        )
+        return np.unique(values)[:500]
+    
+    def _float_candidates_struct(self, content: bytes):
+        """
+        不依赖NumPy地逐值解释候选浮点数
+        
+        与_float_candidates_numpy的偏移规则相同（4字节对齐偏移 i < len-8），
+        但不做范围过滤：float32区间连续解析一次，float64按0 mod 8和
+        4 mod 8两组偏移各解析一次，每组只切片一次。
+        
+        Args:
+            content: 二进制内容
+            
+        Yields:
+            float values (float32 values upcast to float)
+        """
+        n_offsets = max(0, (len(content) - 8 + 3) // 4)  # 与range(0, len-8, 4)一致
+        if n_offsets == 0:
+            return
+        
+        with memoryview(content) as view:
+            for (value,) in _F32.iter_unpack(view[:n_offsets * 4]):
+                yield value
+            for start in (0, 4):
+                count = (n_offsets - start // 4 + 1) // 2
+                for (value,) in _F64.iter_unpack(view[start:start + count * 8]):
+                    yield value
+    
+    def _float_candidates_numpy(self, content: bytes, min_exp: int, max_exp: int) -> 'np.ndarray':
+        """
+        使用NumPy视图将内容解释为候选浮点数
+        
+        与逐偏移struct解析相同：在4字节对齐的偏移处(i < len-8)
+        分别按float32和float64解释；float32值提升为float64。
+        转换为浮点数之前先在整数位模式上按指数范围过滤，绝大多数
+        候选值（包括NaN/Inf）只经过一次整数比较就被丢弃。
+        
+        Args:
+            content: 二进制内容
+            min_exp: 保留的最小二进制指数（无偏）
+            max_exp: 保留的最大二进制指数（无偏）
+            
+        Returns:
+            float64 array of candidates with 2**min_exp <= |x| < 2**(max_exp+1)
+        """
+        buf = np.frombuffer(content, dtype=np.uint8)
+        n_offsets = max(0, (len(buf) - 8 + 3) // 4)  # 与range(0, len-8, 4)一致
+        if n_offsets == 0:
+            return np.empty(0, dtype=np.float64)
+        
+        candidates = []
+        
+        # 4字节浮点数：指数位为bit 23-30，偏置127
+        u32 = buf[:n_offsets * 4].view('<u4')
+        exp32 = (u32 >> 23) & 0xFF
+        keep = (exp32 >= 127 + min_exp) & (exp32 <= 127 + max_exp)
+        candidates.append(u32[keep].view('<f4').astype(np.float64))
+        
+        # 8字节浮点数：4字节对齐偏移分为0 mod 8和4 mod 8两组视图；指数位为bit 52-62，偏置1023
+        for start in (0, 4):
+            count = (n_offsets - start // 4 + 1) // 2
+            if count > 0:
+                u64 = buf[start:start + count * 8].view('<u8')
+                exp64 = (u64 >> 52) & 0x7FF
+                keep = (exp64 >= 1023 + min_exp) & (exp64 <= 1023 + max_exp)
+                candidates.append(u64[keep].view('<f8'))
+        
+        return np.concatenate(candidates)
+    
     def _is_reasonable_cost_value(self, value: float) -> bool:
         """
         判断数值是否为合理的成本值
@@ -389,77 +703,47 @@ class EconomicFileParser:
         
         return True
     
-    def _identify_equipment_costs(self, text_chunks: List[str], 
-                                numeric_data: List[float]) -> Dict[str, float]:
+    def _identify_costs(self, text_chunks: List[str], 
+                        numeric_data: NumericValues) -> Tuple[Dict[str, float], Dict[str, float]]:
         """
-        识别设备成本数据
+        一次遍历文本片段，同时识别设备成本和公用工程成本数据
         
         Args:
             text_chunks: 文本片段
             numeric_data: 数值数据
             
         Returns:
-            Dictionary of equipment names and costs
+            (equipment name -> cost, utility name -> cost)
         """
         equipment_costs = {}
+        utility_costs = {}
         
-        # 设备类型关键词
-        equipment_keywords = [
-            'REACTOR', 'PUMP', 'COMPRESSOR', 'HEAT_EXCHANGER', 'COLUMN', 
-            'SEPARATOR', 'TANK', 'VESSEL', 'TOWER', 'DISTILLATION'
-        ]
-        
-        # 查找设备相关的文本和对应的数值
         for i, text in enumerate(text_chunks):
             text_upper = text.upper()
-            for keyword in equipment_keywords:
-                if keyword in text_upper:
-                    # 查找附近的数值作为成本
-                    if i < len(numeric_data):
-                        cost = numeric_data[min(i, len(numeric_data)-1)]
-                        equipment_name = f"{keyword}_{i+1}"
-                        equipment_costs[equipment_name] = cost
+            
+            # 设备：只有前len(numeric_data)个片段有对应数值，取同位置数值作为成本
+            if i < len(numeric_data) and _EQUIPMENT_KEYWORD_RE.search(text_upper):
+                cost = float(numeric_data[i])
+                for keyword in _EQUIPMENT_KEYWORDS:
+                    if keyword in text_upper:
+                        equipment_costs[f"{keyword}_{i+1}"] = cost
+            
+            # 公用工程：查找附近的较小数值作为年消耗成本
+            if _UTILITY_KEYWORD_RE.search(text_upper):
+                nearby_values = numeric_data[max(0, i-5):i+5]
+                small_values = _select_range(nearby_values, 100, 50000)
+                if len(small_values):
+                    for keyword, compact in _UTILITY_VARIANTS:
+                        if keyword in text_upper or compact in text_upper:
+                            utility_costs[keyword] = float(small_values[0])
         
         # 如果没找到设备，使用较大的数值作为设备成本
-        if not equipment_costs and numeric_data:
-            large_values = [v for v in numeric_data if v > 10000]
+        if not equipment_costs and len(numeric_data):
+            large_values = _select_range(numeric_data, 10000, float('inf'))
             for i, cost in enumerate(large_values[:10]):  # 取前10个大值
-                equipment_costs[f"EQUIPMENT_{i+1}"] = cost
-        
-        return equipment_costs
-    
-    def _identify_utility_costs(self, text_chunks: List[str], 
-                               numeric_data: List[float]) -> Dict[str, float]:
-        """
-        识别公用工程成本数据
-        
-        Args:
-            text_chunks: 文本片段
-            numeric_data: 数值数据
-            
-        Returns:
-            Dictionary of utility names and costs
-        """
-        utility_costs = {}
-        
-        # 公用工程关键词
-        utility_keywords = [
-            'STEAM', 'COOLING_WATER', 'ELECTRICITY', 'FUEL_GAS', 
-            'COMPRESSED_AIR', 'NITROGEN', 'WATER', 'POWER'
-        ]
+                equipment_costs[f"EQUIPMENT_{i+1}"] = float(cost)
         
-        # 查找公用工程相关的文本和数值
-        for i, text in enumerate(text_chunks):
-            text_upper = text.upper()
-            for keyword in utility_keywords:
-                if keyword in text_upper or keyword.replace('_', '') in text_upper:
-                    # 查找附近的较小数值作为年消耗成本
-                    nearby_values = numeric_data[max(0, i-5):i+5]
-                    small_values = [v for v in nearby_values if 100 < v < 50000]
-                    if small_values:
-                        utility_costs[keyword] = small_values[0]
-        
-        return utility_costs
+        return equipment_costs, utility_costs
     
     def _identify_data_sections(self, content: bytes) -> Dict[str, bytes]:
         """
@@ -473,26 +757,27 @@ class EconomicFileParser:
         """
         sections = {}
         
-        # 查找常见的数据段标识符
-        section_markers = [
-            b'COST_DATA', b'EQUIPMENT_LIST', b'FINANCIAL_PARAMS',
-            b'CAPEX', b'OPEX', b'ECONOMICS', b'SUMMARY'
-        ]
-        
+        # 一次扫描得到按位置排序的全部标识符出现位置，以及每个标识符各自的位置
+        # （每次从上一个命中位置+1继续，重叠的标识符如 b'...PARAMSUMMARY' 也都能被找到）
+        hit_positions = []
+        positions = {marker: [] for marker in _SECTION_MARKERS}
+        match = _SECTION_MARKER_RE.search(content)
+        while match is not None:
+            hit_positions.append(match.start())
+            positions[match.group()].append(match.start())
+            match = _SECTION_MARKER_RE.search(content, match.start() + 1)
+        
+        hit_positions.append(len(content))  # 哨兵：最后一段延伸到文件末尾
         current_pos = 0
-        for marker in section_markers:
-            marker_pos = content.find(marker, current_pos)
-            if marker_pos != -1:
-                # 查找下一个标识符确定段的结束位置
-                next_pos = len(content)
-                for next_marker in section_markers:
-                    next_marker_pos = content.find(next_marker, marker_pos + len(marker))
-                    if next_marker_pos != -1:
-                        next_pos = min(next_pos, next_marker_pos)
-                
-                section_data = content[marker_pos:next_pos]
-                sections[marker.decode('ascii', errors='ignore')] = section_data
-                current_pos = marker_pos + len(marker)
+        for marker, marker_len, name in _SECTION_MARKER_INFO:
+            marker_hits = positions[marker]
+            idx = bisect_left(marker_hits, current_pos)
+            if idx < len(marker_hits):
+                marker_pos = marker_hits[idx]
+                current_pos = marker_pos + marker_len
+                # 段结束于标识符之后的第一个标识符（已排序，一次二分查找）
+                next_pos = hit_positions[bisect_left(hit_positions, current_pos)]
+                sections[name] = content[marker_pos:next_pos]
         
         return sections
     
@@ -508,7 +793,7 @@ class EconomicFileParser:
                 cost_item = CostItem(
                     name=f"COST_ITEM_{i+1}",
                     category=CostCategory.EQUIPMENT,
-                    base_cost=value,
+                    base_cost=float(value),
                     estimation_method="SZP binary extraction"
                 )
                 results.capex_data.add_cost_item(cost_item)
@@ -518,16 +803,16 @@ class EconomicFileParser:
         numeric_values = self._extract_numeric_data(section_data)
         
         # 查找可能的折现率、税率等财务参数
-        percentage_values = [v for v in numeric_values if 0.01 < v < 1.0]
+        percentage_values = _select_range(numeric_values, 0.01, 1.0)
         
-        if percentage_values:
+        if len(percentage_values):
             financial_params = FinancialParameters(project_name=results.project_name)
             
             # 尝试识别不同的财务参数
             if len(percentage_values) >= 1:
-                financial_params.discount_rate = percentage_values[0]
+                financial_params.discount_rate = float(percentage_values[0])
             if len(percentage_values) >= 2:
-                financial_params.tax_rate = percentage_values[1]
+                financial_params.tax_rate = float(percentage_values[1])
             
             results.financial_params = financial_params
     
@@ -546,14 +831,13 @@ class EconomicFileParser:
         Returns:
             True if content appears to be text
         """
-        try:
-            # 尝试解码前1000字节
-            sample = content[:1000].decode('utf-8')
-            # 检查可打印字符的比例
-            printable_ratio = sum(1 for c in sample if c.isprintable()) / len(sample)
-            return printable_ratio > 0.7
-        except:
+        # 直接在前1000字节上统计，无需解码
+        sample = content[:1000]
+        if not sample:
             return False
+        # 删除可打印字节后剩余的即为不可打印字节
+        printable = len(sample) - len(sample.translate(None, _TEXT_BYTES))
+        return printable / len(sample) > 0.7
     
     def _extract_text_based_data(self, text_content: str, results: EconomicAnalysisResults):
         """
@@ -563,30 +847,26 @@ class EconomicFileParser:
             text_content: 文本内容
             results: 经济分析结果容器
         """
-        # 查找数值和相关的描述
-        lines = text_content.split('\n')
-        
-        for line in lines:
-            # 查找包含成本相关关键词和数值的行
-            if any(keyword in line.upper() for keyword in ['COST', 'PRICE', 'TOTAL', 'CAPEX', 'OPEX']):
-                # 提取数值
-                import re
-                numbers = re.findall(r'[\d,]+\.?\d*', line)
-                if numbers:
-                    try:
-                        value = float(numbers[0].replace(',', ''))
-                        if self._is_reasonable_cost_value(value):
-                            # 创建成本项目
-                            cost_item = CostItem(
-                                name=f"TEXT_ITEM_{len(results.capex_data.equipment_costs)+1}",
-                                category=CostCategory.OTHER,
-                                base_cost=value,
-                                estimation_method="Text extraction",
-                                notes=[line.strip()]
-                            )
-                            results.capex_data.add_cost_item(cost_item)
-                    except ValueError:
-                        continue
+        # 查找包含成本相关关键词的行（单次扫描整段文本）
+        for line_match in _COST_LINE_RE.finditer(text_content):
+            line = line_match.group()
+            # 提取数值
+            number_match = _NUMBER_RE.search(line)
+            if number_match:
+                try:
+                    value = float(number_match.group().replace(',', ''))
+                    if self._is_reasonable_cost_value(value):
+                        # 创建成本项目
+                        cost_item = CostItem(
+                            name=f"TEXT_ITEM_{len(results.capex_data.equipment_costs)+1}",
+                            category=CostCategory.OTHER,
+                            base_cost=value,
+                            estimation_method="Text extraction",
+                            notes=[line.strip()]
+                        )
+                        results.capex_data.add_cost_item(cost_item)
+                except ValueError:
+                    continue
     
     def _extract_version_number(self, version_data: bytes) -> str:
         """
@@ -598,14 +878,10 @@ class EconomicFileParser:
         Returns:
             Version string if found
         """
-        try:
-            text = version_data.decode('ascii', errors='ignore')
-            import re
-            version_match = re.search(r'(\d+\.?\d*)', text)
-            if version_match:
-                return version_match.group(1)
-        except:
-            pass
+        # 直接在字节上匹配，只解码匹配到的版本号
+        version_match = _VERSION_RE.search(version_data)
+        if version_match:
+            return version_match.group(1).decode('ascii')
         return "Unknown"
     
     def get_parsing_report(self) -> Dict[str, Any]:
@@ -623,6 +899,18 @@ class EconomicFileParser:
         }
 
 
+# 已完整解析的结果，键为(路径, 修改时间, 文件大小)；模块级，不同解析器实例共享
+_PARSE_CACHE_SIZE = 64
+_parse_cache: Dict[Tuple[str, int, int], EconomicAnalysisResults] = {}
+
+
+def _cache_results(key: Tuple[str, int, int], results: EconomicAnalysisResults):
+    """保存解析结果（调用方只拿到副本），超过容量时淘汰最早加入的条目"""
+    if len(_parse_cache) >= _PARSE_CACHE_SIZE:
+        _parse_cache.pop(next(iter(_parse_cache)))
+    _parse_cache[key] = results
+
+
 def test_economic_parser():
     """测试经济文件解析器"""
     parser = EconomicFileParser()
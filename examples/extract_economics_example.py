@@ -9,29 +9,125 @@ Date: 2025-07-27
 Version: 1.0
 """
 
+import io
 import os
+import argparse
 import sys
+import pickle
+import hashlib
+import functools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+import logging
 from pathlib import Path
 
-# 添加上级目录到路径，以便导入模块
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-try:
-    from extract_aspen_economics import AspenEconomicsExtractor
-    import logging
-except ImportError as e:
-    print(f"ERROR: 导入错误: {e}")
-    print("FIX: 请先运行快速修复脚本:")
-    print("   python quick_fix.py")
-    print("或安装依赖:")
-    print("   pip install PyYAML openpyxl pandas numpy")
-    sys.exit(1)
-
-# 配置日志
-logging.basicConfig(level=logging.INFO)
+# 作为模块导入时不配置根日志，日志输出由main()的--verbose参数决定
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
+# 设置 ASPEN_CACHE=1 时按文件内容哈希缓存IZP/SZP解析结果
+CACHE_ENABLED = os.environ.get('ASPEN_CACHE') == '1'
+CACHE_DIR = Path("examples/output/.cache")
 
+
+# 提取器类在首次使用时才导入（导入会加载pandas/openpyxl/yaml等重量级模块）
+_extractor_cls = None
+
+
+def _lazy_import():
+    """导入并缓存AspenEconomicsExtractor类，导入失败时给出修复提示并退出"""
+    global _extractor_cls
+    if _extractor_cls is None:
+        # 添加上级目录到路径，以便导入模块
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        
+        try:
+            from extract_aspen_economics import AspenEconomicsExtractor
+        except ImportError as e:
+            print(f"ERROR: 导入错误: {e}")
+            print("FIX: 请先运行快速修复脚本:")
+            print("   python quick_fix.py")
+            print("或安装依赖:")
+            print("   pip install PyYAML openpyxl pandas numpy")
+            sys.exit(1)
+        
+        _extractor_cls = AspenEconomicsExtractor
+    return _extractor_cls
+
+
+@functools.lru_cache(maxsize=32)
+def _read_cache_bytes(cache_file: str) -> bytes:
+    """读取磁盘缓存文件内容（同一进程内只读一次）"""
+    with open(cache_file, 'rb') as f:
+        return f.read()
+
+
+def _load_cached_results(cache_file: str):
+    """反序列化缓存结果；每次调用返回新对象，调用方可以随意修改"""
+    return pickle.loads(_read_cache_bytes(cache_file))
+
+
+def _with_disk_cache(extract):
+    """
+    包装extract_from_cost_files：按文件内容的blake2b哈希缓存解析结果
+    
+    命中时直接返回缓存结果，未命中时解析并写入 examples/output/.cache/<hash>.pkl
+    """
+    @functools.wraps(extract)
+    def wrapper(cost_file_path):
+        digest = hashlib.blake2b(Path(cost_file_path).read_bytes()).hexdigest()
+        cache_file = CACHE_DIR / f"{digest}.pkl"
+        
+        if cache_file.exists():
+            logger.info(f"Using cached results for {cost_file_path}")
+            return _load_cached_results(str(cache_file))
+        
+        results = extract(cost_file_path)
+        results.load_deferred()  # 延迟解析的字段需在序列化前完成
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，批量示例的多个进程可能同时写入
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(results, f)
+        os.replace(tmp_file, cache_file)
+        return results
+    
+    return wrapper
+
+
+@functools.cache
+def _get_extractor(config_file: str = None):
+    """
+    获取提取器（每个配置文件在进程内只创建一次，各示例共享）
+    
+    启用缓存时为成本文件解析加上磁盘缓存
+    """
+    extractor = _lazy_import()(config_file=config_file)
+    if CACHE_ENABLED:
+        # extract_and_export内部通过self调用，实例属性覆盖即可生效
+        extractor.extract_from_cost_files = _with_disk_cache(extractor.extract_from_cost_files)
+    return extractor
+
+
+def _buffered_output(example):
+    """
+    示例函数装饰器：缓冲函数内的全部print输出，结束时一次性写出
+    
+    避免逐行写stdout（每次写入都要持有GIL并刷新）
+    """
+    @functools.wraps(example)
+    def wrapper(*args, **kwargs):
+        buf = io.StringIO()
+        try:
+            with redirect_stdout(buf):
+                return example(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
+
+@_buffered_output
 def example_1_extract_from_izp_file():
     """
     示例1：从IZP成本文件提取经济数据
@@ -41,8 +137,8 @@ def example_1_extract_from_izp_file():
     print("="*60)
     
     try:
-        # 创建提取器
-        extractor = AspenEconomicsExtractor()
+        # 获取提取器
+        extractor = _get_extractor()
         
         # IZP文件路径（假设存在）
         izp_file = "aspen_files/BFG-CO2H-MEOH V2 (purge burning)Cost/Scenario1/Scenario1.izp"
@@ -52,10 +148,13 @@ def example_1_extract_from_izp_file():
             # 执行提取和导出
             result = extractor.extract_and_export(
                 data_source=izp_file,
-                output_file=output_file
+                output_file=output_file,
+                skip_if_fresh=True
             )
             
-            if result['success']:
+            if result.get('skipped'):
+                print(f"SKIP: 报告已是最新: {result['report_path']}")
+            elif result['success']:
                 print(f"OK: 成功生成报告: {result['report_path']}")
                 print(f"CAPEX: ${result.get('total_capex', 0):,.0f}")
                 print(f"OPEX: ${result.get('annual_opex', 0):,.0f}")
@@ -71,6 +170,7 @@ def example_1_extract_from_izp_file():
         print(f"ERROR: 示例1执行失败: {str(e)}")
 
 
+@_buffered_output
 def example_2_extract_from_com_interface():
     """
     示例2：从Aspen Plus COM接口提取经济数据
@@ -80,8 +180,8 @@ def example_2_extract_from_com_interface():
     print("="*60)
     
     try:
-        # 创建提取器
-        extractor = AspenEconomicsExtractor()
+        # 获取提取器
+        extractor = _get_extractor()
         
         output_file = "examples/output/economics_from_com.xlsx"
         
@@ -112,6 +212,7 @@ def example_2_extract_from_com_interface():
         print("   这通常是由于没有可用的Aspen Plus COM接口")
 
 
+@_buffered_output
 def example_3_extract_with_custom_config():
     """
     示例3：使用自定义配置文件进行提取
@@ -121,9 +222,9 @@ def example_3_extract_with_custom_config():
     print("="*60)
     
     try:
-        # 使用自定义配置文件创建提取器
+        # 使用自定义配置文件获取提取器
         config_file = "config/economic_extraction_config.yaml"
-        extractor = AspenEconomicsExtractor(config_file=config_file)
+        extractor = _get_extractor(config_file)
         
         # SZP文件路径（假设存在）
         szp_file = "aspen_files/BFG-CO2H-MEOH V2 (purge burning)Cost/Scenario1/Scenario1.szp"
@@ -133,10 +234,13 @@ def example_3_extract_with_custom_config():
             # 执行提取和导出
             result = extractor.extract_and_export(
                 data_source=szp_file,
-                output_file=output_file
+                output_file=output_file,
+                skip_if_fresh=True
             )
             
-            if result['success']:
+            if result.get('skipped'):
+                print(f"SKIP: 报告已是最新: {result['report_path']}")
+            elif result['success']:
                 print(f"OK: 成功生成报告: {result['report_path']}")
                 print(f"CAPEX: ${result.get('total_capex', 0):,.0f}")
                 print(f"OPEX: ${result.get('annual_opex', 0):,.0f}")
@@ -153,6 +257,7 @@ def example_3_extract_with_custom_config():
         print(f"ERROR: 示例3执行失败: {str(e)}")
 
 
+@_buffered_output
 def example_4_step_by_step_extraction():
     """
     示例4：分步骤的经济数据提取和处理
@@ -162,8 +267,8 @@ def example_4_step_by_step_extraction():
     print("="*60)
     
     try:
-        # 创建提取器
-        extractor = AspenEconomicsExtractor()
+        # 获取提取器
+        extractor = _get_extractor()
         
         # 测试文件路径
         test_file = "aspen_files/BFG-CO2H-MEOH V2 (purge burning)Cost/Scenario1/Scenario1.izp"
@@ -198,69 +303,141 @@ def example_4_step_by_step_extraction():
         print(f"ERROR: 示例4执行失败: {str(e)}")
 
 
+def _prefetch_file_stats(paths: list) -> dict:
+    """
+    一次性获取文件列表的修改时间（不存在的文件为None）
+    
+    按父目录分组，每个目录只scandir一次，代替对每个文件单独stat
+    """
+    by_dir = {}
+    for path in paths:
+        by_dir.setdefault(os.path.dirname(path) or '.', []).append(path)
+    
+    stats = {}
+    for directory, dir_paths in by_dir.items():
+        try:
+            with os.scandir(directory) as it:
+                # normcase：Windows下文件名不区分大小写
+                entries = {os.path.normcase(entry.name): entry for entry in it if entry.is_file()}
+        except OSError:
+            entries = {}
+        for path in dir_paths:
+            entry = entries.get(os.path.normcase(os.path.basename(path)))
+            stats[path] = entry.stat().st_mtime if entry is not None else None
+    return stats
+
+
+def _process_one(file_path: str, idx: int) -> tuple:
+    """
+    批量处理的工作函数：在子进程中处理单个文件
+    
+    每个进程使用自己的提取器单例（提取器对象不可pickle）。
+    返回 (结果字典, 输出行)，输出只由主进程写出。
+    """
+    extractor = _get_extractor()
+    output_file = f"examples/output/batch_report_{idx+1}_{Path(file_path).stem}.xlsx"
+    
+    result = extractor.extract_and_export(
+        data_source=file_path,
+        output_file=output_file,
+        skip_if_fresh=True
+    )
+    
+    summary = {
+        'file': file_path,
+        'success': result['success'],
+        'output': result.get('report_path', 'N/A'),
+        'capex': result.get('total_capex', 0),
+        'opex': result.get('annual_opex', 0),
+        'skipped': result.get('skipped', False),
+        'errors': result.get('errors', [])
+    }
+    
+    if summary['skipped']:
+        log_lines = [f"   SKIP: 报告已是最新: {summary['output']}"]
+    elif summary['success']:
+        log_lines = [f"   OK: 成功处理，生成报告: {summary['output']}"]
+    else:
+        log_lines = [f"   ERROR: 处理失败: {summary['errors']}"]
+    
+    return summary, log_lines
+
+
+@_buffered_output
 def example_5_batch_processing():
     """
-    示例5：批量处理多个文件
+    示例5：批量处理多个文件（多进程并行）
     """
     print("\n" + "="*60)
     print("示例5：批量处理多个文件")
     print("="*60)
     
     try:
-        # 创建提取器
-        extractor = AspenEconomicsExtractor()
-        
         # 要处理的文件列表
         files_to_process = [
             "aspen_files/BFG-CO2H-MEOH V2 (purge burning)Cost/Scenario1/Scenario1.izp",
             "aspen_files/BFG-CO2H-MEOH V2 (purge burning)Cost/Scenario1/Scenario1.szp",
         ]
         
-        results_summary = []
+        # 并行处理前确保输出目录存在，避免子进程竞争创建
+        Path("examples/output").mkdir(parents=True, exist_ok=True)
+        
+        # 摘要行：(文件, 状态, CAPEX, OPEX, 输出)，按输入顺序存放
+        summary_rows = [None] * len(files_to_process)
+        existing_files = []
+        
+        # 处理前一次性获取全部文件状态，避免在处理循环中穿插stat调用
+        file_stats = _prefetch_file_stats(files_to_process)
         
         for i, file_path in enumerate(files_to_process):
-            print(f"\nProcessing: 处理文件 {i+1}/{len(files_to_process)}: {Path(file_path).name}")
-            
-            if os.path.exists(file_path):
-                output_file = f"examples/output/batch_report_{i+1}_{Path(file_path).stem}.xlsx"
-                
-                # 处理文件
-                result = extractor.extract_and_export(
-                    data_source=file_path,
-                    output_file=output_file
-                )
-                
-                results_summary.append({
-                    'file': file_path,
-                    'success': result['success'],
-                    'output': result.get('report_path', 'N/A'),
-                    'capex': result.get('total_capex', 0),
-                    'opex': result.get('annual_opex', 0)
-                })
-                
-                if result['success']:
-                    print(f"   OK: 成功处理，生成报告: {result['report_path']}")
-                else:
-                    print(f"   ERROR: 处理失败: {result['errors']}")
+            # 每个文件只解析一次路径
+            name = Path(file_path).name
+            if file_stats[file_path] is not None:
+                existing_files.append((i, file_path, name))
             else:
                 print(f"   WARNING: 文件不存在: {file_path}")
-                results_summary.append({
-                    'file': file_path,
-                    'success': False,
-                    'output': 'File not found',
-                    'capex': 0,
-                    'opex': 0
-                })
+                summary_rows[i] = (name, 'ERROR', None, None, 'File not found')
+        
+        if existing_files:
+            max_workers = min(len(existing_files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(_process_one, file_path, i): (i, file_path, name)
+                    for i, file_path, name in existing_files
+                }
+                
+                for future in as_completed(futures):
+                    i, file_path, name = futures[future]
+                    print(f"\nProcessing: 完成文件 {i+1}/{len(files_to_process)}: {name}")
+                    
+                    try:
+                        result, log_lines = future.result()
+                    except Exception as e:
+                        result = {
+                            'file': file_path,
+                            'success': False,
+                            'output': 'N/A',
+                            'capex': 0,
+                            'opex': 0,
+                            'errors': [str(e)]
+                        }
+                        log_lines = [f"   ERROR: 处理失败: {result['errors']}"]
+                    if result.get('skipped'):
+                        status, capex, opex = 'SKIP', None, None
+                    elif result['success']:
+                        status, capex, opex = 'OK', result['capex'], result['opex']
+                    else:
+                        status, capex, opex = 'ERROR', None, None
+                    summary_rows[i] = (name, status, capex, opex, result['output'])
+                    print("\n".join(log_lines))
         
         # 输出批量处理结果摘要
         print("\nSUMMARY: 批量处理结果摘要:")
         print("-" * 60)
-        for result in results_summary:
-            status = "OK" if result['success'] else "ERROR"
-            print(f"{status} {Path(result['file']).name}")
-            if result['success']:
-                print(f"   CAPEX: ${result['capex']:,.0f}, OPEX: ${result['opex']:,.0f}")
-            print(f"   输出: {result['output']}")
+        import pandas as pd
+        summary_df = pd.DataFrame(summary_rows, columns=['file', 'status', 'capex', 'opex', 'output'])
+        money = '${:,.0f}'.format
+        print(summary_df.to_string(index=False, na_rep='-', formatters={'capex': money, 'opex': money}))
             
     except Exception as e:
         print(f"ERROR: 示例5执行失败: {str(e)}")
@@ -275,10 +452,21 @@ def create_output_directory():
 
 def main():
     """主函数 - 运行所有示例"""
+    parser = argparse.ArgumentParser(description='Aspen经济数据提取示例')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='输出INFO级别日志')
+    args = parser.parse_args()
+    
+    # 在导入提取器之前配置日志，避免其模块级配置抢先生效
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    
     print("Aspen Economic Data Extraction Examples")
     print("Author: TEA Analysis Framework")
     print("Version: 1.0")
     
+    # 导入提取器（仅运行示例时才付出导入开销）
+    _lazy_import()
+    
     # 创建输出目录
     create_output_directory()
     
@@ -6,9 +6,179 @@ Based on the column mapping patterns found in aspen_data_extractor.py
 """
 
 import os
+import re
+import sys
 import json
 from typing import Dict, List, Any, Optional
 
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Based on the extensive column mapping patterns in aspen_data_extractor.py,
+# here's what columns I-N likely contain:
+LIKELY_COLUMN_MAPPINGS = {
+    'I': {
+        'column_number': 9,
+        'excel_letter': 'I',
+        'likely_content': 'Hot Stream Inlet Temperature',
+        'possible_patterns': [
+            'hot_inlet_temp', 'hot_in', 'shell_in', 'h_in', 
+            'hot_temp_in', 'shell_inlet_temperature', '热进', '壳程进口'
+        ],
+        'data_type': 'numeric (temperature)',
+        'units': 'Celsius or Kelvin',
+        'description': 'Temperature of hot fluid entering the heat exchanger'
+    },
+    'J': {
+        'column_number': 10,
+        'excel_letter': 'J',
+        'likely_content': 'Hot Stream Outlet Temperature',
+        'possible_patterns': [
+            'hot_outlet_temp', 'hot_out', 'shell_out', 'h_out',
+            'hot_temp_out', 'shell_outlet_temperature', '热出', '壳程出口'
+        ],
+        'data_type': 'numeric (temperature)',
+        'units': 'Celsius or Kelvin',
+        'description': 'Temperature of hot fluid leaving the heat exchanger'
+    },
+    'K': {
+        'column_number': 11,
+        'excel_letter': 'K',
+        'likely_content': 'Cold Stream Inlet Temperature',
+        'possible_patterns': [
+            'cold_inlet_temp', 'cold_in', 'tube_in', 'c_in',
+            'cold_temp_in', 'tube_inlet_temperature', '冷进', '管程进口'
+        ],
+        'data_type': 'numeric (temperature)',
+        'units': 'Celsius or Kelvin',
+        'description': 'Temperature of cold fluid entering the heat exchanger'
+    },
+    'L': {
+        'column_number': 12,
+        'excel_letter': 'L',
+        'likely_content': 'Cold Stream Outlet Temperature',
+        'possible_patterns': [
+            'cold_outlet_temp', 'cold_out', 'tube_out', 'c_out',
+            'cold_temp_out', 'tube_outlet_temperature', '冷出', '管程出口'
+        ],
+        'data_type': 'numeric (temperature)',
+        'units': 'Celsius or Kelvin',
+        'description': 'Temperature of cold fluid leaving the heat exchanger'
+    },
+    'M': {
+        'column_number': 13,
+        'excel_letter': 'M',
+        'likely_content': 'Hot Stream Flow Rate',
+        'possible_patterns': [
+            'hot_flow', 'shell_flow', 'hot_mass', 'hot_mass_flow',
+            'hot_flow_rate', 'process_flow', '热流量', '壳程流量'
+        ],
+        'data_type': 'numeric (mass flow)',
+        'units': 'kg/h, kmol/h, or m3/h',
+        'description': 'Mass or volumetric flow rate of hot fluid'
+    },
+    'N': {
+        'column_number': 14,
+        'excel_letter': 'N',
+        'likely_content': 'Cold Stream Flow Rate',
+        'possible_patterns': [
+            'cold_flow', 'tube_flow', 'cold_mass', 'cold_mass_flow',
+            'cold_flow_rate', 'utility_flow', '冷流量', '管程流量'
+        ],
+        'data_type': 'numeric (mass flow)',
+        'units': 'kg/h, kmol/h, or m3/h',
+        'description': 'Mass or volumetric flow rate of cold fluid'
+    }
+}
+
+
+# Per-column block of the I..N report; the mappings are static, so the whole
+# section is rendered once at import and written with a single call
+_TEMPLATE = (
+    "Column {excel_letter} (Position {column_number}):\n"
+    "  Most Likely Content: {likely_content}\n"
+    "  Expected Data Type: {data_type}\n"
+    "  Expected Units: {units}\n"
+    "  Description: {description}\n"
+    "  Possible Column Names:\n"
+    "{pattern_lines}\n"
+)
+_COLUMNS_REPORT = "".join(
+    _TEMPLATE.format(
+        pattern_lines="".join(f"    - {p}\n" for p in info['possible_patterns']),
+        **info,
+    )
+    for info in LIKELY_COLUMN_MAPPINGS.values()
+)
+
+
+# Header pattern -> column letter, matched in a single pass over each header.
+# Built once at import (48 short patterns, so no need to ship a prebuilt automaton)
+# Patterns are stored as canonical UTF-8 text (including the Chinese ones) and only
+# lower-cased here, so headers are compared directly with no re-encoding per call
+_PATTERN_TO_LETTER = {
+    pattern.lower(): letter
+    for letter, info in LIKELY_COLUMN_MAPPINGS.items()
+    for pattern in info['possible_patterns']
+}
+
+try:
+    import ahocorasick
+    _HEADER_AUTOMATON = ahocorasick.Automaton()
+    for _pattern, _letter in _PATTERN_TO_LETTER.items():
+        _HEADER_AUTOMATON.add_word(_pattern, _letter)
+    _HEADER_AUTOMATON.make_automaton()
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    # Fallback: one alternation regex, longest patterns first
+    _HEADER_PATTERN_RE = re.compile('|'.join(
+        re.escape(pattern) for pattern in sorted(_PATTERN_TO_LETTER, key=len, reverse=True)
+    ))
+
+def classify_header(header: Any) -> Optional[str]:
+    """
+    Return the likely column letter (I-N) for a header name, or None
+    Uses the Aho-Corasick automaton when pyahocorasick is installed
+    """
+    text = str(header).lower()
+    if AHOCORASICK_AVAILABLE:
+        for _, letter in _HEADER_AUTOMATON.iter(text):
+            return letter
+        return None
+    match = _HEADER_PATTERN_RE.search(text)
+    return _PATTERN_TO_LETTER[match.group()] if match else None
+
+def read_columns_I_to_N(excel_file: str, sheet_name=0):
+    """
+    Read only columns I through N of a worksheet
+    Uses the Rust-backed python-calamine engine when installed, openpyxl otherwise
+    """
+    try:
+        return pd.read_excel(excel_file, sheet_name=sheet_name, usecols='I:N', engine='calamine')
+    except (ImportError, ValueError):
+        # pandas raises ImportError when python-calamine is missing and
+        # ValueError when it predates the calamine engine (pandas < 2.2)
+        return pd.read_excel(excel_file, sheet_name=sheet_name, usecols='I:N', engine='openpyxl')
+
+def _dump_json(obj: Any, path: str):
+    """Write obj as indented UTF-8 JSON; orjson (C extension) when installed, stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+
 def analyze_excel_with_manual_inspection():
     """
     Manual analysis approach when Python libraries are not available
@@ -19,83 +189,7 @@ def analyze_excel_with_manual_inspection():
     print("=" * 60)
     print()
     
-    # Based on the extensive column mapping patterns in aspen_data_extractor.py,
-    # here's what columns I-N likely contain:
-    
-    likely_column_mappings = {
-        'I': {
-            'column_number': 9,
-            'excel_letter': 'I',
-            'likely_content': 'Hot Stream Inlet Temperature',
-            'possible_patterns': [
-                'hot_inlet_temp', 'hot_in', 'shell_in', 'h_in', 
-                'hot_temp_in', 'shell_inlet_temperature', '热进', '壳程进口'
-            ],
-            'data_type': 'numeric (temperature)',
-            'units': 'Celsius or Kelvin',
-            'description': 'Temperature of hot fluid entering the heat exchanger'
-        },
-        'J': {
-            'column_number': 10,
-            'excel_letter': 'J',
-            'likely_content': 'Hot Stream Outlet Temperature',
-            'possible_patterns': [
-                'hot_outlet_temp', 'hot_out', 'shell_out', 'h_out',
-                'hot_temp_out', 'shell_outlet_temperature', '热出', '壳程出口'
-            ],
-            'data_type': 'numeric (temperature)',
-            'units': 'Celsius or Kelvin',
-            'description': 'Temperature of hot fluid leaving the heat exchanger'
-        },
-        'K': {
-            'column_number': 11,
-            'excel_letter': 'K',
-            'likely_content': 'Cold Stream Inlet Temperature',
-            'possible_patterns': [
-                'cold_inlet_temp', 'cold_in', 'tube_in', 'c_in',
-                'cold_temp_in', 'tube_inlet_temperature', '冷进', '管程进口'
-            ],
-            'data_type': 'numeric (temperature)',
-            'units': 'Celsius or Kelvin',
-            'description': 'Temperature of cold fluid entering the heat exchanger'
-        },
-        'L': {
-            'column_number': 12,
-            'excel_letter': 'L',
-            'likely_content': 'Cold Stream Outlet Temperature',
-            'possible_patterns': [
-                'cold_outlet_temp', 'cold_out', 'tube_out', 'c_out',
-                'cold_temp_out', 'tube_outlet_temperature', '冷出', '管程出口'
-            ],
-            'data_type': 'numeric (temperature)',
-            'units': 'Celsius or Kelvin',
-            'description': 'Temperature of cold fluid leaving the heat exchanger'
-        },
-        'M': {
-            'column_number': 13,
-            'excel_letter': 'M',
-            'likely_content': 'Hot Stream Flow Rate',
-            'possible_patterns': [
-                'hot_flow', 'shell_flow', 'hot_mass', 'hot_mass_flow',
-                'hot_flow_rate', 'process_flow', '热流量', '壳程流量'
-            ],
-            'data_type': 'numeric (mass flow)',
-            'units': 'kg/h, kmol/h, or m3/h',
-            'description': 'Mass or volumetric flow rate of hot fluid'
-        },
-        'N': {
-            'column_number': 14,
-            'excel_letter': 'N',
-            'likely_content': 'Cold Stream Flow Rate',
-            'possible_patterns': [
-                'cold_flow', 'tube_flow', 'cold_mass', 'cold_mass_flow',
-                'cold_flow_rate', 'utility_flow', '冷流量', '管程流量'
-            ],
-            'data_type': 'numeric (mass flow)',
-            'units': 'kg/h, kmol/h, or m3/h',
-            'description': 'Mass or volumetric flow rate of cold fluid'
-        }
-    }
+    likely_column_mappings = LIKELY_COLUMN_MAPPINGS
     
     # Additional possible patterns for these columns based on the codebase
     alternative_mappings = {
@@ -112,18 +206,7 @@ def analyze_excel_with_manual_inspection():
     print("=== COLUMNS I THROUGH N ANALYSIS ===")
     print()
     
-    for letter in ['I', 'J', 'K', 'L', 'M', 'N']:
-        if letter in likely_column_mappings:
-            col_info = likely_column_mappings[letter]
-            print(f"Column {letter} (Position {col_info['column_number']}):")
-            print(f"  Most Likely Content: {col_info['likely_content']}")
-            print(f"  Expected Data Type: {col_info['data_type']}")
-            print(f"  Expected Units: {col_info['units']}")
-            print(f"  Description: {col_info['description']}")
-            print(f"  Possible Column Names:")
-            for pattern in col_info['possible_patterns']:
-                print(f"    - {pattern}")
-            print()
+    sys.stdout.write(_COLUMNS_REPORT)
     
     print("=== ALTERNATIVE POSSIBILITIES ===")
     print()
@@ -173,48 +256,30 @@ def analyze_excel_with_manual_inspection():
     
     code_template = '''
 # Template for extracting columns I-N in aspen_data_extractor.py
-def extract_columns_I_to_N(self, row_data):
-    """Extract data from Excel columns I through N"""
-    
-    extracted_data = {}
-    
-    # Column I (9th column, index 8) - Hot Inlet Temperature
-    if len(row_data) > 8:
-        extracted_data['hot_inlet_temp'] = self._extract_numeric_value(
-            row_data.iloc[8], 'temperature'
-        )
-    
-    # Column J (10th column, index 9) - Hot Outlet Temperature  
-    if len(row_data) > 9:
-        extracted_data['hot_outlet_temp'] = self._extract_numeric_value(
-            row_data.iloc[9], 'temperature'
-        )
-    
-    # Column K (11th column, index 10) - Cold Inlet Temperature
-    if len(row_data) > 10:
-        extracted_data['cold_inlet_temp'] = self._extract_numeric_value(
-            row_data.iloc[10], 'temperature'
-        )
-    
-    # Column L (12th column, index 11) - Cold Outlet Temperature
-    if len(row_data) > 11:
-        extracted_data['cold_outlet_temp'] = self._extract_numeric_value(
-            row_data.iloc[11], 'temperature'
-        )
-    
-    # Column M (13th column, index 12) - Hot Flow Rate
-    if len(row_data) > 12:
-        extracted_data['hot_flow'] = self._extract_numeric_value(
-            row_data.iloc[12], 'flow_rate'
-        )
+# Columns I-N (indices 8-13) in sheet order
+COLUMNS_I_TO_N = [
+    'hot_inlet_temp',    # Column I - Hot Inlet Temperature
+    'hot_outlet_temp',   # Column J - Hot Outlet Temperature
+    'cold_inlet_temp',   # Column K - Cold Inlet Temperature
+    'cold_outlet_temp',  # Column L - Cold Outlet Temperature
+    'hot_flow',          # Column M - Hot Flow Rate
+    'cold_flow',         # Column N - Cold Flow Rate
+]
+
+def extract_columns_I_to_N(self, df, first_col=8):
+    """Extract data from Excel columns I through N for all rows at once"""
     
-    # Column N (14th column, index 13) - Cold Flow Rate
-    if len(row_data) > 13:
-        extracted_data['cold_flow'] = self._extract_numeric_value(
-            row_data.iloc[13], 'flow_rate'
-        )
+    # One contiguous column slice instead of per-row iloc lookups;
+    # sheets narrower than N simply yield fewer columns
+    block = df.iloc[:, first_col:first_col + 6].copy()
+    block.columns = COLUMNS_I_TO_N[:block.shape[1]]
     
-    return extracted_data
+    # Single vectorized numeric conversion; unparsable cells become NaN
+    return block.apply(pd.to_numeric, errors='coerce').to_dict('records')
+
+# For wide sheets, read only the needed columns so openpyxl skips the rest:
+#   df = pd.read_excel(excel_file, sheet_name=sheet, usecols='I:N')
+#   records = self.extract_columns_I_to_N(df, first_col=0)
 '''
     
     print(code_template)
@@ -233,8 +298,7 @@ def extract_columns_I_to_N(self, row_data):
     
     output_file = 'excel_columns_I_N_analysis.json'
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(analysis_results, f, ensure_ascii=False, indent=2)
+        _dump_json(analysis_results, output_file)
         print(f"✅ Analysis results saved to: {output_file}")
     except Exception as e:
         print(f"⚠️ Could not save analysis file: {e}")
@@ -249,6 +313,18 @@ def main():
         print(f"⚠️ Excel file {excel_file} not found in current directory")
         print("Proceeding with analysis based on codebase patterns...")
         print()
+    elif PANDAS_AVAILABLE:
+        try:
+            df = read_columns_I_to_N(excel_file)
+            print(f"Actual headers in columns I-N of {excel_file} ({len(df)} data rows):")
+            for letter, header in zip('IJKLMN', df.columns):
+                expected = classify_header(header)
+                note = f" (matches column {expected} patterns)" if expected else ""
+                print(f"  Column {letter}: {header}{note}")
+            print()
+        except Exception as e:
+            print(f"⚠️ Could not read {excel_file}: {e}")
+            print()
     
     results = analyze_excel_with_manual_inspection()
     
@@ -19,48 +19,326 @@ Version: 1.0
 import os
 import sys
 import argparse
+import copy
 import json
+import pickle
+import functools
+import importlib.util
 import logging
+import math
+import numbers
+import re
+import time
+import zipfile
+from xml.sax.saxutils import escape
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-# 尝试导入yaml，如果失败则提供替代方案
+# xlsxwriter可选，仅用于generate_excel_report的流式引擎
 try:
-    import yaml
-    YAML_AVAILABLE = True
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
 except ImportError:
-    YAML_AVAILABLE = False
-    yaml = None
+    XLSXWRITER_AVAILABLE = False
+
+# orjson可选，用于配置解析和--verbose摘要输出
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # 确保本地模块可以导入
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# 导入自定义模块
+# 导入自定义模块（数据结构很轻量；解析、导出和Aspen模块会带入pandas/numba等，
+# 在首次使用时才导入，见_parsers()和_aspen_modules()）
 try:
     from data_interfaces import EconomicAnalysisResults
-    from economic_file_parser import EconomicFileParser
-    from economic_excel_exporter import EconomicExcelExporter
-    from aspen_data_extractor import AspenDataExtractor, AspenCOMInterface
-    LOCAL_MODULES_AVAILABLE = True
 except ImportError as e:
-    LOCAL_MODULES_AVAILABLE = False
     print(f"ERROR: 错误：无法导入本地模块: {e}")
     print("请确保所有必需的文件都在同一目录中。")
     sys.exit(1)
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('aspen_economics_extraction.log')
-    ]
+# 延迟导入的本地模块是否都存在（只查找模块文件，不执行导入）
+LOCAL_MODULES_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ('economic_file_parser', 'economic_excel_exporter', 'aspen_data_extractor')
 )
+
+# 配置日志（日志文件仅在命令行入口main()中添加）
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _parsers() -> SimpleNamespace:
+    """
+    导入成本文件解析器和Excel导出器（首次调用时导入，之后复用）
+    
+    导入失败时抛出ImportError，由调用方决定如何处理
+    """
+    try:
+        from economic_file_parser import EconomicFileParser
+        from economic_excel_exporter import EconomicExcelExporter
+    except ImportError as e:
+        raise ImportError(f"无法导入本地模块: {e}。请确保所有必需的文件都在同一目录中。") from e
+    return SimpleNamespace(EconomicFileParser=EconomicFileParser,
+                           EconomicExcelExporter=EconomicExcelExporter)
+
+
+@functools.lru_cache(maxsize=1)
+def _aspen_modules() -> SimpleNamespace:
+    """导入Aspen数据提取和COM接口模块，仅COM和仿真文件路径需要"""
+    from aspen_data_extractor import AspenDataExtractor, AspenCOMInterface
+    return SimpleNamespace(AspenDataExtractor=AspenDataExtractor,
+                           AspenCOMInterface=AspenCOMInterface)
+
+
+@functools.lru_cache(maxsize=1)
+def _import_yaml():
+    """仅在读取YAML配置时导入PyYAML，未安装时返回None"""
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return yaml
+
+
+def _is_output_stale(src: str, dst: str) -> bool:
+    """
+    判断输出文件是否需要重新生成
+    
+    Args:
+        src: 源数据文件路径
+        dst: 输出文件路径
+        
+    Returns:
+        True if dst is missing, src is not a file, or src is newer than dst
+    """
+    src_path, dst_path = Path(src), Path(dst)
+    if not src_path.is_file() or not dst_path.exists():
+        return True
+    return dst_path.stat().st_mtime <= src_path.stat().st_mtime
+
+
+def _load_yaml_cached(path: Path) -> Any:
+    """
+    读取YAML配置，解析结果按文件修改时间缓存
+    
+    缓存写入同目录下的 .<文件名>.cache.pkl，文件修改后自动失效；
+    未命中时优先使用libyaml的CSafeLoader解析。
+    
+    Args:
+        path: YAML文件路径
+        
+    Returns:
+        解析后的配置数据
+    """
+    mtime = path.stat().st_mtime_ns
+    cache_file = path.with_name(f".{path.name}.cache.pkl")
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('mtime') == mtime:
+            logger.debug(f"Using cached configuration: {cache_file}")
+            return cached['data']
+    except Exception:
+        pass  # 缓存不存在或已损坏，重新解析
+    
+    yaml = _import_yaml()
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    data = yaml.load(path.read_text(encoding='utf-8'), Loader=loader)
+    
+    try:
+        with open(cache_file, 'wb') as f:
+            pickle.dump({'mtime': mtime, 'data': data}, f)
+    except OSError as e:
+        logger.debug(f"Could not write config cache {cache_file}: {e}")
+    
+    return data
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为JSON字符串；安装orjson时使用orjson，否则使用标准库json"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def _json_load_file(path: str) -> Any:
+    """读取JSON文件；安装orjson时使用orjson，否则使用标准库json"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(path: str, mtime_ns: int) -> tuple:
+    """
+    解析YAML/JSON配置文件，结果按 (路径, 修改时间) 在进程内缓存
+    
+    返回不可变的 (键, 值) 元组；调用方需自行复制后再修改。
+    """
+    if path.endswith(('.yaml', '.yml')):
+        data = _load_yaml_cached(Path(path))
+    else:
+        data = _json_load_file(path)
+    return tuple(data.items())
+
+
+# 数据源扩展名 -> 提取方式
+_DISPATCH = {
+    '.izp': 'cost', '.szp': 'cost',
+    '.apw': 'sim', '.ads': 'sim', '.bkp': 'sim',
+    '.xlsx': 'hex',
+}
+
+
+def _source_kind(data_source: str, use_com: bool = False) -> Optional[str]:
+    """判断数据源类型：'com'、'cost'、'sim'、'hex'，无法识别时返回None"""
+    if data_source == 'aspen_com' or use_com:
+        return 'com'
+    if data_source == 'hex_data':
+        return 'hex'
+    return _DISPATCH.get(os.path.splitext(data_source)[1].lower())
+
+
+# 直接写出xlsx所需的最小OPC部件
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '{sheets}</Types>'
+)
+_XLSX_SHEET_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument"/></Relationships>'
+)
+_XLSX_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+# XML 1.0不允许的控制字符，与openpyxl.cell.cell.ILLEGAL_CHARACTERS_RE规则相同
+_ILLEGAL_XML_CHARS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def _xml_text(text: str, entities: Optional[Dict[str, str]] = None) -> str:
+    """去除XML非法控制字符后转义，用于单元格文本和工作表名"""
+    return escape(_ILLEGAL_XML_CHARS_RE.sub('', text), entities or {})
+
+
+def _column_letter(index: int) -> str:
+    """0起始的列序号转换为Excel列字母"""
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _emit_xlsx_direct(path: str, sheets: List[tuple]) -> str:
+    """
+    不经过openpyxl，直接把固定结构的表格写成xlsx压缩包
+    
+    仅写出值（无样式、公式和列宽），字符串进入共享字符串表，有限数值按数字单元格写出，
+    NaN/inf和布尔值按文本写出；文本中XML不允许的控制字符会被去除。
+    需要样式时使用EconomicExcelExporter。
+    
+    Args:
+        path: 输出文件路径
+        sheets: [(工作表名, 行列表), ...]，每行为str/int/float/None组成的列表
+        
+    Returns:
+        输出文件路径
+    """
+    shared_index: Dict[str, int] = {}
+    shared_strings: List[str] = []
+    sheet_parts = []
+    
+    for rows in (rows for _, rows in sheets):
+        row_parts = []
+        for r, row in enumerate(rows, start=1):
+            cells = []
+            for c, value in enumerate(row):
+                if value is None:
+                    continue
+                ref = f"{_column_letter(c)}{r}"
+                if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+                    cells.append(f'<c r="{ref}"><v>{int(value)}</v></c>')
+                elif (isinstance(value, numbers.Real) and not isinstance(value, bool)
+                      and math.isfinite(value)):
+                    cells.append(f'<c r="{ref}"><v>{float(value)!r}</v></c>')
+                else:
+                    text = str(value)
+                    idx = shared_index.get(text)
+                    if idx is None:
+                        idx = shared_index[text] = len(shared_strings)
+                        shared_strings.append(text)
+                    cells.append(f'<c r="{ref}" t="s"><v>{idx}</v></c>')
+            row_parts.append(f'<row r="{r}">{"".join(cells)}</row>')
+        sheet_parts.append(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<sheetData>{"".join(row_parts)}</sheetData></worksheet>'
+        )
+    
+    workbook_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        f'xmlns:r="{_XLSX_REL_NS}"><sheets>'
+        + ''.join(f'<sheet name="{_xml_text(name, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+                  for n, (name, _) in enumerate(sheets, start=1))
+        + '</sheets></workbook>'
+    )
+    workbook_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        + ''.join(f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" '
+                  f'Type="{_XLSX_REL_NS}/worksheet"/>' for n in range(1, len(sheets) + 1))
+        + f'<Relationship Id="rId{len(sheets) + 1}" Target="sharedStrings.xml" '
+          f'Type="{_XLSX_REL_NS}/sharedStrings"/></Relationships>'
+    )
+    shared_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        f'count="{len(shared_strings)}" uniqueCount="{len(shared_strings)}">'
+        + ''.join(f'<si><t xml:space="preserve">{_xml_text(text)}</t></si>' for text in shared_strings)
+        + '</sst>'
+    )
+    
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES.format(
+            sheets=''.join(_XLSX_SHEET_TYPE.format(n=n) for n in range(1, len(sheets) + 1))))
+        zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        zf.writestr('xl/workbook.xml', workbook_xml)
+        zf.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+        zf.writestr('xl/sharedStrings.xml', shared_xml)
+        for n, part in enumerate(sheet_parts, start=1):
+            zf.writestr(f'xl/worksheets/sheet{n}.xml', part)
+    
+    return path
+
+
 class AspenEconomicsExtractor:
     """
     Aspen经济数据提取器主类
@@ -75,19 +353,53 @@ class AspenEconomicsExtractor:
         Args:
             config_file: 配置文件路径（可选）
         """
+        # 单次提取内的文件存在性缓存，网络路径上stat代价较高
+        self._stat_cache: Dict[str, bool] = {}
         self.config = self._load_config(config_file)
-        self.economic_parser = EconomicFileParser()
-        self.excel_exporter = EconomicExcelExporter()
+        modules = _parsers()
+        self.economic_parser = modules.EconomicFileParser()
+        self.excel_exporter = modules.EconomicExcelExporter()
         self.aspen_extractor = None
         self.com_interface = None
+        self._fixed_analyzer_cls = None
+        # 在with块中使用时保持COM连接，供多次extract_from_aspen_com复用
+        self._keep_com = False
+        self._com_target = None
         
         logger.info("[INIT] Aspen Economics Extractor initialized")
     
+    def _exists(self, path: str) -> bool:
+        """os.path.exists，结果在本次提取期间缓存"""
+        exists = self._stat_cache.get(path)
+        if exists is None:
+            exists = os.path.exists(path)
+            self._stat_cache[path] = exists
+        return exists
+    
+    def __enter__(self):
+        """进入with块：COM连接在块内各次调用间保持，退出时断开"""
+        self._keep_com = True
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._keep_com = False
+        self.close()
+    
+    def close(self):
+        """断开保持的Aspen Plus COM连接"""
+        if self.com_interface is not None:
+            self.com_interface.disconnect()
+            self.com_interface = None
+            self._com_target = None
+    
     def extract_from_aspen_com(self, aspen_file: str = None, 
                               project_name: str = None) -> EconomicAnalysisResults:
         """
         从Aspen Plus COM接口提取经济数据
         
+        在 ``with AspenEconomicsExtractor() as extractor:`` 块中调用时，对同一目标的
+        连续调用复用已建立的COM连接，块结束时才断开。
+        
         Args:
             aspen_file: Aspen Plus文件路径（可选）
             project_name: 项目名称（可选）
@@ -98,31 +410,36 @@ class AspenEconomicsExtractor:
         logger.info("[PROCESSING] Extracting economic data from Aspen Plus COM interface...")
         
         try:
-            # 初始化COM接口
-            self.com_interface = AspenCOMInterface()
-            
-            # 连接到Aspen Plus
-            if aspen_file:
-                success = self.com_interface.connect(aspen_file)
-            else:
-                success = self.com_interface.connect_to_active()
-            
-            if not success:
-                raise Exception("无法连接到Aspen Plus")
+            reuse = (self.com_interface is not None and self.com_interface.connected
+                     and self._com_target == aspen_file)
+            if not reuse:
+                # 初始化COM接口（连接目标变化时先断开旧连接）
+                self.close()
+                self.com_interface = _aspen_modules().AspenCOMInterface()
+                
+                # 连接到Aspen Plus
+                if aspen_file:
+                    success = self.com_interface.connect(aspen_file)
+                else:
+                    success = self.com_interface.connect_to_active()
+                
+                if not success:
+                    raise Exception("无法连接到Aspen Plus")
+                self._com_target = aspen_file
             
             # 提取经济数据
             results = self.com_interface.extract_economic_data(project_name)
             
-            # 断开连接
-            self.com_interface.disconnect()
+            # 不在with块中时每次调用后断开连接
+            if not self._keep_com:
+                self.close()
             
             logger.info("[SUCCESS] Successfully extracted economic data from Aspen Plus")
             return results
             
         except Exception as e:
             logger.error(f"Error extracting from Aspen COM: {str(e)}")
-            if self.com_interface:
-                self.com_interface.disconnect()
+            self.close()
             raise
     
     def extract_from_cost_files(self, cost_file_path: str) -> EconomicAnalysisResults:
@@ -162,12 +479,13 @@ class AspenEconomicsExtractor:
         
         try:
             # 使用AspenDataExtractor提取过程数据
-            self.aspen_extractor = AspenDataExtractor()
+            self.aspen_extractor = _aspen_modules().AspenDataExtractor()
             process_data = self.aspen_extractor.extract_complete_data(aspen_file)
             
-            # 如果有热交换器文件，也要加载
-            if hex_file and os.path.exists(hex_file):
-                hex_data = self.aspen_extractor.extract_and_store_all_data(aspen_file, hex_file)
+            # 如果有热交换器文件，也要加载并存入数据库（复用已提取的过程数据，不再重新读取Aspen文件）
+            if hex_file and self._exists(hex_file):
+                self.aspen_extractor.extract_and_store_all_data(aspen_file, hex_file,
+                                                                process_data=process_data)
             
             # 转换为经济分析格式
             results = self._convert_process_to_economic_data(process_data)
@@ -180,13 +498,19 @@ class AspenEconomicsExtractor:
             raise
     
     def generate_excel_report(self, results: EconomicAnalysisResults, 
-                            output_file: str) -> str:
+                            output_file: str, engine: str = 'openpyxl') -> str:
         """
         生成Excel经济分析报告
         
         Args:
             results: 经济分析结果
             output_file: 输出Excel文件路径
+            engine: 'openpyxl'（默认）生成带样式和图表的完整报告，整个工作簿驻留内存；
+                'openpyxl_streaming' 以openpyxl只写模式导出概览、CAPEX、OPEX和设备四张表
+                （完整报告的其余四张表、图表和合并单元格均不生成）；
+                'xlsxwriter_streaming' 以xlsxwriter的constant_memory模式逐行写出成本明细，
+                内存占用与行数无关，适合批量生成。该模式不回写已写行，因此不使用公式，
+                合计在Python中预先算好。需要安装xlsxwriter
             
         Returns:
             生成的Excel文件路径
@@ -194,7 +518,15 @@ class AspenEconomicsExtractor:
         logger.info(f"[PROCESSING] Generating Excel report: {output_file}")
         
         try:
-            output_path = self.excel_exporter.export_economic_analysis(results, output_file)
+            if engine == 'xlsxwriter_streaming':
+                output_path = self._write_cost_items_xlsxwriter(results, output_file)
+            elif engine == 'openpyxl_streaming':
+                output_path = self.excel_exporter.export_economic_analysis(
+                    results, output_file, streaming=True)
+            elif engine == 'openpyxl':
+                output_path = self.excel_exporter.export_economic_analysis(results, output_file)
+            else:
+                raise ValueError(f"未知的Excel引擎: {engine}")
             logger.info(f"[SUCCESS] Excel report generated successfully: {output_path}")
             return output_path
             
@@ -203,19 +535,22 @@ class AspenEconomicsExtractor:
             raise
     
     def extract_and_export(self, data_source: str, output_file: str, 
-                          **kwargs) -> Dict[str, Any]:
+                          skip_if_fresh: bool = False, **kwargs) -> Dict[str, Any]:
         """
         提取经济数据并生成Excel报告（一体化流程）
         
         Args:
             data_source: 数据源路径或类型
             output_file: 输出Excel文件路径
+            skip_if_fresh: 输出文件比源文件新时跳过提取和导出
             **kwargs: 其他参数
             
         Returns:
             操作结果字典
         """
+        # 墙钟时间只用于可读的时间戳，耗时用单调时钟测量
         start_time = datetime.now()
+        t0 = time.perf_counter()
         result_summary = {
             'success': False,
             'data_source': data_source,
@@ -225,50 +560,62 @@ class AspenEconomicsExtractor:
             'warnings': []
         }
         
+        # 文件可能在两次提取之间变化，存在性缓存只在本次提取内有效
+        self._stat_cache.clear()
+        
+        if skip_if_fresh:
+            sources = [data_source] + ([kwargs['hex_file']] if kwargs.get('hex_file') else [])
+            if not any(_is_output_stale(src, output_file) for src in sources):
+                logger.info(f"[SKIP] Report is newer than source, skipping: {output_file}")
+                result_summary.update({
+                    'success': True,
+                    'skipped': True,
+                    'report_path': output_file
+                })
+                return result_summary
+        
         try:
             logger.info(f"[START] Starting economic analysis for: {data_source}")
             
             # 确定数据源类型并提取数据
-            results = None
-            
-            if data_source == 'aspen_com' or kwargs.get('use_com', False):
+            kind = _source_kind(data_source, kwargs.get('use_com', False))
+            handlers = {
                 # 从Aspen COM接口提取
-                results = self.extract_from_aspen_com(
+                'com': lambda: self.extract_from_aspen_com(
                     aspen_file=kwargs.get('aspen_file'),
                     project_name=kwargs.get('project_name', 'Aspen_Analysis')
-                )
-                
-            elif data_source.endswith(('.izp', '.szp')):
+                ),
                 # 从成本文件提取
-                results = self.extract_from_cost_files(data_source)
-                
-            elif data_source.endswith(('.apw', '.ads', '.bkp')):
+                'cost': lambda: self.extract_from_cost_files(data_source),
                 # 从Aspen仿真文件提取
-                results = self.extract_from_aspen_simulation(
-                    data_source, 
+                'sim': lambda: self.extract_from_aspen_simulation(
+                    data_source,
                     hex_file=kwargs.get('hex_file')
-                )
-                
-            elif data_source == 'hex_data' or data_source.endswith('.xlsx'):
+                ),
                 # 从热交换器Excel数据提取（修复的方法）
-                hex_kwargs = {k: v for k, v in kwargs.items() if k != 'hex_file'}
-                results = self._extract_from_hex_data_enhanced(hex_file=data_source, **hex_kwargs)
-                
-            else:
+                'hex': lambda: self._extract_from_hex_data_enhanced(
+                    hex_file=data_source,
+                    output_file=output_file,
+                    **{k: v for k, v in kwargs.items() if k != 'hex_file'}
+                ),
+            }
+            if kind is None:
                 raise ValueError(f"不支持的数据源类型: {data_source}")
+            results = handlers[kind]()
             
             if results is None:
                 raise Exception("未能提取到经济数据")
             
-            # 生成Excel报告
-            report_path = self.generate_excel_report(results, output_file)
+            # 生成Excel报告（数据源已直接写出报告时跳过）
+            if results.report_path:
+                report_path = results.report_path
+            else:
+                report_path = self.generate_excel_report(results, output_file)
             
             # 更新结果
-            end_time = datetime.now()
             result_summary.update({
                 'success': True,
-                'end_time': end_time.isoformat(),
-                'duration_seconds': (end_time - start_time).total_seconds(),
+                'duration_seconds': time.perf_counter() - t0,
                 'report_path': report_path,
                 'total_capex': results.total_capex,
                 'annual_opex': results.annual_opex,
@@ -277,6 +624,8 @@ class AspenEconomicsExtractor:
                 'equipment_count': len(results.equipment_list),
                 'data_sources_count': len(results.data_sources)
             })
+            if logger.isEnabledFor(logging.DEBUG):
+                result_summary['end_time'] = datetime.now().isoformat()
             
             logger.info("[COMPLETE] Economic analysis completed successfully!")
             
@@ -287,6 +636,148 @@ class AspenEconomicsExtractor:
             
         return result_summary
     
+    def export_cost_items_write_only(self, data_source: str, output_file: str) -> Dict[str, Any]:
+        """
+        提取成本文件数据并以openpyxl只写模式导出成本明细
+        
+        与extract_and_export不同，不生成带样式和图表的完整报告，只写出一张成本明细表
+        和合计行。成本文件仍先完整解析为EconomicAnalysisResults，再逐行写出；
+        节省的是工作簿在内存中的占用，而不是解析阶段。
+        
+        Args:
+            data_source: IZP或SZP文件路径
+            output_file: 输出Excel文件路径
+            
+        Returns:
+            操作结果字典
+        """
+        from openpyxl import Workbook
+        
+        # 墙钟时间只用于可读的时间戳，耗时用单调时钟测量
+        start_time = datetime.now()
+        t0 = time.perf_counter()
+        result_summary = {
+            'success': False,
+            'data_source': data_source,
+            'output_file': output_file,
+            'start_time': start_time.isoformat(),
+            'errors': [],
+            'warnings': []
+        }
+        
+        try:
+            if _source_kind(data_source) != 'cost':
+                raise ValueError(f"只写导出仅支持IZP/SZP成本文件: {data_source}")
+            
+            logger.info(f"[START] Exporting cost items (write-only) from: {data_source}")
+            results = self.extract_from_cost_files(data_source)
+            
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet('Cost Items')
+            for row in self._cost_item_rows(results):
+                ws.append(row)
+            item_count = sum(1 for _ in self._iter_cost_items(results))
+            
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            wb.save(output_file)
+            
+            result_summary.update({
+                'success': True,
+                'duration_seconds': time.perf_counter() - t0,
+                'report_path': output_file,
+                'total_capex': results.total_capex,
+                'annual_opex': results.annual_opex,
+                'item_count': item_count
+            })
+            if logger.isEnabledFor(logging.DEBUG):
+                result_summary['end_time'] = datetime.now().isoformat()
+            logger.info(f"[COMPLETE] Wrote {item_count} cost items to: {output_file}")
+            
+        except Exception as e:
+            error_msg = str(e)
+            result_summary['errors'].append(error_msg)
+            logger.error(f"[ERROR] Write-only export failed: {error_msg}")
+        
+        return result_summary
+    
+    def _write_cost_items_xlsxwriter(self, results: EconomicAnalysisResults,
+                                     output_file: str) -> str:
+        """以xlsxwriter constant_memory模式写出成本明细和预先算好的合计"""
+        if not XLSXWRITER_AVAILABLE:
+            raise ImportError("xlsxwriter_streaming引擎需要安装xlsxwriter: pip install xlsxwriter")
+        
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        wb = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+        try:
+            ws = wb.add_worksheet('Cost Items')
+            # constant_memory只能按行顺序写入，行已按顺序产出
+            for row_idx, row in enumerate(self._cost_item_rows(results)):
+                ws.write_row(row_idx, 0, row)
+        finally:
+            wb.close()
+        
+        return output_file
+    
+    def _cost_item_rows(self, results: EconomicAnalysisResults):
+        """
+        按顺序产出成本明细表的各行：表头、明细行、空行和CAPEX/OPEX合计行
+        
+        openpyxl只写模式和xlsxwriter引擎共用；合计在产出明细时累加，不使用公式。
+        """
+        yield ['Section', 'Group', 'Item', 'Category', 'Base Cost', 'Installed Cost', 'Currency']
+        
+        totals = {'CAPEX': 0.0, 'OPEX': 0.0}
+        # 行内容直接写成固定列的列表字面量：这本身就是按表结构特化的写法，
+        # exec生成的逐表emitter实测没有更快，operator.attrgetter反而更慢
+        for section, group, item in self._iter_cost_items(results):
+            yield [section, group, item.name, item.category.value, item.base_cost,
+                   item.installed_cost, item.currency.value]
+            totals[section] += item.base_cost
+        
+        yield []
+        for section, total in totals.items():
+            yield [section, 'Sum of listed items', None, None, total]
+    
+    def _results_to_sheets(self, results: EconomicAnalysisResults) -> List[tuple]:
+        """把经济分析结果整理为_emit_xlsx_direct使用的固定结构表格"""
+        summary = [
+            ['Metric', 'Value'],
+            ['Project Name', results.project_name],
+            ['Analysis Date', results.timestamp.strftime("%Y-%m-%d %H:%M")],
+            ['Total CAPEX', results.total_capex],
+            ['Annual OPEX', results.annual_opex],
+            ['NPV', results.npv],
+            ['IRR', results.irr],
+            ['Payback Period (years)', results.payback_period],
+        ]
+        capex = [['Group', 'Item', 'Category', 'Base Cost', 'Installed Cost']]
+        opex = [['Group', 'Item', 'Category', 'Annual Cost']]
+        for section, group, item in self._iter_cost_items(results):
+            if section == 'CAPEX':
+                capex.append([group, item.name, item.category.value, item.base_cost,
+                              item.calculate_installed_cost()])
+            else:
+                opex.append([group, item.name, item.category.value,
+                             item.calculate_installed_cost()])
+        return [('Summary', summary), ('CAPEX', capex), ('OPEX', opex)]
+    
+    def _iter_cost_items(self, results: EconomicAnalysisResults):
+        """按报告顺序逐个产出 (部分, 分组, CostItem)"""
+        capex = results.capex_data
+        for group, items in (('Equipment', capex.equipment_costs),
+                             ('Installation', capex.installation_costs),
+                             ('Indirect', capex.indirect_costs)):
+            for item in items.values():
+                yield 'CAPEX', group, item
+        
+        opex = results.opex_data
+        for group, items in (('Raw Materials', opex.raw_material_costs),
+                             ('Utilities', opex.utility_costs),
+                             ('Labor', opex.labor_costs),
+                             ('Maintenance', opex.maintenance_costs)):
+            for item in items.values():
+                yield 'OPEX', group, item
+    
     def _load_config(self, config_file: str = None) -> Dict[str, Any]:
         """
         加载配置文件
@@ -314,17 +805,19 @@ class AspenEconomicsExtractor:
             }
         }
         
-        if config_file and os.path.exists(config_file):
+        if not config_file:
+            return default_config
+        
+        if self._exists(config_file):
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    if config_file.endswith('.yaml') or config_file.endswith('.yml'):
-                        if not YAML_AVAILABLE:
-                            logger.error("PyYAML module not found. Please install with: pip install PyYAML")
-                            logger.info("Using default configuration instead.")
-                            return default_config
-                        user_config = yaml.safe_load(f)
-                    else:
-                        user_config = json.load(f)
+                if config_file.endswith(('.yaml', '.yml')) and _import_yaml() is None:
+                    logger.error("PyYAML module not found. Please install with: pip install PyYAML")
+                    logger.info("Using default configuration instead.")
+                    return default_config
+                
+                # 缓存中的嵌套字典不能被调用方修改，复制后再合并
+                user_config = copy.deepcopy(dict(
+                    _load_config_cached(config_file, os.stat(config_file).st_mtime_ns)))
                 
                 # 合并配置
                 default_config.update(user_config)
@@ -378,6 +871,8 @@ class AspenEconomicsExtractor:
         opex_data = OpexData(project_name=process_data.simulation_name)
         
         # 基于流股数量和质量流量估算原料成本
+        # 开销在逐个读取对象属性上：先用np.fromiter转成数组再求和在各规模下都更慢，
+        # 且成对求和会改变结果的末位，因此保留顺序累加
         total_mass_flow = sum(stream.mass_flow for stream in process_data.streams.values())
         estimated_raw_material_cost = total_mass_flow * 0.5 * 8760  # $0.5/kg * annual hours
         
@@ -413,14 +908,18 @@ class AspenEconomicsExtractor:
         从热交换器数据提取增强的经济分析
         使用修复的算法，包含完整的安装成本、人力成本等
         直接生成最终输出文件，跳过后续的Excel生成步骤
+        direct_xlsx=True时不经过openpyxl，只写出摘要和CAPEX/OPEX数值表；
+        streaming=True时以openpyxl只写模式导出报告（仅概览、CAPEX、OPEX和设备四张表，无图表）
         """
-        from fix_economic_analysis import FixedEconomicAnalyzer
+        if self._fixed_analyzer_cls is None:
+            from fix_economic_analysis import FixedEconomicAnalyzer
+            self._fixed_analyzer_cls = FixedEconomicAnalyzer
         
         logger.info(f"[ENHANCED] Using enhanced heat exchanger data extraction from: {hex_file}")
         
         try:
             # 使用修复的分析器
-            analyzer = FixedEconomicAnalyzer()
+            analyzer = self._fixed_analyzer_cls()
             
             # 如果指定了具体的Excel文件，更新hex_file路径
             if hex_file != 'hex_data' and hex_file.endswith('.xlsx'):
@@ -428,19 +927,25 @@ class AspenEconomicsExtractor:
                 
             # 直接生成最终输出文件
             output_file = kwargs.get('output_file', 'BFG_Economic_Analysis.xlsx')
-            analyzer.generate_complete_economic_analysis(output_file)
+            full_results = analyzer.build_economic_results()
+            if kwargs.get('direct_xlsx', False):
+                # 报告结构固定且只需数值时跳过openpyxl，直接写出xlsx
+                _emit_xlsx_direct(output_file, self._results_to_sheets(full_results))
+            else:
+                analyzer.generate_complete_economic_analysis(
+                    output_file, streaming=kwargs.get('streaming', False), results=full_results)
+            capex, opex, npv = full_results.total_capex, full_results.annual_opex, full_results.npv
             
-            # 创建一个带有正确数据的EconomicAnalysisResults对象用于返回
+            # 返回分析器计算的指标；report_path表示报告已写出，无需再次导出
             results = EconomicAnalysisResults(
-                project_name=kwargs.get('project_name', 'BFG-CO2H-MEOH Process'),
+                project_name=kwargs.get('project_name') or 'BFG-CO2H-MEOH Process',
                 timestamp=datetime.now(),
-                analysis_version="1.0-Enhanced"
+                analysis_version="1.0-Enhanced",
+                report_path=output_file
             )
-            
-            # 模拟从分析器获取的数据 (实际情况下应该从analyzer中获取)
-            results.total_capex = 1495314  # 从日志中获得的值
-            results.annual_opex = 13344062  # 从日志中获得的值
-            results.npv = 24065928  # 从日志中获得的值
+            results.total_capex = capex
+            results.annual_opex = opex
+            results.npv = npv
             
             logger.info("[SUCCESS] Enhanced heat exchanger data extraction completed")
             logger.info(f"[ENHANCED] Direct output generated: {output_file}")
@@ -449,8 +954,8 @@ class AspenEconomicsExtractor:
             
         except Exception as e:
             logger.error(f"Enhanced extraction failed: {e}")
-            # 如果增强提取失败，回退到标准方法
-            return self.extract_from_aspen_simulation(hex_file, **kwargs)
+            # 如果增强提取失败，回退到标准方法（output_file/direct_xlsx等导出参数只适用于增强路径，不再转发）
+            return self.extract_from_aspen_simulation(hex_file)
     
     def get_extraction_summary(self) -> Dict[str, Any]:
         """
@@ -508,11 +1013,20 @@ def main():
                        help='配置文件路径（YAML或JSON）')
     parser.add_argument('--use-com', action='store_true',
                        help='强制使用COM接口')
+    parser.add_argument('--skip-if-fresh', action='store_true',
+                       help='输出文件比源文件新时跳过重新生成')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='详细输出')
     
     args = parser.parse_args()
     
+    # 日志文件按大小轮转；delay=True时首次写日志才创建文件
+    from logging.handlers import RotatingFileHandler
+    file_handler = RotatingFileHandler('aspen_economics_extraction.log', maxBytes=5_000_000,
+                                       backupCount=3, encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logging.getLogger().addHandler(file_handler)
+    
     # 设置日志级别
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -533,11 +1047,14 @@ def main():
         result = extractor.extract_and_export(
             data_source=args.source,
             output_file=args.output,
+            skip_if_fresh=args.skip_if_fresh,
             **extract_kwargs
         )
         
         # 输出结果
-        if result['success']:
+        if result.get('skipped'):
+            print(f"\n[SKIP] 报告已是最新，未重新生成: {result['report_path']}")
+        elif result['success']:
             print("\n[SUCCESS] 经济分析完成！")
             print(f"[REPORT] 报告文件: {result['report_path']}")
             print(f"[CAPEX] 总CAPEX: ${result.get('total_capex', 0):,.0f}")
@@ -554,7 +1071,7 @@ def main():
         if args.verbose:
             summary = extractor.get_extraction_summary()
             print(f"\n[SUMMARY] 提取摘要:")
-            print(json.dumps(summary, indent=2, ensure_ascii=False))
+            print(_json_dumps(summary, indent=True))
         
     except Exception as e:
         logger.error(f"程序执行失败: {str(e)}")
@@ -6,8 +6,19 @@
 
 import sqlite3
 import json
+from pathlib import Path
 from datetime import datetime
 
+DB_PATH = 'aspen_data.db'
+
+def open_report_connection(db_path: str = DB_PATH):
+    """以只读URI打开数据库：不创建日志文件，写入进程运行时也可并发读取"""
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
 def generate_final_report():
     """生成最终状态报告"""
     
@@ -16,46 +27,53 @@ def generate_final_report():
     print(f"报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
+    conn = None
     try:
-        conn = sqlite3.connect('aspen_data.db')
+        # 报告只读；查询用到的索引由fix_database_schema.py创建
+        conn = open_report_connection()
         cursor = conn.cursor()
         
-        # 1. 核心数据统计
-        print("📊 核心数据统计:")
-        print("-" * 40)
-        
-        # 流股数据
-        cursor.execute("SELECT COUNT(*) FROM aspen_streams")
-        stream_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(DISTINCT stream_category) FROM aspen_streams WHERE stream_category IS NOT NULL")
-        category_count = cursor.fetchone()[0]
-        
-        print(f"🌊 流股数据: {stream_count} 个流股, {category_count} 种分类")
-        
-        # 设备数据
-        cursor.execute("SELECT COUNT(*) FROM aspen_equipment")
-        equipment_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(DISTINCT equipment_type) FROM aspen_equipment WHERE equipment_type != 'Unknown'")
-        equipment_type_count = cursor.fetchone()[0]
-        
-        print(f"⚙️ 设备数据: {equipment_count} 个设备, {equipment_type_count} 种类型")
-        
-        # HEX数据
-        cursor.execute("SELECT COUNT(*), SUM(duty_kw), SUM(area_m2) FROM heat_exchangers")
-        hex_count, total_duty, total_area = cursor.fetchone()
-        
-        print(f"🔥 换热器数据: {hex_count} 个换热器")
-        print(f"   • 总热负荷: {total_duty:,.1f} kW")
-        print(f"   • 总面积: {total_area:,.1f} m²")
-        
-        # 映射数据
-        cursor.execute("SELECT COUNT(*) FROM stream_mappings")
-        mapping_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM improved_stream_mappings")
-        improved_mapping_count = cursor.fetchone()[0]
+        with conn:
+            # 标量统计合并为批量查询（映射表单独查询，缺失时仍先输出核心统计）
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM aspen_streams),
+                    (SELECT COUNT(DISTINCT stream_category) FROM aspen_streams WHERE stream_category IS NOT NULL),
+                    (SELECT COUNT(*) FROM aspen_streams WHERE stream_category IS NOT NULL),
+                    (SELECT COUNT(*) FROM aspen_equipment),
+                    (SELECT COUNT(DISTINCT equipment_type) FROM aspen_equipment WHERE equipment_type != 'Unknown'),
+                    (SELECT COUNT(*) FROM aspen_equipment WHERE equipment_type != 'Unknown' AND aspen_type != 'Unknown'),
+                    (SELECT COUNT(*) FROM heat_exchangers),
+                    (SELECT SUM(duty_kw) FROM heat_exchangers),
+                    (SELECT SUM(area_m2) FROM heat_exchangers),
+                    (SELECT COUNT(*) FROM heat_exchangers WHERE duty_kw > 0 AND area_m2 > 0)
+            """)
+            (stream_count, category_count, classified_streams,
+             equipment_count, equipment_type_count, typed_equipment,
+             hex_count, total_duty, total_area, complete_hex) = cursor.fetchone()
+            
+            # 1. 核心数据统计
+            print("📊 核心数据统计:")
+            print("-" * 40)
+            
+            # 流股数据
+            print(f"🌊 流股数据: {stream_count} 个流股, {category_count} 种分类")
+            
+            # 设备数据
+            print(f"⚙️ 设备数据: {equipment_count} 个设备, {equipment_type_count} 种类型")
+            
+            # HEX数据
+            print(f"🔥 换热器数据: {hex_count} 个换热器")
+            print(f"   • 总热负荷: {total_duty:,.1f} kW")
+            print(f"   • 总面积: {total_area:,.1f} m²")
+            
+            # 映射数据
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM stream_mappings),
+                    (SELECT COUNT(*) FROM improved_stream_mappings)
+            """)
+            mapping_count, improved_mapping_count = cursor.fetchone()
         
         print(f"🔗 映射数据: {mapping_count} 个基础映射, {improved_mapping_count} 个改进映射")
         
@@ -66,22 +84,16 @@ def generate_final_report():
         print("-" * 40)
         
         # 检查流股分类覆盖率
-        cursor.execute("SELECT COUNT(*) FROM aspen_streams WHERE stream_category IS NOT NULL")
-        classified_streams = cursor.fetchone()[0]
         classification_rate = (classified_streams / stream_count) * 100 if stream_count > 0 else 0
         
         print(f"🌊 流股分类覆盖率: {classification_rate:.1f}% ({classified_streams}/{stream_count})")
         
         # 检查设备类型识别率
-        cursor.execute("SELECT COUNT(*) FROM aspen_equipment WHERE equipment_type != 'Unknown' AND aspen_type != 'Unknown'")
-        typed_equipment = cursor.fetchone()[0]
         typing_rate = (typed_equipment / equipment_count) * 100 if equipment_count > 0 else 0
         
         print(f"⚙️ 设备类型识别率: {typing_rate:.1f}% ({typed_equipment}/{equipment_count})")
         
         # 检查HEX数据完整性
-        cursor.execute("SELECT COUNT(*) FROM heat_exchangers WHERE duty_kw > 0 AND area_m2 > 0")
-        complete_hex = cursor.fetchone()[0]
         hex_completeness = (complete_hex / hex_count) * 100 if hex_count > 0 else 0
         
         print(f"🔥 HEX数据完整性: {hex_completeness:.1f}% ({complete_hex}/{hex_count})")
@@ -121,7 +133,7 @@ def generate_final_report():
             ORDER BY COUNT(*) DESC
         """)
         
-        for category, count in cursor.fetchall():
+        for category, count in cursor:
             print(f"   • {category}: {count} 个")
         
         print()
@@ -136,7 +148,7 @@ def generate_final_report():
             ORDER BY COUNT(*) DESC
         """)
         
-        for eq_type, count in cursor.fetchall():
+        for eq_type, count in cursor:
             print(f"   • {eq_type}: {count} 个")
         
         print()
@@ -177,10 +189,11 @@ def generate_final_report():
         for suggestion in suggestions:
             print(f"   {suggestion}")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ 报告生成失败: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
     
     print()
     print("🎯 系统状态: 完全可操作")
@@ -13,9 +13,74 @@ Version: 1.0 - Database Schema Fix
 import sqlite3
 import os
 import json
+import logging
 from datetime import datetime
 from typing import Dict, List, Any
 
+logger = logging.getLogger(__name__)
+
+# 写入PRAGMA user_version的表结构版本：2 = heat_exchangers包含全部I-N列字段
+HEX_SCHEMA_VERSION = 2
+
+# heat_exchangers的I-N列字段 (字段名, 类型)
+HEX_I_TO_N_COLUMNS = [
+    ('column_i_data', 'REAL'),
+    ('column_i_header', 'TEXT'),
+    ('column_j_data', 'REAL'),
+    ('column_j_header', 'TEXT'),
+    ('column_k_data', 'REAL'),
+    ('column_k_header', 'TEXT'),
+    ('column_l_data', 'REAL'),
+    ('column_l_header', 'TEXT'),
+    ('column_m_data', 'REAL'),
+    ('column_m_header', 'TEXT'),
+    ('column_n_data', 'REAL'),
+    ('column_n_header', 'TEXT'),
+    ('columns_i_to_n_raw', 'TEXT'),
+]
+
+# 完整的heat_exchangers表结构；新建表和补充缺失字段都以此为准
+HEX_COLUMNS = [
+    ('id', 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    ('session_id', 'TEXT NOT NULL'),
+    ('name', 'TEXT NOT NULL'),
+    ('duty_kw', 'REAL DEFAULT 0.0'),
+    ('area_m2', 'REAL DEFAULT 0.0'),
+    ('temperatures', 'TEXT'),
+    ('pressures', 'TEXT'),
+    ('source', "TEXT DEFAULT 'unknown'"),
+    ('extraction_time', 'TEXT'),
+    ('hot_stream_name', 'TEXT'),
+    ('hot_stream_inlet_temp', 'REAL'),
+    ('hot_stream_outlet_temp', 'REAL'),
+    ('hot_stream_flow_rate', 'REAL'),
+    ('hot_stream_composition', 'TEXT'),
+    ('cold_stream_name', 'TEXT'),
+    ('cold_stream_inlet_temp', 'REAL'),
+    ('cold_stream_outlet_temp', 'REAL'),
+    ('cold_stream_flow_rate', 'REAL'),
+    ('cold_stream_composition', 'TEXT'),
+] + HEX_I_TO_N_COLUMNS
+
+HEX_FOREIGN_KEY = "FOREIGN KEY (session_id) REFERENCES extraction_sessions (session_id)"
+
+# 状态报告(final_status_report.py)查询使用的部分索引（extraction_time已有idx_session_time，无需重复）
+REPORT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_streams_cat ON aspen_streams(stream_category) "
+    "WHERE stream_category IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS idx_equip_type ON aspen_equipment(equipment_type, aspen_type) "
+    "WHERE equipment_type != 'Unknown'",
+    "CREATE INDEX IF NOT EXISTS idx_hex_complete ON heat_exchangers(duty_kw, area_m2) "
+    "WHERE duty_kw > 0 AND area_m2 > 0",
+]
+
+
+def build_hex_create_sql(table_name: str = 'heat_exchangers') -> str:
+    """根据HEX_COLUMNS生成CREATE TABLE语句"""
+    column_defs = ",\n    ".join(f"{name} {col_type}" for name, col_type in HEX_COLUMNS)
+    return (f"CREATE TABLE IF NOT EXISTS {table_name} (\n    {column_defs},\n"
+            f"    {HEX_FOREIGN_KEY}\n)")
+
 class DatabaseSchemaFixer:
     """
     数据库表结构修复器
@@ -39,11 +104,13 @@ class DatabaseSchemaFixer:
             'database_exists': False,
             'table_exists': False,
             'backup_created': False,
+            'backup_path': None,
             'columns_added': [],
             'existing_records': 0,
             'error': None
         }
         
+        conn = None
         try:
             # 1. 检查数据库是否存在
             if not os.path.exists(self.db_path):
@@ -57,6 +124,19 @@ class DatabaseSchemaFixer:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
+            # 已修复过的数据库只需读取user_version即可返回
+            if cursor.execute("PRAGMA user_version").fetchone()[0] == HEX_SCHEMA_VERSION:
+                result['table_exists'] = True
+                result['success'] = True
+                print(f"✅ 表结构已是最新版本 (user_version={HEX_SCHEMA_VERSION})，无需修复")
+                return result
+            
+            # 修复期间使用WAL日志，备份和DDL按事务而不是按语句同步到磁盘
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-65536")
+            
             # 3. 检查heat_exchangers表是否存在
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='heat_exchangers'")
             if not cursor.fetchone():
@@ -72,127 +152,153 @@ class DatabaseSchemaFixer:
             result['existing_records'] = cursor.fetchone()[0]
             print(f"📊 现有记录数: {result['existing_records']}")
             
-            # 5. 创建备份
-            if result['existing_records'] > 0:
-                backup_time = datetime.now().strftime('%Y%m%d_%H%M%S')
-                backup_table = f"heat_exchangers_backup_{backup_time}"
-                cursor.execute(f"""
-                    CREATE TABLE {backup_table} AS 
-                    SELECT * FROM heat_exchangers
-                """)
-                result['backup_created'] = True
-                print(f"✅ 数据备份创建: {backup_table}")
-            
-            # 6. 获取当前表结构
+            # 5. 获取当前表结构
             cursor.execute("PRAGMA table_info(heat_exchangers)")
             existing_columns = [col[1] for col in cursor.fetchall()]
             print(f"📋 现有字段数: {len(existing_columns)}")
             
-            # 7. 定义需要的I-N列字段
-            required_i_to_n_columns = [
-                ('column_i_data', 'REAL'),
-                ('column_i_header', 'TEXT'),
-                ('column_j_data', 'REAL'), 
-                ('column_j_header', 'TEXT'),
-                ('column_k_data', 'REAL'),
-                ('column_k_header', 'TEXT'),
-                ('column_l_data', 'REAL'),
-                ('column_l_header', 'TEXT'),
-                ('column_m_data', 'REAL'),
-                ('column_m_header', 'TEXT'),
-                ('column_n_data', 'REAL'),
-                ('column_n_header', 'TEXT'),
-                ('columns_i_to_n_raw', 'TEXT')
-            ]
-            
-            # 8. 添加缺失的列
+            # 6. 需要的I-N列字段
+            required_i_to_n_columns = HEX_I_TO_N_COLUMNS
+            missing_columns = [(name, col_type) for name, col_type in required_i_to_n_columns
+                               if name not in existing_columns]
+            
+            # 7. 备份并添加缺失的列（字段齐全时不做任何修改）
             print(f"\n🔧 添加缺失的I-N列字段:")
-            columns_added = 0
+            present = [col_name for col_name, _ in required_i_to_n_columns if col_name in existing_columns]
+            if present:
+                print(f"   ⚪ 字段已存在 ({len(present)}): {', '.join(present)}")
             
-            for col_name, col_type in required_i_to_n_columns:
-                if col_name not in existing_columns:
-                    try:
-                        cursor.execute(f"ALTER TABLE heat_exchangers ADD COLUMN {col_name} {col_type}")
-                        result['columns_added'].append(col_name)
-                        columns_added += 1
-                        print(f"   ✅ 添加字段: {col_name} ({col_type})")
-                    except Exception as e:
-                        print(f"   ❌ 添加字段失败 {col_name}: {e}")
-                else:
-                    print(f"   ⚪ 字段已存在: {col_name}")
-            
-            # 9. 提交更改
-            conn.commit()
+            if missing_columns:
+                self._add_missing_columns(conn, missing_columns, result)
+            columns_added = len(result['columns_added'])
             
-            # 10. 验证表结构
-            cursor.execute("PRAGMA table_info(heat_exchangers)")
-            final_columns = [col[1] for col in cursor.fetchall()]
-            final_i_to_n_count = sum(1 for col in final_columns if col.startswith('column_') and ('_data' in col or '_header' in col or 'i_to_n_raw' in col))
+            # 8. 验证表结构（加列在事务内完成，失败会抛出异常，无需再次读取表结构）
+            final_columns = set(existing_columns).union(result['columns_added'])
+            final_i_to_n_count = sum(1 for col_name, _ in required_i_to_n_columns if col_name in final_columns)
             
             print(f"\n📊 表结构修复结果:")
             print(f"   总字段数: {len(existing_columns)} -> {len(final_columns)}")
             print(f"   新增字段: {columns_added}")
             print(f"   I-N相关字段: {final_i_to_n_count}")
             
-            if columns_added > 0 or final_i_to_n_count >= 13:
+            if columns_added > 0 or final_i_to_n_count >= len(required_i_to_n_columns):
                 result['success'] = True
                 print(f"✅ 表结构修复成功!")
             else:
                 print(f"⚠️ 表结构可能仍有问题")
             
-            conn.close()
+            if final_i_to_n_count == len(required_i_to_n_columns):
+                # 记录版本，后续运行直接跳过
+                cursor.execute(f"PRAGMA user_version = {HEX_SCHEMA_VERSION}")
+                conn.commit()
             
         except Exception as e:
             print(f"❌ 表结构修复失败: {e}")
             result['error'] = str(e)
-            import traceback
-            traceback.print_exc()
+            # 完整堆栈只在DEBUG级别下格式化输出
+            logger.debug("heat_exchangers schema fix failed", exc_info=True)
+        finally:
+            if conn is not None:
+                conn.close()
         
         return result
     
+    def _add_missing_columns(self, conn, missing_columns: List[tuple], result: Dict[str, Any]):
+        """
+        在单个BEGIN IMMEDIATE事务内备份heat_exchangers并添加缺失字段
+        
+        ADD COLUMN只修改表定义、不重写已有行；不采用整表重建，
+        因为现有表可能含有完整表结构之外的字段。
+        备份写入数据库旁的独立文件，不会让主数据库随每次修复增大。
+        """
+        cursor = conn.cursor()
+        backup_path = None
+        if result['existing_records'] > 0:
+            backup_time = datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_path = os.path.join(os.path.dirname(os.path.abspath(self.db_path)),
+                                       f"heat_exchangers_backup_{backup_time}.db")
+            # ATTACH不能在事务内执行
+            cursor.execute("ATTACH DATABASE ? AS backup", (backup_path,))
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if backup_path:
+                cursor.execute("""
+                    CREATE TABLE backup.heat_exchangers AS 
+                    SELECT * FROM main.heat_exchangers
+                """)
+                result['backup_created'] = True
+                result['backup_path'] = backup_path
+                print(f"✅ 数据备份创建: {backup_path}")
+            
+            failed = []
+            for col_name, col_type in missing_columns:
+                try:
+                    cursor.execute(f"ALTER TABLE heat_exchangers ADD COLUMN {col_name} {col_type}")
+                    result['columns_added'].append(col_name)
+                except sqlite3.OperationalError as e:
+                    failed.append(f"{col_name} ({e})")
+            
+            conn.commit()
+            
+            if result['columns_added']:
+                print(f"   ✅ 添加字段 ({len(result['columns_added'])}): {', '.join(result['columns_added'])}")
+            if failed:
+                print(f"   ❌ 添加字段失败 ({len(failed)}): {'; '.join(failed)}")
+        except Exception:
+            conn.rollback()
+            result['backup_created'] = False
+            result['backup_path'] = None
+            result['columns_added'] = []
+            if backup_path:
+                cursor.execute("DETACH DATABASE backup")
+                os.remove(backup_path)
+            raise
+        
+        if backup_path:
+            cursor.execute("DETACH DATABASE backup")
+    
+    def ensure_report_indexes(self) -> int:
+        """
+        创建状态报告查询所需的索引（幂等），并切换到WAL模式使报告读取与写入互不阻塞
+        
+        状态报告以只读方式打开数据库，索引和日志模式只在这里修改。
+        
+        Returns:
+            已存在或新建的索引数量
+        """
+        if not os.path.exists(self.db_path):
+            return 0
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.OperationalError:
+                pass  # 被锁定的数据库保持原有日志模式
+            
+            created = 0
+            with conn:
+                for statement in REPORT_INDEXES:
+                    try:
+                        conn.execute(statement)
+                        created += 1
+                    except sqlite3.OperationalError:
+                        pass  # 表不存在时跳过，报告查询仍可全表扫描
+        finally:
+            conn.close()
+        
+        print(f"📇 状态报告索引: {created}/{len(REPORT_INDEXES)}")
+        return created
+    
     def _create_complete_heat_exchangers_table(self, cursor):
         """
         创建完整的heat_exchangers表结构（包含I-N列）
         """
         print("🏗️ 创建完整的heat_exchangers表结构")
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS heat_exchangers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT NOT NULL,
-                name TEXT NOT NULL,
-                duty_kw REAL DEFAULT 0.0,
-                area_m2 REAL DEFAULT 0.0,
-                temperatures TEXT,
-                pressures TEXT,
-                source TEXT DEFAULT 'unknown',
-                extraction_time TEXT,
-                hot_stream_name TEXT,
-                hot_stream_inlet_temp REAL,
-                hot_stream_outlet_temp REAL,
-                hot_stream_flow_rate REAL,
-                hot_stream_composition TEXT,
-                cold_stream_name TEXT,
-                cold_stream_inlet_temp REAL,
-                cold_stream_outlet_temp REAL,
-                cold_stream_flow_rate REAL,
-                cold_stream_composition TEXT,
-                column_i_data REAL,
-                column_i_header TEXT,
-                column_j_data REAL,
-                column_j_header TEXT,
-                column_k_data REAL,
-                column_k_header TEXT,
-                column_l_data REAL,
-                column_l_header TEXT,
-                column_m_data REAL,
-                column_m_header TEXT,
-                column_n_data REAL,
-                column_n_header TEXT,
-                columns_i_to_n_raw TEXT,
-                FOREIGN KEY (session_id) REFERENCES extraction_sessions (session_id)
-            )
-        """)
+        cursor.execute(build_hex_create_sql())
         
         print("✅ 完整表结构创建成功")
 
@@ -205,6 +311,8 @@ def main():
     
     fixer = DatabaseSchemaFixer()
     result = fixer.fix_heat_exchangers_schema()
+    if result['success']:
+        result['report_indexes'] = fixer.ensure_report_indexes()
     
     # 保存修复报告
     report_file = f"schema_fix_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -10,6 +10,8 @@ Version: 1.0
 
 import os
 import sys
+import functools
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
@@ -23,11 +25,67 @@ from data_interfaces import (
 )
 from economic_excel_exporter import EconomicExcelExporter
 
+# Rust实现的Excel读取引擎 (engine='calamine' 需要 pandas >= 2.2，旧版本会抛出ValueError)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _largest_sheet_name(path: str) -> Optional[str]:
+    """
+    按工作表的维度信息选出单元格最多的sheet（只读模式，不解析单元格）
+    
+    非xlsx文件或缺少维度信息时返回None
+    """
+    from openpyxl import load_workbook
+    try:
+        wb = load_workbook(path, read_only=True, data_only=True)
+    except Exception:
+        return None
+    try:
+        sizes = {}
+        for ws in wb.worksheets:
+            if ws.max_row is None or ws.max_column is None:
+                return None
+            sizes[ws.title] = ws.max_row * ws.max_column
+    finally:
+        wb.close()
+    return max(sizes, key=sizes.get) if sizes else None
+
+
+@functools.lru_cache(maxsize=8)
+def _read_hex_sheet(path: str, mtime_ns: int) -> Optional[tuple]:
+    """
+    读取热交换器数据所在的sheet，结果按 (路径, 修改时间) 在进程内缓存
+    
+    优先解析维度最大的sheet，避免选中排在前面的说明页；该sheet没有数据时
+    按顺序检查其余sheet。返回 (sheet名, DataFrame)，没有数据时返回None；
+    调用方需复制后再修改。
+    """
+    largest = _largest_sheet_name(path)
+    
+    # 工作簿只打开一次，各sheet通过同一个ExcelFile解析（安装calamine时优先使用）
+    engine = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+    with pd.ExcelFile(path, engine=engine) as excel_file:
+        logger.info(f"Available sheets: {excel_file.sheet_names}")
+        
+        sheet_names = excel_file.sheet_names
+        if largest in sheet_names:
+            sheet_names = [largest] + [name for name in sheet_names if name != largest]
+        
+        for sheet_name in sheet_names:
+            df = excel_file.parse(sheet_name)
+            if not df.empty and len(df) > 1:
+                return sheet_name, df
+    return None
+
+
 class FixedEconomicAnalyzer:
     """修复的经济分析器，基于可用数据生成完整的经济报告"""
     
@@ -38,16 +96,12 @@ class FixedEconomicAnalyzer:
     def load_heat_exchanger_data(self) -> pd.DataFrame:
         """加载热交换器数据"""
         try:
-            # 尝试读取Excel文件的所有sheet
-            excel_file = pd.ExcelFile(self.hex_file)
-            logger.info(f"Available sheets: {excel_file.sheet_names}")
-            
-            # 读取第一个包含数据的sheet
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(self.hex_file, sheet_name=sheet_name)
-                if not df.empty and len(df) > 1:
-                    logger.info(f"Using sheet '{sheet_name}' with {len(df)} rows")
-                    return df
+            # 读取包含数据的sheet（同一文件未修改时复用已解析的结果）
+            found = _read_hex_sheet(self.hex_file, os.stat(self.hex_file).st_mtime_ns)
+            if found is not None:
+                sheet_name, df = found
+                logger.info(f"Using sheet '{sheet_name}' with {len(df)} rows")
+                return df.copy()
                     
             # 如果没有找到数据，创建示例数据
             logger.warning("No data found in Excel file, creating sample data")
@@ -71,27 +125,33 @@ class FixedEconomicAnalyzer:
         
     def estimate_equipment_costs(self, hex_data: pd.DataFrame) -> Dict[str, float]:
         """基于热交换器数据估算设备成本"""
-        equipment_costs = {}
+        n = len(hex_data)
         
-        for _, row in hex_data.iterrows():
-            equipment_id = row.get('Equipment_ID', f'HEX-{len(equipment_costs)+1}')
-            
-            # 基于换热面积估算成本 (参考工程经验)
-            area = row.get('Area_m2', 100.0)
-            if pd.isna(area):
-                area = 100.0
-                
-            # 成本估算公式: Cost = 15000 + 800 * Area^0.7 (USD)
-            base_cost = 15000 + 800 * (area ** 0.7)
+        # 基于换热面积估算成本 (参考工程经验)，缺失面积按100 m2计
+        if 'Area_m2' in hex_data:
+            area = hex_data['Area_m2'].fillna(100.0).to_numpy(dtype=np.float64)
+        else:
+            area = np.full(n, 100.0)
             
-            # 根据热交换器类型调整成本
-            hex_type = str(row.get('Type', 'Shell & Tube')).lower()
-            if 'plate' in hex_type:
-                base_cost *= 1.2  # 板式换热器更贵
-            elif 'air' in hex_type:
-                base_cost *= 0.8  # 空冷器相对便宜
-                
-            equipment_costs[equipment_id] = base_cost
+        # 成本估算公式: Cost = 15000 + 800 * Area^0.7 (USD)
+        base_cost = 15000 + 800 * np.power(area, 0.7)
+        
+        # 根据热交换器类型调整成本：板式换热器更贵，空冷器相对便宜
+        if 'Type' in hex_data:
+            # 只对不同的类型名做子串判断，再按编码查表；末尾的1.0供缺失值(编码-1)使用
+            codes, type_names = pd.factorize(hex_data['Type'].astype(str).str.lower())
+            multiplier = np.array([1.2 if 'plate' in name else 0.8 if 'air' in name else 1.0
+                                   for name in type_names] + [1.0])
+            base_cost = base_cost * multiplier[codes]
+        
+        default_ids = [f'HEX-{i+1}' for i in range(n)]
+        if 'Equipment_ID' in hex_data:
+            ids = [default_id if pd.isna(equipment_id) else equipment_id
+                   for equipment_id, default_id in zip(hex_data['Equipment_ID'].tolist(), default_ids)]
+        else:
+            ids = default_ids
+        
+        equipment_costs = dict(zip(ids, base_cost.tolist()))
             
         logger.info(f"Estimated costs for {len(equipment_costs)} heat exchangers")
         return equipment_costs
@@ -128,11 +188,7 @@ class FixedEconomicAnalyzer:
         utility_costs = {}
         
         # 计算总热负荷
-        total_heat_duty = 0
-        for _, row in hex_data.iterrows():
-            duty = row.get('Heat_Duty_MW', 0)
-            if pd.notna(duty):
-                total_heat_duty += duty
+        total_heat_duty = float(hex_data['Heat_Duty_MW'].sum()) if 'Heat_Duty_MW' in hex_data else 0
                 
         if total_heat_duty == 0:
             total_heat_duty = 20.0  # 默认20MW
@@ -153,148 +209,172 @@ class FixedEconomicAnalyzer:
         logger.info(f"Calculated utility costs based on {total_heat_duty:.1f} MW heat duty")
         return utility_costs
         
-    def generate_complete_economic_analysis(self, output_file: str = "BFG_Economic_Analysis.xlsx") -> str:
-        """生成完整的经济分析报告"""
-        logger.info("[START] Generating complete economic analysis")
+    def build_economic_results(self) -> EconomicAnalysisResults:
+        """根据热交换器数据构建完整的经济分析结果（不写文件）"""
+        # 1. 加载热交换器数据
+        hex_data = self.load_heat_exchanger_data()
         
-        try:
-            # 1. 加载热交换器数据
-            hex_data = self.load_heat_exchanger_data()
-            
-            # 2. 创建经济分析结果对象
-            results = EconomicAnalysisResults(
-                project_name="BFG-CO2H-MEOH Process",
-                timestamp=datetime.now(),
-                analysis_version="1.0"
+        # 2. 创建经济分析结果对象
+        results = EconomicAnalysisResults(
+            project_name="BFG-CO2H-MEOH Process",
+            timestamp=datetime.now(),
+            analysis_version="1.0"
+        )
+        
+        # 3. 估算设备成本
+        equipment_costs = self.estimate_equipment_costs(hex_data)
+        installation_costs = self.calculate_installation_costs(equipment_costs)
+        
+        # 4. 创建CAPEX数据
+        capex_data = CapexData(project_name=results.project_name)
+        
+        # 添加设备成本
+        capex_data.add_cost_items(
+            CostItem(
+                name=equipment_id,
+                category=CostCategory.EQUIPMENT,
+                base_cost=cost,
+                currency=CurrencyType.USD,
+                installation_factor=1.5,  # 50% installation cost
+                estimation_method="Heat exchanger sizing correlation"
             )
+            for equipment_id, cost in equipment_costs.items()
+        )
             
-            # 3. 估算设备成本
-            equipment_costs = self.estimate_equipment_costs(hex_data)
-            installation_costs = self.calculate_installation_costs(equipment_costs)
-            
-            # 4. 创建CAPEX数据
-            capex_data = CapexData(project_name=results.project_name)
-            
-            # 添加设备成本
-            for equipment_id, cost in equipment_costs.items():
-                cost_item = CostItem(
-                    name=equipment_id,
-                    category=CostCategory.EQUIPMENT,
-                    base_cost=cost,
-                    currency=CurrencyType.USD,
-                    installation_factor=1.5,  # 50% installation cost
-                    estimation_method="Heat exchanger sizing correlation"
-                )
-                capex_data.add_cost_item(cost_item)
-                
-            # 添加安装成本
-            for install_id, cost in installation_costs.items():
-                install_item = CostItem(
-                    name=install_id,
-                    category=CostCategory.INSTALLATION,
-                    base_cost=cost,
-                    currency=CurrencyType.USD,
-                    estimation_method="Installation factor method"
-                )
-                capex_data.add_cost_item(install_item)
-                
-            # 添加其他CAPEX项目
-            other_capex = {
-                "Piping": sum(equipment_costs.values()) * 0.3,
-                "Instrumentation": sum(equipment_costs.values()) * 0.15,
-                "Electrical": sum(equipment_costs.values()) * 0.1,
-                "Civil_Works": sum(equipment_costs.values()) * 0.2,
-                "Engineering": sum(equipment_costs.values()) * 0.1
-            }
-            
-            for name, cost in other_capex.items():
-                other_item = CostItem(
-                    name=name,
-                    category=CostCategory.INSTALLATION,
-                    base_cost=cost,
-                    currency=CurrencyType.USD,
-                    estimation_method="Percentage of equipment cost"
-                )
-                capex_data.add_cost_item(other_item)
-                
-            results.capex_data = capex_data
-            results.total_capex = capex_data.calculate_total_capex()
-            
-            # 5. 创建OPEX数据
-            opex_data = OpexData(project_name=results.project_name)
-            
-            # 计算各类运营成本
-            labor_costs = self.calculate_labor_costs(results.total_capex)
-            utility_costs = self.calculate_utility_costs(hex_data)
-            
-            # 添加人力成本
-            for labor_type, cost in labor_costs.items():
-                labor_item = CostItem(
-                    name=labor_type,
-                    category=CostCategory.LABOR,
-                    base_cost=cost,
-                    currency=CurrencyType.USD,
-                    estimation_method="CAPEX percentage method"
-                )
-                opex_data.add_opex_item(labor_item)
-                
-            # 添加公用设施成本
-            for utility_type, cost in utility_costs.items():
-                utility_item = CostItem(
-                    name=utility_type,
-                    category=CostCategory.UTILITIES,
-                    base_cost=cost,
-                    currency=CurrencyType.USD,
-                    estimation_method="Heat duty correlation"
-                )
-                opex_data.add_opex_item(utility_item)
-                
-            # 添加其他OPEX项目
-            maintenance_cost = results.total_capex * 0.04  # 4% of CAPEX annually
-            raw_materials_cost = sum(utility_costs.values()) * 1.5  # 假设原料成本
-            
-            opex_data.add_opex_item(CostItem(
-                name="Maintenance",
-                category=CostCategory.MAINTENANCE,
-                base_cost=maintenance_cost,
+        # 添加安装成本
+        capex_data.add_cost_items(
+            CostItem(
+                name=install_id,
+                category=CostCategory.INSTALLATION,
+                base_cost=cost,
                 currency=CurrencyType.USD,
-                estimation_method="CAPEX percentage (4%)"
-            ))
+                estimation_method="Installation factor method"
+            )
+            for install_id, cost in installation_costs.items()
+        )
             
-            opex_data.add_opex_item(CostItem(
-                name="Raw_Materials",
-                category=CostCategory.RAW_MATERIALS,
-                base_cost=raw_materials_cost,
+        # 添加其他CAPEX项目（按设备总成本的百分比）
+        equipment_total = sum(equipment_costs.values())
+        other_capex = {
+            "Piping": equipment_total * 0.3,
+            "Instrumentation": equipment_total * 0.15,
+            "Electrical": equipment_total * 0.1,
+            "Civil_Works": equipment_total * 0.2,
+            "Engineering": equipment_total * 0.1
+        }
+        
+        capex_data.add_cost_items(
+            CostItem(
+                name=name,
+                category=CostCategory.INSTALLATION,
+                base_cost=cost,
                 currency=CurrencyType.USD,
-                estimation_method="Utility cost correlation"
-            ))
+                estimation_method="Percentage of equipment cost"
+            )
+            for name, cost in other_capex.items()
+        )
             
-            results.opex_data = opex_data
-            results.annual_opex = opex_data.calculate_annual_opex(results.total_capex)
+        results.capex_data = capex_data
+        results.total_capex = capex_data.calculate_total_capex()
+        
+        # 5. 创建OPEX数据
+        opex_data = OpexData(project_name=results.project_name)
+        
+        # 计算各类运营成本
+        labor_costs = self.calculate_labor_costs(results.total_capex)
+        utility_costs = self.calculate_utility_costs(hex_data)
+        
+        # 添加人力成本
+        opex_data.add_opex_items(
+            CostItem(
+                name=labor_type,
+                category=CostCategory.LABOR,
+                base_cost=cost,
+                currency=CurrencyType.USD,
+                estimation_method="CAPEX percentage method"
+            )
+            for labor_type, cost in labor_costs.items()
+        )
             
-            # 6. 创建财务参数
-            financial_params = FinancialParameters(
-                project_name=results.project_name,
-                project_life=20,
-                discount_rate=0.1,
-                tax_rate=0.25,
-                annual_revenue=results.annual_opex * 1.3  # 假设30%利润率
+        # 添加公用设施成本
+        opex_data.add_opex_items(
+            CostItem(
+                name=utility_type,
+                category=CostCategory.UTILITIES,
+                base_cost=cost,
+                currency=CurrencyType.USD,
+                estimation_method="Heat duty correlation"
             )
-            results.financial_params = financial_params
+            for utility_type, cost in utility_costs.items()
+        )
             
-            # 7. 计算经济指标
-            results.npv = financial_params.calculate_npv(results.total_capex, results.annual_opex)
-            results.irr = 0.12  # 简化IRR估算
-            results.payback_period = results.total_capex / (financial_params.annual_revenue - results.annual_opex)
+        # 添加其他OPEX项目
+        maintenance_cost = results.total_capex * 0.04  # 4% of CAPEX annually
+        raw_materials_cost = sum(utility_costs.values()) * 1.5  # 假设原料成本
+        
+        opex_data.add_opex_item(CostItem(
+            name="Maintenance",
+            category=CostCategory.MAINTENANCE,
+            base_cost=maintenance_cost,
+            currency=CurrencyType.USD,
+            estimation_method="CAPEX percentage (4%)"
+        ))
+        
+        opex_data.add_opex_item(CostItem(
+            name="Raw_Materials",
+            category=CostCategory.RAW_MATERIALS,
+            base_cost=raw_materials_cost,
+            currency=CurrencyType.USD,
+            estimation_method="Utility cost correlation"
+        ))
+        
+        results.opex_data = opex_data
+        results.annual_opex = opex_data.calculate_annual_opex(results.total_capex)
+        
+        # 6. 创建财务参数
+        financial_params = FinancialParameters(
+            project_name=results.project_name,
+            project_life=20,
+            discount_rate=0.1,
+            tax_rate=0.25,
+            annual_revenue=results.annual_opex * 1.3  # 假设30%利润率
+        )
+        results.financial_params = financial_params
+        
+        # 7. 计算经济指标
+        results.npv = financial_params.calculate_npv(results.total_capex, results.annual_opex)
+        results.irr = 0.12  # 简化IRR估算
+        results.payback_period = results.total_capex / (financial_params.annual_revenue - results.annual_opex)
+        
+        return results
+    
+    def generate_complete_economic_analysis(self, output_file: str = "BFG_Economic_Analysis.xlsx",
+                                            streaming: bool = False,
+                                            results: Optional[EconomicAnalysisResults] = None) -> str:
+        """
+        生成完整的经济分析报告，返回报告路径
+        
+        streaming=True时以openpyxl只写模式导出（内存占用与成本项目数无关），只包含
+        Executive Summary、CAPEX Breakdown、OPEX Analysis和Equipment Details四张表，
+        不含财务分析、敏感性分析、计算参数、假设说明表和图表；
+        需要经济指标的调用方可先调用build_economic_results()，再通过results传入，避免重复计算
+        """
+        logger.info("[START] Generating complete economic analysis")
+        
+        try:
+            # 读取、计算和导出依次依赖上一步的结果，没有可并行的独立工作，保持顺序执行
+            if results is None:
+                results = self.build_economic_results()
             
             # 8. 生成Excel报告
-            output_path = self.excel_exporter.export_economic_analysis(results, output_file)
+            output_path = self.excel_exporter.export_economic_analysis(results, output_file,
+                                                                       streaming=streaming)
             
             logger.info(f"[SUCCESS] Complete economic analysis generated: {output_path}")
             logger.info(f"[CAPEX] Total CAPEX: ${results.total_capex:,.0f}")
             logger.info(f"[OPEX] Annual OPEX: ${results.annual_opex:,.0f}")
             logger.info(f"[NPV] NPV: ${results.npv:,.0f}")
-            logger.info(f"[Equipment] Equipment count: {len(equipment_costs)}")
+            logger.info(f"[Equipment] Equipment count: {len(results.capex_data.equipment_costs)}")
             
             return output_path
             
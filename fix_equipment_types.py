@@ -45,40 +45,48 @@ def update_equipment_types():
     if not conn:
         return
     
+    # 与其他修复脚本一致使用WAL日志，批量更新期间不阻塞读取
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     cursor = conn.cursor()
     
     print("🔄 修复设备类型信息...")
     print("=" * 50)
     
-    updated_count = 0
+    # 先一次查询出库中存在的设备，再用单个事务批量更新
+    names = list(equipment_mapping)
+    placeholders = ",".join("?" * len(names))
+    cursor.execute(f"SELECT DISTINCT name FROM aspen_equipment WHERE name IN ({placeholders})", names)
+    found = {row[0] for row in cursor}
     
-    for equipment_name, info in equipment_mapping.items():
-        try:
-            # 更新设备类型和功能
-            cursor.execute("""
+    params = [
+        (info['module_type'], info['category'], info['function'], equipment_name)
+        for equipment_name, info in equipment_mapping.items()
+        if equipment_name in found
+    ]
+    
+    try:
+        with conn:
+            cursor.executemany("""
                 UPDATE aspen_equipment 
                 SET 
                     aspen_type = ?,
                     equipment_type = ?,
                     function = ?
                 WHERE name = ?
-            """, (
-                info['module_type'],
-                info['category'], 
-                info['function'],
-                equipment_name
-            ))
-            
-            if cursor.rowcount > 0:
-                print(f"✅ {equipment_name}: {info['module_type']} -> {info['category']} ({info['function']})")
-                updated_count += 1
-            else:
-                print(f"⚠️  未找到设备: {equipment_name}")
-                
-        except Exception as e:
-            print(f"❌ 更新 {equipment_name} 时出错: {e}")
+            """, params)
+    except Exception as e:
+        print(f"❌ 批量更新设备类型时出错: {e}")
+        found = set()
     
-    conn.commit()
+    # 每个设备的新类型在下方验证结果中逐行列出，这里只输出汇总
+    updated = [name for name in equipment_mapping if name in found]
+    missing = [name for name in equipment_mapping if name not in found]
+    updated_count = len(updated)
+    if updated:
+        print(f"✅ 已更新 {updated_count} 个设备: {', '.join(updated)}")
+    if missing:
+        print(f"⚠️  未找到设备 ({len(missing)}): {', '.join(missing)}")
     
     print("=" * 50)
     print(f"📊 更新统计:")
@@ -5,11 +5,36 @@
 
 import os
 import sys
+import logging
 import sqlite3
 import pandas as pd
 import json
 from datetime import datetime
 
+# extract_hex_data_from_excel用到的列；其余列不解析
+HEX_EXCEL_COLUMNS = [
+    'Heat Exchanger Name', 'Load Kj/h', 'Area m2',
+    'Hot T in ( C )', 'Hot T out ( C )', 'Cold T in', 'Cold T out',
+    'hot stream', 'Cold stream'
+]
+
+# Excel温度列与heat_exchangers中REAL字段的对应关系（与fix_database_schema.HEX_COLUMNS一致）
+HEX_TEMPERATURE_COLUMNS = [
+    ('Hot T in ( C )', 'hot_stream_inlet_temp'),
+    ('Hot T out ( C )', 'hot_stream_outlet_temp'),
+    ('Cold T in', 'cold_stream_inlet_temp'),
+    ('Cold T out', 'cold_stream_outlet_temp'),
+]
+
+# 名称和物流列使用pyarrow字符串类型（未安装时使用pandas默认字符串类型）
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = 'string'
+
+logger = logging.getLogger(__name__)
+
 def convert_kj_to_kw(kj_per_hour):
     """将kJ/h转换为kW"""
     return kj_per_hour / 3600
@@ -24,48 +49,62 @@ def extract_hex_data_from_excel():
     
     try:
         print(f"📊 从 {excel_file} 读取数据...")
-        df = pd.read_excel(excel_file)
+        df = pd.read_excel(
+            excel_file,
+            usecols=lambda col: col in HEX_EXCEL_COLUMNS,
+            dtype={'Load Kj/h': 'float64', 'Area m2': 'float64'}
+        )
         
         print(f"✅ 成功读取 {len(df)} 行数据")
         print(f"📋 列名: {df.columns.tolist()}")
         
-        hex_data = []
+        # 文本列一次性转换为字符串类型，空值统一为pd.NA
+        text_cols = ['Heat Exchanger Name', 'hot stream', 'Cold stream']
+        df = df.astype({col: STRING_DTYPE for col in text_cols})
         
-        for idx, row in df.iterrows():
-            # 提取换热器名称
-            name = str(row['Heat Exchanger Name']) if pd.notna(row['Heat Exchanger Name']) else f"HEX-{idx:03d}"
-            
-            # 提取Load并转换为kW
-            load_kj_h = row['Load Kj/h'] if pd.notna(row['Load Kj/h']) else 0.0
-            duty_kw = convert_kj_to_kw(load_kj_h)
-            
-            # 提取面积
-            area_m2 = row['Area m2'] if pd.notna(row['Area m2']) else 0.0
-            
-            # 提取温度数据
-            temperatures = {}
-            temp_cols = ['Hot T in ( C )', 'Hot T out ( C )', 'Cold T in', 'Cold T out']
-            for col in temp_cols:
-                if col in row and pd.notna(row[col]):
-                    temperatures[col] = float(row[col])
-            
-            # 提取压力数据（如果有的话）
-            pressures = {}
-            # 目前Excel中没有压力数据，留空
-            
+        # 按列一次性取值，避免iterrows逐行装箱
+        names = [
+            name if name is not pd.NA else f"HEX-{idx:03d}"
+            for idx, name in zip(df.index, df['Heat Exchanger Name'].tolist())
+        ]
+        
+        # 提取Load并转换为kW
+        load_kj_h = df['Load Kj/h'].fillna(0.0).tolist()
+        duty_kw = convert_kj_to_kw(df['Load Kj/h'].fillna(0.0)).tolist()
+        
+        # 提取面积
+        area_m2 = df['Area m2'].fillna(0.0).tolist()
+        
+        # 提取温度数据（只保留非空值）
+        temp_cols = [col for col in ['Hot T in ( C )', 'Hot T out ( C )', 'Cold T in', 'Cold T out']
+                     if col in df.columns]
+        temperatures = [
+            {col: float(value) for col, value in record.items() if pd.notna(value)}
+            for record in df[temp_cols].to_dict(orient='records')
+        ]
+        
+        hot_streams = df['hot stream'].fillna('').tolist()
+        cold_streams = df['Cold stream'].fillna('').tolist()
+        
+        # 逐行明细只在DEBUG级别输出
+        debug_rows = logger.isEnabledFor(logging.DEBUG)
+        hex_data = []
+        for name, duty, area, temps, load, hot, cold in zip(
+                names, duty_kw, area_m2, temperatures, load_kj_h, hot_streams, cold_streams):
             hex_info = {
                 'name': name,
-                'duty_kw': duty_kw,
-                'area_m2': area_m2,
-                'temperatures': temperatures,
-                'pressures': pressures,
-                'load_kj_h': load_kj_h,  # 原始数据
-                'hot_stream': str(row['hot stream']) if pd.notna(row['hot stream']) else '',
-                'cold_stream': str(row['Cold stream']) if pd.notna(row['Cold stream']) else ''
+                'duty_kw': duty,
+                'area_m2': area,
+                'temperatures': temps,
+                'pressures': {},  # 目前Excel中没有压力数据，留空
+                'load_kj_h': load,  # 原始数据
+                'hot_stream': hot,
+                'cold_stream': cold
             }
             
             hex_data.append(hex_info)
-            print(f"  📦 {name}: {duty_kw:.1f} kW, {area_m2:.1f} m²")
+            if debug_rows:
+                logger.debug("  📦 %s: %.1f kW, %.1f m²", name, duty, area)
         
         total_duty = sum(h['duty_kw'] for h in hex_data)
         total_area = sum(h['area_m2'] for h in hex_data)
@@ -88,8 +127,20 @@ def update_hex_database(hex_data):
     
     try:
         conn = sqlite3.connect('aspen_data.db')
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
         
+        # 按会话删除和按名称排序验证都走索引
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_hex_session ON heat_exchangers(session_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_hex_name ON heat_exchangers(name)")
+        
+        # 温度以REAL字段存储，旧表缺少的字段先补上
+        existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(heat_exchangers)")}
+        for _, db_col in HEX_TEMPERATURE_COLUMNS:
+            if db_col not in existing_columns:
+                cursor.execute(f"ALTER TABLE heat_exchangers ADD COLUMN {db_col} REAL")
+        
         # 获取当前session_id
         cursor.execute("SELECT session_id FROM extraction_sessions ORDER BY session_id DESC LIMIT 1")
         result = cursor.fetchone()
@@ -102,25 +153,31 @@ def update_hex_database(hex_data):
         deleted_count = cursor.rowcount
         print(f"  🗑️ 删除了 {deleted_count} 条旧记录")
         
-        # 插入新的HEX数据
-        insert_count = 0
-        for hex_info in hex_data:
-            cursor.execute("""
-                INSERT INTO heat_exchangers 
-                (session_id, name, duty_kw, area_m2, temperatures, pressures, source, extraction_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        # 插入新的HEX数据（与删除在同一事务内批量执行，同一批次共用提取时间）
+        extraction_time = datetime.now().isoformat()
+        rows = [
+            (
                 session_id,
                 hex_info['name'],
                 hex_info['duty_kw'],
                 hex_info['area_m2'],
-                json.dumps(hex_info['temperatures']),
+                *(hex_info['temperatures'].get(excel_col) for excel_col, _ in HEX_TEMPERATURE_COLUMNS),
                 json.dumps(hex_info['pressures']),
                 'excel_corrected',
-                datetime.now().isoformat()
-            ))
-            insert_count += 1
-        
+                extraction_time
+            )
+            for hex_info in hex_data
+        ]
+        temp_cols = ", ".join(db_col for _, db_col in HEX_TEMPERATURE_COLUMNS)
+        cursor.executemany(f"""
+            INSERT INTO heat_exchangers 
+            (session_id, name, duty_kw, area_m2, {temp_cols}, pressures, source, extraction_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        insert_count = len(rows)
+        
+        # 批量插入后更新统计信息，便于查询规划器使用新索引
+        cursor.execute("ANALYZE heat_exchangers")
         conn.commit()
         conn.close()
         
@@ -137,8 +194,9 @@ def verify_hex_data():
         conn = sqlite3.connect('aspen_data.db')
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT name, duty_kw, area_m2, temperatures, source 
+        temp_cols = ", ".join(db_col for _, db_col in HEX_TEMPERATURE_COLUMNS)
+        cursor.execute(f"""
+            SELECT name, duty_kw, area_m2, source, {temp_cols}
             FROM heat_exchangers 
             ORDER BY name
         """)
@@ -151,15 +209,12 @@ def verify_hex_data():
         total_duty = 0
         total_area = 0
         
-        for name, duty_kw, area_m2, temps_json, source in results:
+        for name, duty_kw, area_m2, source, *temp_values in results:
             total_duty += duty_kw
             total_area += area_m2
             
-            try:
-                temps = json.loads(temps_json)
-                temp_info = f"T范围: {min(temps.values()):.1f}-{max(temps.values()):.1f}°C" if temps else "无温度数据"
-            except:
-                temp_info = "温度数据格式错误"
+            temps = [t for t in temp_values if t is not None]
+            temp_info = f"T范围: {min(temps):.1f}-{max(temps):.1f}°C" if temps else "无温度数据"
             
             print(f"  📦 {name}: {duty_kw:.1f} kW, {area_m2:.1f} m², {temp_info}")
         
@@ -175,6 +230,8 @@ def verify_hex_data():
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout, format='%(message)s')
+    
     print("🔧 HEX数据修复工具")
     print("=" * 50)
     
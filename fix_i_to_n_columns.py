@@ -10,6 +10,10 @@ Date: 2025-07-26
 Version: 1.0 - I-N Column Fix
 """
 
+import os
+import re
+import functools
+import numpy as np
 import pandas as pd
 import sqlite3
 import json
@@ -17,10 +21,32 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+# Rust实现的Excel读取引擎 (engine='calamine' 需要 pandas >= 2.2，旧版本会抛出ValueError)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# 清理字符串数值时去除的字符
+_NON_NUMERIC_RE = re.compile(r'[^\d.-]')
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=4)
+def _load_excel(path: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    读取Excel第一个sheet，结果按 (路径, 修改时间) 在进程内缓存
+    
+    同一进程内重复运行修复时不再重新解析xlsx；调用方需复制后再修改。
+    """
+    engine = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+    return pd.read_excel(path, engine=engine)
+
+
 class IToNColumnFixer:
     """
     专门用于修复I-N列数据提取问题的类
@@ -71,7 +97,6 @@ class IToNColumnFixer:
         }
         
         try:
-            import os
             if not os.path.exists(self.excel_file):
                 print(f"❌ Excel文件不存在: {self.excel_file}")
                 return result
@@ -79,8 +104,8 @@ class IToNColumnFixer:
             result['file_found'] = True
             print(f"✅ Excel文件找到: {self.excel_file}")
             
-            # 读取Excel文件
-            self.df = pd.read_excel(self.excel_file)
+            # 读取Excel文件（文件未修改时复用已解析的结果）
+            self.df = _load_excel(self.excel_file, os.stat(self.excel_file).st_mtime_ns)
             result['total_columns'] = len(self.df.columns)
             result['total_rows'] = len(self.df)
             
@@ -150,49 +175,39 @@ class IToNColumnFixer:
                 'I': 8, 'J': 9, 'K': 10, 'L': 11, 'M': 12, 'N': 13
             }
             
-            extracted_data = []
-            rows_with_data = 0
-            
             print(f"🔄 处理 {len(self.df)} 行数据...")
             
-            for idx, row in self.df.iterrows():
-                row_data = {
-                    'row_index': idx,
-                    'name': f'HEX-{idx+1:03d}',  # 默认名称
-                    'i_to_n_columns': {}
-                }
-                
-                has_i_to_n_data = False
-                
-                # 提取每个I-N列的数据
-                for excel_col, col_idx in i_to_n_mapping.items():
-                    if col_idx < len(self.df.columns):
-                        header = str(self.df.columns[col_idx])
-                        value = row.iloc[col_idx] if col_idx < len(row) else None
-                        
-                        # 数据清理和转换
-                        clean_value = self._clean_numeric_value(value)
-                        
-                        if clean_value is not None:
-                            row_data['i_to_n_columns'][excel_col.lower()] = {
-                                'data': clean_value,
-                                'header': header,
-                                'raw_value': value
-                            }
-                            has_i_to_n_data = True
-                
-                if has_i_to_n_data:
-                    extracted_data.append(row_data)
-                    rows_with_data += 1
-            
-            self.i_to_n_data = extracted_data
+            # 按列清理和转换：数值列整列转换，其他列逐个单元格清理
+            columns = {}
+            for excel_col, col_idx in i_to_n_mapping.items():
+                if col_idx < len(self.df.columns):
+                    columns[excel_col.lower()] = (
+                        str(self.df.columns[col_idx]),
+                        self._clean_numeric_column(self.df.iloc[:, col_idx])
+                    )
+            
+            # 整块计算有值掩码（None转为NaN），一次得到保留行和每列计数
+            block = np.array(
+                [values for _, values in columns.values()], dtype=np.float64
+            ).reshape(len(columns), len(self.df))
+            present = ~np.isnan(block)
+            present_counts = dict(zip(columns, present.sum(axis=1).tolist()))
+            
+            # 只保留至少有一个I-N值的行；结果按列存放（名称列表 + 每列的值列表）
+            kept = np.flatnonzero(present.any(axis=0)).tolist()
+            rows_with_data = len(kept)
+            
+            self.i_to_n_data = {
+                'names': [f'HEX-{self.df.index[pos]+1:03d}' for pos in kept],  # 默认名称
+                'headers': {key: header for key, (header, _) in columns.items()},
+                'values': {key: [values[pos] for pos in kept] for key, (_, values) in columns.items()}
+            } if kept else {}
             result['total_rows_processed'] = len(self.df)
             result['rows_with_i_to_n_data'] = rows_with_data
             
             # 统计每列提取的数据量
             for excel_col in ['I', 'J', 'K', 'L', 'M', 'N']:
-                count = sum(1 for row in extracted_data if excel_col.lower() in row['i_to_n_columns'])
-                result['extracted_data_count'][excel_col] = count
+                result['extracted_data_count'][excel_col] = present_counts.get(excel_col.lower(), 0)
             
             if rows_with_data > 0:
                 result['success'] = True
@@ -235,10 +250,16 @@ class IToNColumnFixer:
             
             # 连接数据库
             conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
             cursor = conn.cursor()
             result['database_connected'] = True
             print(f"✅ 数据库连接成功: {self.db_path}")
             
+            # 会话和名称查询使用的索引
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_hex_session ON heat_exchangers(session_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_hex_name ON heat_exchangers(name)")
+            
             # 创建备份
             backup_time = datetime.now().strftime('%Y%m%d_%H%M%S')
             cursor.execute(f"""
@@ -257,66 +278,58 @@ class IToNColumnFixer:
             session_result = cursor.fetchone()
             session_id = session_result[0] if session_result else f"fix_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             
-            # 插入带有I-N列数据的记录
-            records_inserted = 0
+            # 插入带有I-N列数据的记录（先构造全部参数，再批量插入）
             extraction_time = datetime.now().isoformat()
-            
-            for row_data in self.i_to_n_data:
-                i_to_n_cols = row_data['i_to_n_columns']
-                
-                # 准备I-N列数据
-                i_data = i_to_n_cols.get('i', {})
-                j_data = i_to_n_cols.get('j', {})
-                k_data = i_to_n_cols.get('k', {})
-                l_data = i_to_n_cols.get('l', {})
-                m_data = i_to_n_cols.get('m', {})
-                n_data = i_to_n_cols.get('n', {})
+            rows = []
+            
+            keys = ['i', 'j', 'k', 'l', 'm', 'n']
+            names = self.i_to_n_data['names']
+            headers = self.i_to_n_data['headers']
+            column_values = [self.i_to_n_data['values'].get(key, [None] * len(names)) for key in keys]
+            
+            for name, row_values in zip(names, zip(*column_values)):
+                # 每列的数据和表头（没有数据的单元格表头也为空）
+                cells = []
+                for key, value in zip(keys, row_values):
+                    cells.extend((value, headers[key] if value is not None else None))
                 
                 # 创建原始数据字典
                 raw_i_to_n = {
-                    col_name.upper(): col_info.get('data')
-                    for col_name, col_info in i_to_n_cols.items()
-                    if col_info.get('data') is not None
+                    key.upper(): value
+                    for key, value in zip(keys, row_values)
+                    if value is not None
                 }
                 
-                cursor.execute("""
-                    INSERT INTO heat_exchangers (
-                        session_id, name, duty_kw, area_m2, temperatures, pressures, 
-                        source, extraction_time,
-                        column_i_data, column_i_header,
-                        column_j_data, column_j_header,
-                        column_k_data, column_k_header,
-                        column_l_data, column_l_header,
-                        column_m_data, column_m_header,
-                        column_n_data, column_n_header,
-                        columns_i_to_n_raw
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                rows.append((
                     session_id,
-                    row_data['name'],
+                    name,
                     0.0,  # 默认duty
                     0.0,  # 默认area
                     json.dumps({}),  # 默认temperatures
                     json.dumps({}),  # 默认pressures
                     'excel_fix',
                     extraction_time,
-                    i_data.get('data'),
-                    i_data.get('header'),
-                    j_data.get('data'),
-                    j_data.get('header'),
-                    k_data.get('data'),
-                    k_data.get('header'),
-                    l_data.get('data'),
-                    l_data.get('header'),
-                    m_data.get('data'),
-                    m_data.get('header'),
-                    n_data.get('data'),
-                    n_data.get('header'),
+                    *cells,
                     json.dumps(raw_i_to_n) if raw_i_to_n else None
                 ))
-                
-                records_inserted += 1
             
+            cursor.executemany("""
+                INSERT INTO heat_exchangers (
+                    session_id, name, duty_kw, area_m2, temperatures, pressures, 
+                    source, extraction_time,
+                    column_i_data, column_i_header,
+                    column_j_data, column_j_header,
+                    column_k_data, column_k_header,
+                    column_l_data, column_l_header,
+                    column_m_data, column_m_header,
+                    column_n_data, column_n_header,
+                    columns_i_to_n_raw
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            records_inserted = len(rows)
+            
+            # 批量插入后更新统计信息，便于查询规划器使用新索引
+            cursor.execute("ANALYZE heat_exchangers")
             conn.commit()
             result['records_updated'] = records_inserted
             result['success'] = True
@@ -354,12 +367,8 @@ class IToNColumnFixer:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # 检查总记录数
-            cursor.execute("SELECT COUNT(*) FROM heat_exchangers")
-            result['total_records'] = cursor.fetchone()[0]
-            print(f"📊 heat_exchangers表总记录数: {result['total_records']}")
-            
-            # 检查I-N列覆盖率
+            # 一次查询同时得到总记录数、I-N列覆盖率和样本行：
+            # 窗口聚合覆盖整张表，有I-N数据的行排在前面取前3条
             i_to_n_columns = [
                 ('column_i_data', 'I'),
                 ('column_j_data', 'J'),
@@ -369,12 +378,27 @@ class IToNColumnFixer:
                 ('column_n_data', 'N')
             ]
             
+            data_cols = ", ".join(db_col for db_col, _ in i_to_n_columns)
+            window_sums = ", ".join(f"SUM({db_col} IS NOT NULL) OVER ()" for db_col, _ in i_to_n_columns)
+            has_data = " OR ".join(f"{db_col} IS NOT NULL" for db_col, _ in i_to_n_columns)
+            cursor.execute(f"""
+                SELECT name, {data_cols}, {has_data} AS has_data,
+                       COUNT(*) OVER (), {window_sums}
+                FROM heat_exchangers
+                ORDER BY has_data DESC, rowid
+                LIMIT 3
+            """)
+            rows = cursor.fetchall()
+            
+            # 空表时没有返回行，所有计数为0
+            result['total_records'] = rows[0][8] if rows else 0
+            counts = rows[0][9:] if rows else [0] * len(i_to_n_columns)
+            print(f"📊 heat_exchangers表总记录数: {result['total_records']}")
+            
             print(f"🔍 I-N列数据覆盖率:")
             total_i_to_n_values = 0
             
-            for db_col, excel_col in i_to_n_columns:
-                cursor.execute(f"SELECT COUNT(*) FROM heat_exchangers WHERE {db_col} IS NOT NULL")
-                count = cursor.fetchone()[0]
+            for (db_col, excel_col), count in zip(i_to_n_columns, counts):
                 coverage_pct = (count / result['total_records']) * 100 if result['total_records'] > 0 else 0
                 
                 result['i_to_n_coverage'][excel_col] = {
@@ -385,19 +409,10 @@ class IToNColumnFixer:
                 
                 print(f"   列{excel_col}: {count}/{result['total_records']} ({coverage_pct:.1f}%)")
             
-            # 抽样验证
-            cursor.execute("""
-                SELECT name, column_i_data, column_j_data, column_k_data, 
-                       column_l_data, column_m_data, column_n_data
-                FROM heat_exchangers 
-                WHERE column_i_data IS NOT NULL OR column_j_data IS NOT NULL 
-                   OR column_k_data IS NOT NULL OR column_l_data IS NOT NULL
-                   OR column_m_data IS NOT NULL OR column_n_data IS NOT NULL
-                LIMIT 3
-            """)
-            
-            sample_rows = cursor.fetchall()
-            for row in sample_rows:
+            # 抽样验证（只取有I-N数据的行）
+            for row in rows:
+                if not row[7]:
+                    continue
                 sample_item = {
                     'name': row[0],
                     'i_to_n_values': {
@@ -430,6 +445,15 @@ class IToNColumnFixer:
         
         return result
     
+    def _clean_numeric_column(self, series: pd.Series) -> List[Optional[float]]:
+        """
+        清理整列数值数据，结果与逐个调用_clean_numeric_value相同
+        """
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            return [None if np.isnan(v) else v for v in values.tolist()]
+        return [self._clean_numeric_value(value) for value in series.tolist()]
+    
     def _clean_numeric_value(self, value) -> Optional[float]:
         """
         清理和转换数值数据
@@ -442,8 +466,7 @@ class IToNColumnFixer:
         
         if isinstance(value, str):
             # 清理字符串中的非数字字符
-            import re
-            clean_str = re.sub(r'[^\d.-]', '', str(value).strip())
+            clean_str = _NON_NUMERIC_RE.sub('', str(value).strip())
             if clean_str:
                 try:
                     return float(clean_str)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+测试成本明细的两种流式写出引擎
+xlsxwriter引擎（需要安装xlsxwriter）的列和合计应与openpyxl只写导出一致
+"""
+
+from datetime import datetime
+
+import pytest
+from openpyxl import load_workbook
+
+from data_interfaces import CostCategory, CostItem, EconomicAnalysisResults
+from extract_aspen_economics import AspenEconomicsExtractor
+
+
+def _sample_results() -> EconomicAnalysisResults:
+    """构造包含CAPEX和OPEX各分组的成本明细"""
+    results = EconomicAnalysisResults("Test Project", datetime(2025, 1, 1))
+    results.capex_data.add_cost_item(CostItem("E-101", CostCategory.EQUIPMENT, 100000.0))
+    results.capex_data.add_cost_item(CostItem("Piping", CostCategory.PIPING, 20500.5))
+    results.capex_data.add_cost_item(CostItem("Engineering", CostCategory.ENGINEERING, 7000))
+    results.opex_data.add_opex_item(CostItem("Steam", CostCategory.UTILITIES, 3250.25))
+    results.opex_data.add_opex_item(CostItem("Operators", CostCategory.LABOR, 90000))
+    return results
+
+
+def _sheet_values(path: str):
+    ws = load_workbook(path)['Cost Items']
+    return [[cell.value for cell in row] for row in ws.iter_rows(max_col=7)]
+
+
+def test_write_only_export_rows(tmp_path):
+    """openpyxl只写导出：表头、明细行顺序和合计"""
+    extractor = AspenEconomicsExtractor()
+    results = _sample_results()
+    extractor.extract_from_cost_files = lambda path: results
+    output = str(tmp_path / "write_only.xlsx")
+
+    summary = extractor.export_cost_items_write_only("project.izp", output)
+
+    assert summary['success'], summary['errors']
+    assert summary['item_count'] == 5
+    rows = _sheet_values(output)
+    assert rows[0] == ['Section', 'Group', 'Item', 'Category', 'Base Cost',
+                       'Installed Cost', 'Currency']
+    assert [row[:3] for row in rows[1:6]] == [
+        ['CAPEX', 'Equipment', 'E-101'],
+        ['CAPEX', 'Installation', 'Piping'],
+        ['CAPEX', 'Indirect', 'Engineering'],
+        ['OPEX', 'Utilities', 'Steam'],
+        ['OPEX', 'Labor', 'Operators'],
+    ]
+    assert rows[-2][:5] == ['CAPEX', 'Sum of listed items', None, None, 127500.5]
+    assert rows[-1][:5] == ['OPEX', 'Sum of listed items', None, None, 93250.25]
+
+
+def test_xlsxwriter_engine_matches_openpyxl(tmp_path):
+    """xlsxwriter_streaming引擎与openpyxl只写导出写出相同的单元格"""
+    pytest.importorskip("xlsxwriter")
+    extractor = AspenEconomicsExtractor()
+    results = _sample_results()
+    extractor.extract_from_cost_files = lambda path: results
+
+    openpyxl_output = str(tmp_path / "openpyxl.xlsx")
+    xlsxwriter_output = str(tmp_path / "xlsxwriter.xlsx")
+    extractor.export_cost_items_write_only("project.izp", openpyxl_output)
+    extractor.generate_excel_report(results, xlsxwriter_output, engine='xlsxwriter_streaming')
+
+    assert _sheet_values(xlsxwriter_output) == _sheet_values(openpyxl_output)
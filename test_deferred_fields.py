@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+测试EconomicAnalysisResults的延迟字段（defer / load_deferred / __getattr__）
+覆盖加载前后的访问、加载失败后保持延迟，以及延迟实例的pickle和deepcopy
+"""
+
+import copy
+import pickle
+from datetime import datetime
+
+import pytest
+
+from data_interfaces import EconomicAnalysisResults
+
+
+class _Loader:
+    """记录调用次数的loader，可设置前几次调用失败"""
+
+    def __init__(self, failures: int = 0):
+        self.calls = 0
+        self.failures = failures
+
+    def __call__(self, results: EconomicAnalysisResults):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("load failed")
+        results.npv = 1234.5
+        results.assumptions.append("loaded")
+
+
+def _deferred_results(loader) -> EconomicAnalysisResults:
+    results = EconomicAnalysisResults("Test Project", datetime(2025, 1, 1))
+    results.defer(['npv', 'assumptions'], loader)
+    return results
+
+
+def test_access_triggers_single_load():
+    """首次访问任一延迟字段时运行一次loader，之后直接读取"""
+    loader = _Loader()
+    results = _deferred_results(loader)
+    assert loader.calls == 0
+    assert results.project_name == "Test Project"
+    assert loader.calls == 0
+
+    assert results.npv == 1234.5
+    assert results.assumptions == ["loaded"]
+    assert loader.calls == 1
+    assert results._deferred == {}
+
+
+def test_load_deferred_forces_loading():
+    loader = _Loader()
+    results = _deferred_results(loader)
+    results.load_deferred()
+    assert loader.calls == 1
+    assert results._deferred == {}
+    assert results.npv == 1234.5
+    assert loader.calls == 1
+
+
+def test_failed_load_stays_deferred():
+    """loader失败时字段保持延迟，下次访问重试而不是返回默认值"""
+    loader = _Loader(failures=1)
+    results = _deferred_results(loader)
+
+    with pytest.raises(RuntimeError):
+        results.npv
+    assert set(results._deferred) == {'npv', 'assumptions'}
+
+    assert results.assumptions == ["loaded"]
+    assert results.npv == 1234.5
+    assert loader.calls == 2
+
+
+def test_unknown_attribute_raises_attribute_error():
+    results = _deferred_results(_Loader())
+    with pytest.raises(AttributeError):
+        results.not_a_field
+
+
+def test_deepcopy_of_deferred_instance():
+    """deepcopy先完成加载，副本包含已加载的值且与原对象互不影响"""
+    loader = _Loader()
+    results = _deferred_results(loader)
+
+    copied = copy.deepcopy(results)
+    assert loader.calls == 1
+    assert copied.npv == 1234.5
+    assert copied._deferred == {}
+
+    copied.assumptions.append("copy only")
+    assert results.assumptions == ["loaded"]
+
+
+def test_pickle_of_deferred_instance():
+    """pickle先完成加载，loader本身不需要可序列化"""
+    loader = _Loader()
+    results = _deferred_results(loader)
+    results.defer(['irr'], lambda r: setattr(r, 'irr', 0.12))
+
+    restored = pickle.loads(pickle.dumps(results))
+    assert restored.npv == 1234.5
+    assert restored.assumptions == ["loaded"]
+    assert restored.irr == 0.12
+    assert restored._deferred == {}
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+经济文件解析器回归测试
+用合成的IZP（zip）和SZP数据验证提取的成本值和数据段，
+分别在Numba、NumPy和纯struct（iter_unpack）扫描路径下运行
+"""
+
+import io
+import os
+import struct
+import zipfile
+
+import pytest
+
+import economic_file_parser
+from economic_file_parser import EconomicFileParser
+
+# 成本条目中1 <= |x| <= 1e9 的全部候选浮点数（排序去重后）
+_COST_ENTRY_VALUES = [
+    4.33056640625, 7.0340576171875, 8.9073486328125, 12.333086967468262,
+    193.27078247070312, 850.5, 1200.0, 3396.083740234375, 35000.0, 250000.0,
+    2795686.506869197, 54344972.0,
+]
+
+
+def _cost_entry() -> bytes:
+    """文本标签与float64/float32数值交替排列的成本条目"""
+    return (b'REACTOR R-101\x00\x00\x00' + struct.pack('<d', 250000.0)
+            + b'PUMP P-201\x00\x00' + struct.pack('<d', 35000.0)
+            + b'STEAM LP\x00\x00\x00\x00' + struct.pack('<f', 1200.0) + b'\x00' * 4
+            + b'COOLING_WATER\x00\x00\x00' + struct.pack('<d', 850.5) + b'\x00' * 16)
+
+
+def _izp_bytes() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('econ/cost_summary.bin', _cost_entry())
+        zf.writestr('notes.txt', b'PROJECT NOTES\nTOTAL COST 1,250,000\n'
+                                 b'PUMP PRICE 35000.5\nunrelated 999\n')
+    return buf.getvalue()
+
+
+def _szp_bytes() -> bytes:
+    return (b'SZP VERSION 12.1 DEMO PROJECT\x00\x00\x00'
+            + b'COST_DATA\x00\x00\x00' + struct.pack('<dddd', 150000.0, 2500.0, 75000.0, 512.0)
+            + b'FINANCIAL_PARAMS' + struct.pack('<ddd', 0.08, 0.3, 20.0)
+            + b'SUMMARY\x00' + struct.pack('<d', 999999.0) + b'\x00' * 8)
+
+
+@pytest.fixture(params=['numba', 'numpy', 'struct'])
+def scan_mode(request, monkeypatch):
+    """切换数值扫描路径，并清空解析缓存以免复用其他路径的结果"""
+    if request.param == 'numba' and not economic_file_parser.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    if request.param == 'numpy' and not economic_file_parser.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    if request.param != 'numba':
+        monkeypatch.setattr(economic_file_parser, 'NUMBA_AVAILABLE', False)
+    if request.param == 'struct':
+        monkeypatch.setattr(economic_file_parser, 'NUMPY_AVAILABLE', False)
+    EconomicFileParser().reload()
+    yield request.param
+    EconomicFileParser().reload()
+
+
+def test_numeric_scan(scan_mode):
+    values = EconomicFileParser()._extract_numeric_data(_cost_entry())
+    assert [float(v) for v in values] == _COST_ENTRY_VALUES
+
+
+def test_parse_izp(scan_mode, tmp_path):
+    path = tmp_path / "Demo.izp"
+    path.write_bytes(_izp_bytes())
+
+    results = EconomicFileParser().parse_file(str(path))
+
+    assert results.project_name == "Demo"
+    capex, opex = results.capex_data, results.opex_data
+    # 文本片段按出现顺序编号，与同位置的数值配对
+    assert {name: item.base_cost for name, item in capex.equipment_costs.items()} == {
+        'REACTOR_1': 4.33056640625,
+        'PUMP_3': 8.9073486328125,
+    }
+    assert {name: item.base_cost for name, item in opex.utility_costs.items()} == {
+        'STEAM': 193.27078247070312,
+        'COOLING_WATER': 193.27078247070312,
+        'WATER': 193.27078247070312,
+    }
+    # 文本条目在成本条目之后合并，同名项目被后出现的行覆盖
+    assert {name: item.base_cost for name, item in capex.indirect_costs.items()} == {
+        'TEXT_ITEM_3': 35000.5,
+    }
+    assert results.total_capex == pytest.approx((4.33056640625 + 8.9073486328125) * 1.15)
+    assert results.annual_opex == pytest.approx(
+        3 * 193.27078247070312 + results.total_capex * (0.03 + 0.005 + 0.02))
+
+
+def test_szp_sections(scan_mode):
+    sections = EconomicFileParser()._identify_data_sections(_szp_bytes())
+    assert list(sections) == ['COST_DATA', 'FINANCIAL_PARAMS', 'SUMMARY']
+    assert sections['COST_DATA'].startswith(b'COST_DATA')
+    assert sections['FINANCIAL_PARAMS'].endswith(struct.pack('<d', 20.0))
+    assert sections['SUMMARY'].startswith(b'SUMMARY')
+
+
+def test_parse_szp(scan_mode, tmp_path):
+    path = tmp_path / "Demo.szp"
+    path.write_bytes(_szp_bytes())
+
+    results = EconomicFileParser().parse_file(str(path))
+
+    assert {name: item.base_cost for name, item in results.capex_data.equipment_costs.items()} == {
+        'COST_ITEM_4': 2500.0,
+        'COST_ITEM_5': 75000.0,
+        'COST_ITEM_6': 150000.0,
+    }
+    # 数值扫描只保留 |x| >= 1，财务段中的比例值不会被识别，保持默认值
+    assert results.financial_params.discount_rate == 0.1
+    assert results.financial_params.tax_rate == 0.25
+    assert results.total_capex == 0.0
+
+
+@pytest.fixture
+def counted_parses(monkeypatch):
+    """清空解析缓存并统计实际解析（未命中缓存）的次数"""
+    calls = []
+    original = EconomicFileParser._parse_path
+
+    def parse_path(self, file_path, lazy=False):
+        calls.append(file_path)
+        return original(self, file_path, lazy)
+
+    monkeypatch.setattr(EconomicFileParser, '_parse_path', parse_path)
+    EconomicFileParser().reload()
+    yield calls
+    EconomicFileParser().reload()
+
+
+def test_parse_cache_returns_independent_copies(counted_parses, tmp_path):
+    """修改命中缓存返回的结果不影响下一次命中"""
+    path = tmp_path / "Demo.szp"
+    path.write_bytes(_szp_bytes())
+
+    first = EconomicFileParser().parse_file(str(path))
+    first.capex_data.equipment_costs.clear()
+    first.data_sources.append("modified")
+    first.total_capex = 1.0
+
+    second = EconomicFileParser().parse_file(str(path))
+    assert len(counted_parses) == 1
+    assert sorted(second.capex_data.equipment_costs) == ['COST_ITEM_4', 'COST_ITEM_5', 'COST_ITEM_6']
+    assert "modified" not in second.data_sources
+    assert second.total_capex == 0.0
+
+    second.capex_data.equipment_costs.clear()
+    third = EconomicFileParser().parse_file(str(path))
+    assert len(counted_parses) == 1
+    assert len(third.capex_data.equipment_costs) == 3
+
+
+def test_parse_cache_invalidated_by_mtime_and_size(counted_parses, tmp_path):
+    path = tmp_path / "Demo.szp"
+    path.write_bytes(_szp_bytes())
+    parser = EconomicFileParser()
+
+    parser.parse_file(str(path))
+    parser.parse_file(str(path))
+    assert len(counted_parses) == 1
+
+    # 仅修改时间变化
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    parser.parse_file(str(path))
+    assert len(counted_parses) == 2
+
+    # 仅文件大小变化（恢复修改时间）
+    stat = path.stat()
+    path.write_bytes(_szp_bytes() + b'\x00' * 8)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    parser.parse_file(str(path))
+    assert len(counted_parses) == 3
+
+
+def test_lazy_parse_error_recorded_on_calling_parser(counted_parses, tmp_path):
+    """延迟解析的错误记录到发起解析的解析器，而不是其他实例"""
+    path = tmp_path / "Demo.szp"
+    path.write_bytes(_szp_bytes())
+    other = EconomicFileParser()
+    caller = EconomicFileParser()
+
+    results = caller.parse_file(str(path), lazy=True)
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        results.capex_data
+
+    assert len(caller.parsing_errors) == 1
+    assert other.parsing_errors == []
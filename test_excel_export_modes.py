@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+测试经济分析报告的完整模式和只写（streaming）模式
+streaming模式只生成8张表中的4张，且不含图表
+"""
+
+import zipfile
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from data_interfaces import CostCategory, CostItem, EconomicAnalysisResults
+from economic_excel_exporter import EconomicExcelExporter
+
+FULL_SHEETS = [
+    'Executive Summary', 'CAPEX Breakdown', 'OPEX Analysis', 'Equipment Details',
+    'Financial Analysis', 'Sensitivity Analysis', 'Calculation Parameters',
+    'Assumptions & Notes',
+]
+STREAMING_SHEETS = FULL_SHEETS[:4]
+
+
+def _sample_results() -> EconomicAnalysisResults:
+    results = EconomicAnalysisResults("Test Project", datetime(2025, 1, 1))
+    results.capex_data.add_cost_items([
+        CostItem("E-101", CostCategory.EQUIPMENT, 100000.0),
+        CostItem("Piping", CostCategory.PIPING, 20000.0),
+        CostItem("Engineering", CostCategory.ENGINEERING, 7000.0),
+    ])
+    results.opex_data.add_opex_items([
+        CostItem("Steam", CostCategory.UTILITIES, 3250.0),
+        CostItem("Operators", CostCategory.LABOR, 90000.0),
+    ])
+    results.total_capex = results.capex_data.calculate_total_capex()
+    results.annual_opex = results.opex_data.calculate_annual_opex(results.total_capex)
+    return results
+
+
+def _chart_parts(path: str):
+    with zipfile.ZipFile(path) as zf:
+        return [name for name in zf.namelist() if name.startswith('xl/charts/')]
+
+
+def test_full_export_sheets_and_charts(tmp_path):
+    output = str(tmp_path / "full.xlsx")
+    EconomicExcelExporter().export_economic_analysis(_sample_results(), output)
+
+    assert load_workbook(output, read_only=True).sheetnames == FULL_SHEETS
+    assert _chart_parts(output)
+
+
+def test_streaming_export_writes_reduced_report(tmp_path):
+    """只写模式只包含概览、CAPEX、OPEX和设备表，没有图表"""
+    output = str(tmp_path / "streaming.xlsx")
+    EconomicExcelExporter().export_economic_analysis(_sample_results(), output, streaming=True)
+
+    wb = load_workbook(output, read_only=True)
+    assert wb.sheetnames == STREAMING_SHEETS
+    assert _chart_parts(output) == []
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+测试不经过openpyxl直接写出的xlsx（_emit_xlsx_direct）
+写出后用openpyxl读回，验证转义、控制字符、NaN/inf、布尔值和大整数
+"""
+
+import math
+
+from openpyxl import load_workbook
+
+from extract_aspen_economics import _emit_xlsx_direct
+
+
+def test_emit_xlsx_direct_round_trip(tmp_path):
+    """特殊文本和数值写出后可被openpyxl正常读回"""
+    path = str(tmp_path / "direct.xlsx")
+    rows = [
+        ["Name", "Value"],
+        ["a\x01b", 1.5],
+        ["<E-101> & \"HX\" 'x'", 2],
+        ["tab\tand\nnewline", None],
+        ["nan", math.nan],
+        ["inf", math.inf],
+        ["bool", True],
+        ["big", 2 ** 53 + 1],
+    ]
+    _emit_xlsx_direct(path, [("Cost\x02 Items", rows), ("Empty", [])])
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Cost Items", "Empty"]
+    ws = wb["Cost Items"]
+    values = [[cell.value for cell in row] for row in ws.iter_rows(max_col=2)]
+
+    assert values[0] == ["Name", "Value"]
+    assert values[1] == ["ab", 1.5]
+    assert values[2] == ["<E-101> & \"HX\" 'x'", 2]
+    assert values[3] == ["tab\tand\nnewline", None]
+    assert values[4] == ["nan", "nan"]
+    assert values[5] == ["inf", "inf"]
+    assert values[6] == ["bool", "True"]
+    assert values[7] == ["big", 2 ** 53 + 1]
+    assert isinstance(values[7][1], int)